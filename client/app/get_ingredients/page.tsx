@@ -8,6 +8,7 @@ import LiveStreamComponent from "../../components/LiveStreamComponent";
 import ImageUploadComponent from "../../components/ImageUploadComponent";
 import VideoUploadComponent from "../../components/VideoUploadComponent";
 import { Navbar } from "@/components/navbar"; // Add navbar import
+import { waitForJob } from "@/lib/api";
 
 const sendLiveFrame = async (data: FormData) => {
   const res = await fetch("http://localhost:8080/upload_live_frame", {
@@ -28,7 +29,7 @@ const uploadVideoFile = async (data: FormData) => {
   if (!res.ok) {
     throw new Error("Failed to upload video");
   }
-  return res.json();
+  return waitForJob(await res.json());
 };
 
 const uploadImage = async (data: FormData) => {
@@ -39,7 +40,7 @@ const uploadImage = async (data: FormData) => {
   if (!res.ok) {
     throw new Error("Failed to upload image");
   }
-  return res.json();
+  return waitForJob(await res.json());
 };
 
 const Home: React.FC = () => {
@@ -1,8 +1,11 @@
 "use client";
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import axios from "axios";
+import usePagedList from "@/hooks/usePagedList";
 import { DishForm } from "./components/DishForm";
 import { DishCollection } from "./components/DishCollection";
+import { DISH_CARD_FIELDS, withPhotoUrl } from "./components/DishCard";
+import { LoadMoreButton } from "./components/LoadMoreButton";
 
 interface Ingredient {
   name: string;
@@ -25,15 +28,20 @@ interface DishPageProps {
   dishes: Dish[];
 }
 
-export function DishPage({ onAddDish, dishes: initialDishes }: DishPageProps) {
-  const [dishes, setDishes] = useState<Dish[]>(initialDishes);
-  const [isLoading, setIsLoading] = useState(true);
+export function DishPage({ onAddDish }: DishPageProps) {
+  const {
+    items: dishes,
+    setItems: setDishes,
+    isLoading,
+    isLoadingMore,
+    hasMore,
+    loadMore,
+  } = usePagedList<Dish>("http://localhost:8080/get-dishes", "dishes", {
+    fields: DISH_CARD_FIELDS,
+    transform: withPhotoUrl,
+  });
   const [isFetchingIngredients, setIsFetchingIngredients] = useState(false);
 
-  useEffect(() => {
-    fetchDishes();
-  }, []);
-
   const handleDeleteDish = async (dishId: string) => {
     try {
       // Send delete request immediately without confirmation
@@ -50,27 +58,6 @@ export function DishPage({ onAddDish, dishes: initialDishes }: DishPageProps) {
   };
 
   
-  const fetchDishes = async () => {
-    try {
-      const response = await axios.get("http://localhost:8080/get-dishes");
-      if (response.data && response.data.success) {
-        const dishesWithCorrectUrls = response.data.dishes.map(
-          (dish: Dish) => ({
-            ...dish,
-            photo: dish.photo.startsWith("http")
-              ? dish.photo
-              : `http://localhost:8080${dish.photo}`,
-          })
-        );
-        setDishes(dishesWithCorrectUrls);
-      }
-    } catch (err) {
-      console.error("Error fetching dishes:", err);
-    } finally {
-      setIsLoading(false);
-    }
-  };
-
   const handleAddDish = async (newDish: Dish) => {
     try {
       const formData = new FormData();
@@ -168,6 +155,7 @@ export function DishPage({ onAddDish, dishes: initialDishes }: DishPageProps) {
   isLoading={isLoading} 
   onDeleteDish={handleDeleteDish} 
 />
+        <LoadMoreButton hasMore={hasMore} isLoading={isLoadingMore} onClick={loadMore} />
         </div>
       ) : (
         <div className="text-center py-8 text-gray-400">
@@ -1,6 +1,7 @@
 "use client";
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import axios from "axios";
+import usePagedList from "@/hooks/usePagedList";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Textarea } from "@/components/ui/textarea";
@@ -13,45 +14,28 @@ import {
 } from "@/components/ui/card";
 import { Plus, Loader2 } from "lucide-react";
 import { Dish } from "../types";
-import { DishCard } from "./DishCard";
+import { DishCard, DISH_CARD_FIELDS, withPhotoUrl } from "./DishCard";
+import { LoadMoreButton } from "./LoadMoreButton";
 import { MenuList } from "./MenuList";
 
 export function CreateMenuForm() {
-  const [dishes, setDishes] = useState<Dish[]>([]);
+  const {
+    items: dishes,
+    isLoading,
+    isLoadingMore,
+    hasMore,
+    loadMore,
+  } = usePagedList<Dish>("http://localhost:8080/get-dishes", "dishes", {
+    fields: DISH_CARD_FIELDS,
+    transform: withPhotoUrl,
+  });
   const [selectedDishes, setSelectedDishes] = useState<string[]>([]);
   const [newMenu, setNewMenu] = useState({
     name: "",
     description: "",
   });
-  const [isLoading, setIsLoading] = useState(true);
   const [isCreating, setIsCreating] = useState(false);
 
-  useEffect(() => {
-    fetchDishes();
-  }, []);
-  
-
-  const fetchDishes = async () => {
-    try {
-      const response = await axios.get("http://localhost:8080/get-dishes");
-      if (response.data.success) {
-        const dishesWithCorrectUrls = response.data.dishes.map(
-          (dish: Dish) => ({
-            ...dish,
-            photo: dish.photo.startsWith("http")
-              ? dish.photo
-              : `http://localhost:8080${dish.photo}`,
-          })
-        );
-        setDishes(dishesWithCorrectUrls);
-      }
-    } catch (error) {
-      console.error("Error fetching dishes:", error);
-    } finally {
-      setIsLoading(false);
-    }
-  };
-
   // Update the handleCreateMenu function for better error handling
 
 const handleCreateMenu = async () => {
@@ -162,6 +146,8 @@ const handleCreateMenu = async () => {
             ))}
           </div>
 
+          <LoadMoreButton hasMore={hasMore} isLoading={isLoadingMore} onClick={loadMore} />
+
           <Button
             onClick={handleCreateMenu}
             disabled={
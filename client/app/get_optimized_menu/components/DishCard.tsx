@@ -2,6 +2,17 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Check, Trash2 } from "lucide-react";
 import { Dish } from "../DishPage";
 
+// Columns a dish card shows; lists request only these
+export const DISH_CARD_FIELDS = ["name", "price", "ingredients", "photo"];
+
+// Dish photos stored on the server come back as paths
+export const withPhotoUrl = <D extends { photo: string }>(dish: D): D => ({
+  ...dish,
+  photo: dish.photo && dish.photo.startsWith("http")
+    ? dish.photo
+    : `http://localhost:8080${dish.photo || ""}`,
+});
+
 interface DishCardProps {
   dish: Dish;
   isSelected?: boolean;
@@ -1,41 +1,27 @@
 "use client";
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import axios from "axios";
+import usePagedList from "@/hooks/usePagedList";
 import { Button } from "@/components/ui/button";
 import { Plus, Loader2 } from "lucide-react";
 import Link from "next/link";
 import { Dish } from "../types";
-import { DishCard } from "./DishCard";
+import { DishCard, DISH_CARD_FIELDS, withPhotoUrl } from "./DishCard";
+import { LoadMoreButton } from "./LoadMoreButton";
 
 export function DishList() {
-  const [dishes, setDishes] = useState<Dish[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
+  const {
+    items: dishes,
+    setItems: setDishes,
+    isLoading,
+    isLoadingMore,
+    hasMore,
+    loadMore,
+  } = usePagedList<Dish>("http://localhost:8080/get-dishes", "dishes", {
+    fields: DISH_CARD_FIELDS,
+    transform: withPhotoUrl,
+  });
   const [deletingDishId, setDeletingDishId] = useState<string | null>(null);
-
-  useEffect(() => {
-    fetchDishes();
-  }, []);
-
-  const fetchDishes = async () => {
-    try {
-      const response = await axios.get("http://localhost:8080/get-dishes");
-      if (response.data.success) {
-        const dishesWithCorrectUrls = response.data.dishes.map(
-          (dish: Dish) => ({
-            ...dish,
-            photo: dish.photo && dish.photo.startsWith("http")
-              ? dish.photo
-              : `http://localhost:8080${dish.photo || ''}`,
-          })
-        );
-        setDishes(dishesWithCorrectUrls);
-      }
-    } catch (error) {
-      console.error("Error fetching dishes:", error);
-    } finally {
-      setIsLoading(false);
-    }
-  };
   
   const handleDeleteDish = async (dishId: string) => {
     try {
@@ -94,6 +80,8 @@ export function DishList() {
           )}
         </div>
       )}
+
+      <LoadMoreButton hasMore={hasMore} isLoading={isLoadingMore} onClick={loadMore} />
     </div>
   );
 }
\ No newline at end of file
@@ -0,0 +1,26 @@
+import { Button } from "@/components/ui/button";
+import { Loader2 } from "lucide-react";
+
+interface LoadMoreButtonProps {
+  hasMore: boolean;
+  isLoading: boolean;
+  onClick: () => void;
+}
+
+export function LoadMoreButton({ hasMore, isLoading, onClick }: LoadMoreButtonProps) {
+  if (!hasMore) return null;
+
+  return (
+    <div className="flex justify-center">
+      <Button
+        variant="outline"
+        onClick={onClick}
+        disabled={isLoading}
+        className="border-gray-700 text-gray-300 hover:bg-gray-800"
+      >
+        {isLoading && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+        Load more
+      </Button>
+    </div>
+  );
+}
@@ -1,6 +1,7 @@
 "use client";
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import axios from "axios";
+import usePagedList from "@/hooks/usePagedList";
 import { Button } from "@/components/ui/button";
 import {
   Card,
@@ -20,42 +21,40 @@ import {
 } from "lucide-react";
 import { Menu } from "../types";
 import Link from "next/link";
+import { LoadMoreButton } from "./LoadMoreButton";
+
+// Columns a menu card shows
+const MENU_CARD_FIELDS = ["name", "description", "dishes"];
+
+const withDishPhotoUrls = (menu: Menu): Menu => ({
+  ...menu,
+  dishes: menu.dishes.map((dish) => ({
+    ...dish,
+    photo: dish.photo 
+      ? (dish.photo.startsWith("http") 
+          ? dish.photo 
+          : `http://localhost:8080${dish.photo}`)
+      : "/placeholder-dish.jpg" // Fallback image if photo is missing
+  })),
+});
 
 export function MenuList() {
-  const [menus, setMenus] = useState<Menu[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
+  const {
+    items: menus,
+    setItems: setMenus,
+    isLoading,
+    isLoadingMore,
+    hasMore,
+    loadMore,
+  } = usePagedList<Menu>("http://localhost:8080/menus", "menus", {
+    pageSize: 12,
+    fields: MENU_CARD_FIELDS,
+    transform: withDishPhotoUrls,
+  });
   const [optimizingMenuId, setOptimizingMenuId] = useState<string | null>(null);
   const [optimizationResults, setOptimizationResults] = useState<any>(null);
   const [selectedMenu, setSelectedMenu] = useState<Menu | null>(null);
 
-  useEffect(() => {
-    fetchMenus();
-  }, []);
-
-  const fetchMenus = async () => {
-    try {
-      const response = await axios.get("http://localhost:8080/menus");
-      if (response.data.success) {
-        const menusWithCorrectUrls = response.data.menus.map((menu: Menu) => ({
-          ...menu,
-          dishes: menu.dishes.map((dish) => ({
-            ...dish,
-            photo: dish.photo 
-              ? (dish.photo.startsWith("http") 
-                  ? dish.photo 
-                  : `http://localhost:8080${dish.photo}`)
-              : "/placeholder-dish.jpg" // Fallback image if photo is missing
-          })),
-        }));
-        setMenus(menusWithCorrectUrls);
-      }
-    } catch (error) {
-      console.error("Error fetching menus:", error);
-    } finally {
-      setIsLoading(false);
-    }
-  };
-
   const handleDeleteMenu = async (menuId: string) => {
     try {
       const response = await axios.delete(
@@ -189,6 +188,8 @@ export function MenuList() {
         ))}
       </div>
 
+      <LoadMoreButton hasMore={hasMore} isLoading={isLoadingMore} onClick={loadMore} />
+
       {/* Optimization Results */}
       {optimizationResults && selectedMenu && (
         <div className="space-y-8 mt-8">
@@ -1,6 +1,6 @@
 "use client";
 import { useState } from "react";
-import axios from "axios";
+import { streamDishes } from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import {
   Card,
@@ -64,34 +64,19 @@ export function AIDish() {
     setMessage("");
 
     try {
-      const response = await axios.post(
-        "http://localhost:8080/generate-dishes",
-        {
-          type: "inventory",
-        }
+      // Show each dish as soon as the server has generated it
+      setGeneratedDishes([]);
+      await streamDishes<AIDish>({ type: "inventory" }, (dish) =>
+        setGeneratedDishes((dishes) => [...dishes, dish])
       );
-
-      if (response.data.success) {
-        setGeneratedDishes(response.data.dishes);
-      } else {
-        setError(response.data.message || "Failed to generate dishes");
-      }
     } catch (error) {
-      if (axios.isAxiosError(error)) {
-        if (error.code === "ECONNREFUSED") {
-          setError(
-            "Could not connect to the server. Please make sure the Flask server is running on port 5001."
-          );
-        } else if (error.response) {
-          setError(
-            error.response.data.message ||
-              "Server error occurred. Please try again."
-          );
-        } else {
-          setError(
-            "Network error occurred. Please check your connection and try again."
-          );
-        }
+      if (error instanceof TypeError) {
+        // fetch rejects with a TypeError when the server is unreachable
+        setError(
+          "Network error occurred. Please check your connection and try again."
+        );
+      } else if (error instanceof Error) {
+        setError(error.message || "Server error occurred. Please try again.");
       } else {
         setError("An unexpected error occurred. Please try again.");
       }
@@ -116,8 +101,8 @@ export function AIDish() {
     setError("");
 
     try {
-      const response = await axios.post(
-        "http://localhost:8080/generate-dishes",
+      setGeneratedDishes([]);
+      await streamDishes<AIDish>(
         {
           type: "custom",
           ingredients: validIngredients.map((ing) => ({
@@ -125,30 +110,17 @@ export function AIDish() {
             quantity: ing.quantity,
           })),
           message: message.trim(),
-        }
+        },
+        (dish) => setGeneratedDishes((dishes) => [...dishes, dish])
       );
-
-      if (response.data.success) {
-        setGeneratedDishes(response.data.dishes);
-      } else {
-        setError(response.data.message || "Failed to generate dishes");
-      }
     } catch (error) {
-      if (axios.isAxiosError(error)) {
-        if (error.code === "ECONNREFUSED") {
-          setError(
-            "Could not connect to the server. Please make sure the Flask server is running on port 5001."
-          );
-        } else if (error.response) {
-          setError(
-            error.response.data.message ||
-              "Server error occurred. Please try again."
-          );
-        } else {
-          setError(
-            "Network error occurred. Please check your connection and try again."
-          );
-        }
+      if (error instanceof TypeError) {
+        // fetch rejects with a TypeError when the server is unreachable
+        setError(
+          "Network error occurred. Please check your connection and try again."
+        );
+      } else if (error instanceof Error) {
+        setError(error.message || "Server error occurred. Please try again.");
       } else {
         setError("An unexpected error occurred. Please try again.");
       }
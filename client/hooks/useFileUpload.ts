@@ -1,5 +1,6 @@
 import { useState, useCallback } from "react";
 import axios from "axios";
+import { waitForJob } from "@/lib/api";
 
 export type DataItem = {
   date: string;
@@ -56,13 +57,16 @@ export default function useFileUpload() {
     if (season) formData.append("season", season);
   
     try {
-      const response = await axios.post(
+      const job = await axios.post(
         "http://localhost:8080/upload_csv",
         formData,
         {
           headers: { "Content-Type": "multipart/form-data" },
         }
       );
+
+      // Forecasting runs as a background job; wait for its result
+      const response = { data: await waitForJob<any>(job.data) };
   
       console.log("API Response:", response.data); // Log the response for debugging
   
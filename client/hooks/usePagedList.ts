@@ -0,0 +1,78 @@
+import { useState, useEffect, useCallback, useRef } from "react";
+import { fetchPage } from "@/lib/api";
+
+type PagedListOptions<T> = {
+  pageSize?: number;
+  fields?: string[];
+  // Applied to every item as it arrives (e.g. to fix up photo URLs)
+  transform?: (item: T) => T;
+};
+
+// Loads the first page of a list endpoint and appends the next page on
+// demand, so views render as soon as one page has arrived. Items already in
+// the list (e.g. added locally) are not appended twice.
+export default function usePagedList<T extends { _id?: string }>(
+  url: string,
+  key: string,
+  options: PagedListOptions<T> = {}
+) {
+  const [items, setItems] = useState<T[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const optionsRef = useRef(options);
+  optionsRef.current = options;
+
+  const load = useCallback(
+    async (cursor: string | null) => {
+      const { pageSize, fields, transform } = optionsRef.current;
+      const page = await fetchPage<T>(url, key, { cursor, limit: pageSize, fields });
+      if (!page.success) return;
+      const pageItems = transform ? page.items.map(transform) : page.items;
+      setItems((prev) => {
+        if (!cursor) return pageItems;
+        const seen = new Set(prev.map((item) => item._id));
+        return [...prev, ...pageItems.filter((item) => !seen.has(item._id))];
+      });
+      setNextCursor(page.nextCursor);
+    },
+    [url, key]
+  );
+
+  const reload = useCallback(async () => {
+    setIsLoading(true);
+    try {
+      await load(null);
+    } catch (error) {
+      console.error(`Error fetching ${key}:`, error);
+    } finally {
+      setIsLoading(false);
+    }
+  }, [load, key]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      await load(nextCursor);
+    } catch (error) {
+      console.error(`Error fetching more ${key}:`, error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [load, key, nextCursor, isLoadingMore]);
+
+  useEffect(() => {
+    reload();
+  }, [reload]);
+
+  return {
+    items,
+    setItems,
+    isLoading,
+    isLoadingMore,
+    hasMore: nextCursor !== null,
+    loadMore,
+    reload,
+  };
+}
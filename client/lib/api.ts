@@ -28,3 +28,146 @@ export const handleUpload = async (
     console.error("Error uploading file", error);
   }
 };
+
+type JobAccepted = {
+  job_id: string;
+  status: string;
+  result_url: string;
+};
+
+type WaitForJobOptions = {
+  intervalMs?: number;
+  // Give up after this long; the job may still finish on the server
+  timeoutMs?: number;
+  signal?: AbortSignal;
+};
+
+const sleep = (ms: number, signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    if (signal?.aborted) return reject(signal.reason);
+    const timer = setTimeout(() => {
+      signal?.removeEventListener("abort", onAbort);
+      resolve();
+    }, ms);
+    const onAbort = () => {
+      clearTimeout(timer);
+      reject(signal?.reason);
+    };
+    signal?.addEventListener("abort", onAbort, { once: true });
+  });
+
+// Long-running uploads are processed as background jobs: the server answers
+// 202 with a job id and the result is fetched from result_url once ready.
+// Rejects when the job fails or is gone (404), after timeoutMs, or when
+// signal is aborted.
+export const waitForJob = async <T = unknown>(
+  job: JobAccepted,
+  { intervalMs = 1000, timeoutMs = 10 * 60 * 1000, signal }: WaitForJobOptions = {}
+): Promise<T> => {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    const res = await fetch(`http://localhost:8080${job.result_url}`, { signal });
+    if (res.status === 202) {
+      if (Date.now() + intervalMs > deadline) {
+        throw new Error("Timed out waiting for the job to finish");
+      }
+      await sleep(intervalMs, signal);
+      continue;
+    }
+    const data = await res.json().catch(() => ({}));
+    if (res.status === 404) {
+      throw new Error(data.error || "Job not found");
+    }
+    if (!res.ok) {
+      throw new Error(data.error || "Job failed");
+    }
+    return data as T;
+  }
+};
+
+// Streams generated dishes from /generate-dishes/stream. onDish is called for
+// each dish as soon as the server sends it; resolves with the number of dishes.
+export const streamDishes = async <T = unknown>(
+  body: Record<string, unknown>,
+  onDish: (dish: T) => void
+): Promise<number> => {
+  const res = await fetch("http://localhost:8080/generate-dishes/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+  if (!res.ok || !res.body) {
+    const data = await res.json().catch(() => ({}));
+    throw new Error(data.message || "Failed to generate dishes");
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let count = 0;
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let event = "message";
+      let data = "";
+      for (const line of raw.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === "dish") {
+        count += 1;
+        onDish(payload as T);
+      } else if (event === "error") {
+        throw new Error(payload.message || "Failed to generate dishes");
+      }
+    }
+  }
+  return count;
+};
+
+// List endpoints (/dishes, /menus) return one page at a time. Fetch a single
+// page; pass the returned nextCursor to get the page after it. fields limits
+// the response to the columns a view needs.
+export type PageOptions = {
+  cursor?: string | null;
+  limit?: number;
+  fields?: string[];
+};
+
+export type Page<T> = {
+  success: boolean;
+  items: T[];
+  nextCursor: string | null;
+};
+
+export const fetchPage = async <T = unknown>(
+  url: string,
+  key: string,
+  { cursor, limit = 24, fields }: PageOptions = {}
+): Promise<Page<T>> => {
+  const params: Record<string, string | number> = { limit };
+  if (cursor) params.cursor = cursor;
+  if (fields?.length) params.fields = fields.join(",");
+  const response = await axios.get(url, { params });
+  if (!response.data.success) {
+    return { success: false, items: [], nextCursor: null };
+  }
+  return {
+    success: true,
+    items: response.data[key] as T[],
+    nextCursor: response.data.next_cursor ?? null,
+  };
+};
@@ -1,26 +1,67 @@
-import io
-from venv import logger
-from flask import jsonify, request, send_file
-from models.SecondModule.predicit_ingredient import predict_ingredient
-from services.ai_dish_service import generate_ai_response, get_surplus_ingredients
+from flask import jsonify, request, send_file, url_for, Response, stream_with_context
+from models.SecondModule.predicit_ingredient import predict_ingredient, predict_ingredient_by_center
+from models.SecondModule.forecast_charts import forecast_charts, chart_filename
+from utils.image_cache import cropped_graph_cache
+from services.ai_dish_service import generate_dishes_cached, dish_cache, dish_request, stream_dishes
 from utils.file_utils import save_uploaded_file
-from services.ingredient_detector import IngredientDetector
+from services.ingredient_detector import IngredientDetector, detection_cache
+from utils.frame_change import live_frame_filter
 from services.file_service import allowed_file, save_upload_file, process_excel_file
 from services.menu_optimization import optimize_menu
-from services.dish_service import add_dish, get_all_dishes, get_dish, delete_dish
+from services.dish_service import add_dish, bulk_add_dishes, get_all_dishes, get_dish, delete_dish
 from services.menu_service import analyze_image, create_menu, get_all_menus, get_menu, update_menu, delete_menu
-from config.constant import GRAPH_FOLDER
+from config.constant import logger, GRAPH_FOLDER, MODEL_WEIGHTS_DIR, VIDEO_SAMPLING_MODE, VIDEO_FRAME_STRIDE, JOB_LIMITS, DEFAULT_CENTER_ID
+from models.model_registry import model_registry
+from services.job_service import job_manager, job_summary, QueueFullError, SUCCEEDED, FAILED
 from flask import send_from_directory
-from utils.db import db
+from utils.db import db, pool_stats
+from utils.db_indexes import explain_queries
+from utils.json_provider import dumps_bytes
+from utils.upload_stream import accepts_upload, upload_digest
+from utils.admin_auth import require_admin_token
 import os
-import json
-import numpy as np
-from PIL import Image
 
 # Initialize the detector service
 detector = IngredientDetector()
 
 
+def detect_image_job(filename, filepath, digest=None):
+    """Background job: detect ingredients in an uploaded image"""
+    return {
+        "message": "Image uploaded and analyzed successfully",
+        "filename": filename,
+        "path": filepath,
+        "ingredients": detector.detect_from_image(filepath, digest=digest)
+    }
+
+
+def detect_video_job(filename, filepath, mode, stride):
+    """Background job: detect ingredients in an uploaded video"""
+    return {
+        "message": "Video uploaded and analyzed successfully",
+        "filename": filename,
+        "path": filepath,
+        "ingredients": detector.detect_from_video(filepath, mode=mode, stride=stride)
+    }
+
+
+# Heavy work runs on the job manager's worker pools, not on request threads
+job_manager.register("detect_image", detect_image_job, **JOB_LIMITS["detect_image"])
+job_manager.register("detect_video", detect_video_job, **JOB_LIMITS["detect_video"])
+
+
+def job_accepted_response(job):
+    """202 response pointing the client at the job's status and result"""
+    return jsonify({
+        "message": "Job accepted",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": url_for("api.job_status_handler", job_id=job["id"]),
+        "result_url": url_for("api.job_result_handler", job_id=job["id"])
+    }), 202
+
+
+@accepts_upload("image")
 def upload_live_frame_handler():
     """Handler for live frame uploads"""
     try:
@@ -28,25 +69,29 @@ def upload_live_frame_handler():
             return jsonify({"error": "No frame provided"}), 400
 
         frame = request.files["frame"]
+        # Frames are compared with the last one from the same camera
+        camera_id = request.form.get("camera_id") or request.headers.get("X-Camera-Id") or "default"
 
         # Save the frame
         filename, filepath = save_uploaded_file(frame, folder_type="live")
 
-        # Detect ingredients
-        detected_ingredients = detector.detect_from_image(filepath)
+        # Detect ingredients, reusing the last result if the scene has not changed
+        detected_ingredients, unchanged = detector.detect_from_frame(filepath, camera_id=camera_id)
         
         return jsonify({
             "message": "Frame uploaded successfully",
             "filename": filename,
             "path": filepath,
+            "camera_id": camera_id,
+            "unchanged": unchanged,
             "ingredients": detected_ingredients
         })
     except Exception as e:
-        from config.constant import logger
         logger.error(f"Error uploading frame: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@accepts_upload("image")
 def upload_image_handler():
     """Handler for image uploads"""
     try:
@@ -58,21 +103,18 @@ def upload_image_handler():
         # Save the image
         filename, filepath = save_uploaded_file(image, folder_type="image")
 
-        # Detect ingredients
-        detected_ingredients = detector.detect_from_image(filepath)
-
-        return jsonify({
-            "message": "Image uploaded and analyzed successfully",
-            "filename": filename,
-            "path": filepath,
-            "ingredients": detected_ingredients
-        })
+        # Detect ingredients in the background
+        job = job_manager.submit("detect_image", filename=filename, filepath=filepath,
+                                 digest=upload_digest(image))
+        return job_accepted_response(job)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 429
     except Exception as e:
-        from config.constant import logger
         logger.error(f"Error uploading image: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@accepts_upload("video")
 def upload_video_handler():
     """Handler for video uploads"""
     try:
@@ -84,17 +126,19 @@ def upload_video_handler():
         # Save the video
         filename, filepath = save_uploaded_file(video, folder_type="video")
 
-        # Process the video
-        detected_ingredients = detector.detect_from_image(filepath)
-        
-        return jsonify({
-            "message": "Video uploaded and analyzed successfully",
-            "filename": filename,
-            "path": filepath,
-            "ingredients": detected_ingredients
-        })
+        # Sampling can be tuned per upload, e.g. mode=scene&stride=5
+        mode = request.form.get("mode", VIDEO_SAMPLING_MODE)
+        stride = request.form.get("stride", VIDEO_FRAME_STRIDE, type=int)
+        if mode not in ("stride", "scene") or stride < 1:
+            return jsonify({"error": "Invalid sampling mode or stride"}), 400
+
+        # Process the video in the background
+        job = job_manager.submit("detect_video", filename=filename, filepath=filepath,
+                                 mode=mode, stride=stride)
+        return job_accepted_response(job)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 429
     except Exception as e:
-        from config.constant import logger
         logger.error(f"Error uploading video: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
@@ -113,39 +157,27 @@ def health_check_handler():
 # Add this endpoint to serve images
 def serve_graph_image_handler(filename):
     """Serve graph images from the storage folder with slight cropping from top."""
-    from config.constant import logger
     logger.debug(f"Serving graph image: {filename}")
     
-    # Full path to the image file
-    file_path = os.path.join(GRAPH_FOLDER, filename)
-    
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            logger.error(f"Image file not found: {file_path}")
+        # Render the chart from its stored forecast on first request
+        file_path = forecast_charts.render(os.path.basename(filename))
+        if file_path is None:
+            logger.error(f"Image file not found: {filename}")
             return "Image not found", 404
             
-        # Open the image using Pillow
-        img = Image.open(file_path)
+        # Crop from top (removing about 10% from the top) once per chart version
+        cropped_path = cropped_graph_cache.get(file_path)
         
-        # Get image dimensions
-        width, height = img.size
-        
-        # Crop from top (removing about 10% from the top)
-        crop_amount = int(height * 0.1)  # 10% of height
-        cropped_img = img.crop((0, crop_amount, width, height))
-        
-        # Save to a bytes buffer
-        img_io = io.BytesIO()
-        cropped_img.save(img_io, format=img.format or 'PNG')
-        img_io.seek(0)
-        
-        # Send the cropped image with the original mimetype
+        # ETag and Last-Modified follow the chart version, so clients that
+        # already have it get a 304 without the file being read
         return send_file(
-            img_io,
-            mimetype=f'image/{img.format.lower() if img.format else "png"}',
+            cropped_path,
             as_attachment=False,
-            download_name=filename
+            download_name=filename,
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(cropped_path)
         )
         
     except Exception as e:
@@ -153,37 +185,22 @@ def serve_graph_image_handler(filename):
         # Fall back to the original file if there's an error
         return send_from_directory(GRAPH_FOLDER, filename)
 
-def get_top_forecast_images():
+def get_top_forecast_images(center_id=DEFAULT_CENTER_ID):
     """
     Get paths to the top 2 meal forecast images and top 2 ingredient forecast images
-    from the graph images folder.
+    of a center. The charts are listed from the stored forecast data and only
+    rendered when their URL is requested.
     
     Returns:
         dict: Dictionary containing paths to top meal and ingredient forecast images
     """
-    from config.constant import logger
-    
-    # Check if graph folder exists
-    if not os.path.exists(GRAPH_FOLDER):
-        logger.warning(f"Graph folder not found: {GRAPH_FOLDER}")
-        return {"topMealImages": [], "topIngredientImages": []}
+    # Top 2 meal category charts (center_<id>_category_forecast_*), sorted for consistent results
+    top_meal_images = [chart_filename(center_id, "category", name)
+                       for name in forecast_charts.chart_names(center_id, "category")[:2]]
     
-    # Get all files from graph folder
-    files = os.listdir(GRAPH_FOLDER)
-    
-    # Filter meal forecast images (category_forecast_*)
-    meal_images = [file for file in files if file.startswith("category_forecast_")]
-    # Sort them to get consistent results
-    meal_images.sort()
-    # Get top 2 meal images
-    top_meal_images = meal_images[:2]
-    
-    # Filter ingredient forecast images (ingredient_forecast_*)
-    ingredient_images = [file for file in files if file.startswith("ingredient_forecast_")]
-    # Sort them to get consistent results
-    ingredient_images.sort()
-    # Get top 2 ingredient images
-    top_ingredient_images = ingredient_images[:2]
+    # Top 2 ingredient charts (center_<id>_ingredient_forecast_*)
+    top_ingredient_images = [chart_filename(center_id, "ingredient", name)
+                             for name in forecast_charts.chart_names(center_id, "ingredient")[:2]]
     
     # Convert file names to URLs with the proper base URL
     base_url = "http://localhost:8080/graph_images"  # Make sure this matches your route
@@ -197,10 +214,9 @@ def get_top_forecast_images():
         "topMealImages": top_meal_image_urls,
         "topIngredientImages": top_ingredient_image_urls
     }
+@accepts_upload("data")
 def upload_file_handler():
     """Handler for Excel file uploads"""
-    from config.constant import logger
-
     if request.method == "OPTIONS":
         return "", 200
 
@@ -219,55 +235,112 @@ def upload_file_handler():
         return jsonify({"error": "Invalid file type. Only Excel files are allowed"}), 400
 
     try:
-        # Save and process the file
+        # Save the file and forecast it in the background
         filepath = save_upload_file(file)
         logger.debug(f"File saved to: {filepath}")
 
-        # Process the file (currently returns dummy data)
-        result = predict_ingredient(filepath)
-
-        logger.debug(f"Result: {result}")
-        logger.debug(f"Type of result: {type(result)}")
-
-        # Create a custom encoder to handle NumPy types
-        class NumpyEncoder(json.JSONEncoder):
-            def default(self, obj):
-                if isinstance(obj, np.integer):
-                    return int(obj)
-                elif isinstance(obj, np.floating):
-                    return float(obj)
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                return super(NumpyEncoder, self).default(obj)
-
-        # Convert NumPy types to native Python types
-        ingredient_requirements = json.loads(json.dumps(
-            result["ingredient_requirements"], cls=NumpyEncoder))
-        top_meal_details = json.loads(json.dumps(
-            result["top_meal_details"], cls=NumpyEncoder))
-        
-        # Get forecast graph images
-        forecast_images = get_top_forecast_images()
-        
-        # Return the processed result with forecast images
-        return jsonify({
-            "success": True,
-            "data": {
-                "ingredient_requirements": ingredient_requirements,
-                "top_meal_details": top_meal_details,
-                "forecast_images": forecast_images
-            },
-            "message": "File processed successfully"
-        })
+        # mode=incremental appends the CSV's new weeks to the previous upload
+        incremental = request.form.get("mode") == "incremental"
 
-    except Exception as e:
-        logger.error(f"Error processing file: {str(e)}")
-        return jsonify({"error": str(e)}), 400
+        # centers=all or centers=55,10 forecasts several centers in one pass
+        centers = request.form.get("centers")
+        if centers and centers != "all":
+            try:
+                centers = [int(center) for center in centers.split(",")]
+            except ValueError:
+                return jsonify({"error": "centers must be 'all' or a comma-separated list of ids"}), 400
+
+        job = job_manager.submit("forecast", filepath=filepath, incremental=incremental,
+                                 centers=centers)
+        return job_accepted_response(job)
+
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 429
 
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         return jsonify({"error": str(e)}), 400
 
+
+def forecast_job(filepath, incremental=False, centers=None):
+    """
+    Background job: forecast demand and ingredient requirements from a CSV.
+    Without ``centers`` only the default center is forecast; ``centers`` is
+    either "all" or a list of center ids.
+    """
+    # Process the file
+    if centers:
+        center_ids = None if centers == "all" else centers
+        results = predict_ingredient_by_center(filepath, center_ids, incremental=incremental)
+    else:
+        results = {DEFAULT_CENTER_ID: predict_ingredient(filepath, incremental=incremental)}
+
+    logger.debug(f"Result: {results}")
+
+    center_data = {}
+    for center_id, result in results.items():
+        # Get forecast graph images
+        forecast_images = get_top_forecast_images(center_id)
+
+        center_data[center_id] = {
+            "ingredient_requirements": result["ingredient_requirements"],
+            "top_meal_details": result["top_meal_details"],
+            "forecast_images": forecast_images,
+            "fit_timings": result.get("fit_timings", [])
+        }
+
+    # Keep the single-center response shape unless centers were requested
+    if centers:
+        data = {"centers": {str(center_id): value for center_id, value in center_data.items()}}
+    else:
+        data = center_data[DEFAULT_CENTER_ID]
+
+    # Return the processed result with forecast images
+    return {
+        "success": True,
+        "data": data,
+        "message": "File processed successfully"
+    }
+
+
+job_manager.register("forecast", forecast_job, **JOB_LIMITS["forecast"])
+
+
+# Job endpoints for the background work above
+JOB_SUBMIT_HANDLERS = {
+    "detect_image": upload_image_handler,
+    "detect_video": upload_video_handler,
+    "forecast": upload_file_handler,
+}
+
+
+@accepts_upload(lambda job_type: getattr(JOB_SUBMIT_HANDLERS.get(job_type), "upload_kind", None))
+def job_submit_handler(job_type):
+    """Submit a job by type; accepts the same upload as the matching endpoint"""
+    if job_type not in JOB_SUBMIT_HANDLERS:
+        return jsonify({"error": f"Unknown job type: {job_type}"}), 404
+    return JOB_SUBMIT_HANDLERS[job_type]()
+
+
+def job_status_handler(job_id):
+    """Report the state of a background job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_summary(job))
+
+
+def job_result_handler(job_id):
+    """Return a finished job's result, or 202 while it is still running"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == SUCCEEDED:
+        return jsonify(job["result"])
+    if job["status"] == FAILED:
+        return jsonify({"error": job["error"], "job_id": job_id}), 500
+    return jsonify(job_summary(job)), 202
+
 def optimize_menu_handler():
     """Handle menu optimization requests."""
     try:
@@ -285,6 +358,11 @@ def dish_handler():
     else:  # GET
         return get_all_dishes(db)
 
+@accepts_upload("data")
+def dish_bulk_handler():
+    """Handle bulk dish imports from a CSV or NDJSON upload."""
+    return bulk_add_dishes(db)
+
 def dish_detail_handler(dish_id):
     """Handle requests for a specific dish."""
     return get_dish(db, dish_id)
@@ -314,102 +392,16 @@ def dish_generation_handler():
                 "message": "Generation type is required"
             })
             
-        if generation_type == 'inventory':
-            # Generate dishes based on current inventory
-            surplus_ingredients = get_surplus_ingredients()
-            prompt = f"""Create 2 creative dishes using these surplus ingredients: {surplus_ingredients}.
-            and recipe for creating this dish: {message}
-            
-            Guidelines:
-            - mandatory is to create a recipe for the dish
-            - Use short, catchy names (max 3-4 words)
-            - Use realistic market prices for ingredients
-            - Include all ingredients, even small amounts
-            - Cost should be between $10-30 per dish
-            - Profit margin should be 20-35%
-            - For each ingredient, specify exact quantity and unit (e.g., grams, cups, pieces)
-            
-            Format the response as JSON with this structure:
-            {{
-                "dishes": [
-                    {{
-                        "name": "string",
-                        "description": "string",
-                        "recipe": {{
-                            "steps": [
-                                "Step 1: ...",
-                                "Step 2: ...",
-                                "Step 3: ..."
-                            ]
-                        }},
-                        "ingredients": [
-                            {{
-                                "name": "string",
-                                "quantity": number,
-                                "unit": "string"
-                            }}
-                        ],
-                        "cost": number,
-                        "profit_margin": number,
-                        "special_occasion": boolean
-                    }}
-                ]
-            }}"""
-            
-        elif generation_type == 'custom':
-            # Generate dishes based on custom ingredients
-            ingredients = data.get('ingredients', [])
-            
-            if not ingredients:
-                return jsonify({
-                    "success": False,
-                    "message": "No ingredients provided"
-                })
-            
-            prompt = f"""Create 2 creative dishes using these ingredients: {ingredients} and recipe for creating this dish: {message}
-            
-            Guidelines:
-            - mandatory is to create a recipe for the dish
-            - Use short, catchy names (max 3-4 words)
-            - Use realistic market prices for ingredients
-            - Include all ingredients, even small amounts
-            - Cost should be between $10-30 per dish
-            - Profit margin should be 20-35%
-            
-            Format the response as JSON with this structure:
-            {{
-                "dishes": [
-                    {{
-                        "name": "string",
-                        "description": "string",
-                        "recipe": {{
-                            "steps": [
-                                "Step 1: ...",
-                                "Step 2: ...",
-                                "Step 3: ..."
-                            ]
-                        }},
-                        "ingredients": [
-                            {{
-                                "name": "string",
-                                "quantity": number,
-                                "unit": "string"
-                            }}
-                        ],
-                        "cost": number,
-                        "profit_margin": number,
-                        "special_occasion": boolean
-                    }}
-                ]
-            }}"""
-        else:
+        try:
+            ingredients, prompt = dish_request(generation_type, data)
+        except ValueError as e:
             return jsonify({
                 "success": False,
-                "message": "Invalid generation type"
+                "message": str(e)
             })
 
-        # Generate response from Gemini API
-        response = generate_ai_response(prompt)
+        # Generate response from Gemini API (or reuse a cached answer)
+        response = generate_dishes_cached(generation_type, ingredients, message, prompt)
         
         if not response or "dishes" not in response:
             return jsonify({
@@ -433,6 +425,53 @@ def dish_generation_handler():
 
 
 
+
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {dumps_bytes(data).decode()}\n\n"
+
+
+def dish_generation_stream_handler():
+    """
+    Stream generated dishes as server-sent events: one "dish" event per dish
+    as soon as the model has written it, then "done" (or "error").
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"success": False, "message": "No data provided"}), 400
+
+    generation_type = data.get('type')
+    message = data.get('message', '')
+    if not generation_type:
+        return jsonify({"success": False, "message": "Generation type is required"}), 400
+
+    try:
+        ingredients, prompt = dish_request(generation_type, data)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    def events():
+        count = 0
+        try:
+            for dish in stream_dishes(generation_type, ingredients, message, prompt):
+                count += 1
+                yield sse_event("dish", dish)
+
+            if count:
+                yield sse_event("done", {"count": count})
+            else:
+                yield sse_event("error", {"message": "Failed to generate dishes"})
+        except Exception as e:
+            logger.error(f"Error streaming dishes: {str(e)}")
+            yield sse_event("error", {"message": str(e)})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        # Keep proxies from buffering the events
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 def menu_handler():
     """Handle menu-related requests."""
     if request.method == 'POST':
@@ -455,6 +494,65 @@ def health_check_handler():
     return jsonify({"status": "healthy", "message": "API is running"})
 
 
+def metrics_handler():
+    """Runtime counters for caches, background jobs, live frames and the database pool"""
+    return jsonify({
+        "caches": {
+            "dish_generation": dish_cache.stats(),
+            "detection": detection_cache.stats(),
+        },
+        "jobs": job_manager.stats(),
+        "live_frames": live_frame_filter.stats(),
+        "database": pool_stats(),
+    })
+
+
+@require_admin_token
+def db_explain_handler():
+    """Query plans of the hot queries, flagging any that scan a whole collection (admin token required)"""
+    try:
+        report = explain_queries(db)
+        return jsonify({
+            "queries": report,
+            "collscans": [entry["query"] for entry in report if entry["collscan"]],
+        })
+    except Exception as e:
+        logger.error(f"Error explaining queries: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+def model_stats_handler():
+    """Report load time and memory use of the registered models"""
+    return jsonify({"models": model_registry.stats()})
+
+
+@require_admin_token
+def model_reload_handler(name):
+    """Swap a registered model for new weights without restarting (admin token required)"""
+    data = request.get_json(silent=True) or {}
+    weights_path = data.get("weights_path")
+
+    if weights_path:
+        # Only allow weight files that live inside the weights directory
+        weights_path = os.path.realpath(os.path.join(MODEL_WEIGHTS_DIR, weights_path))
+        if not weights_path.startswith(os.path.realpath(MODEL_WEIGHTS_DIR) + os.sep):
+            return jsonify({"error": "Weights must be inside the model weights directory"}), 400
+        if os.path.splitext(weights_path)[1].lower() not in (".pt", ".pth"):
+            return jsonify({"error": "Weights must be a .pt or .pth file"}), 400
+
+    try:
+        stats = model_registry.reload(name, weights_path)
+        return jsonify({"message": f"Model {name} reloaded", "model": stats})
+    except KeyError:
+        return jsonify({"error": f"Unknown model: {name}"}), 404
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error reloading model {name}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@accepts_upload("image")
 def analyze_image_handler():
     
         if 'image_file' in request.files:
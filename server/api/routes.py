@@ -2,6 +2,7 @@ from flask import Blueprint
 from api.handlers import (
     analyze_image_handler,
     dish_generation_handler,
+    dish_generation_stream_handler,
     upload_live_frame_handler,
     upload_image_handler,
     upload_video_handler,
@@ -9,11 +10,19 @@ from api.handlers import (
     optimize_menu_handler,
     health_check_handler,
     dish_handler,
+    dish_bulk_handler,
     dish_detail_handler,
     menu_handler,
     menu_detail_handler,
     dish_delete_handler,
-    serve_graph_image_handler  # Add this import
+    serve_graph_image_handler,  # Add this import
+    model_stats_handler,
+    model_reload_handler,
+    job_submit_handler,
+    job_status_handler,
+    job_result_handler,
+    metrics_handler,
+    db_explain_handler
 )
 
 # Create a blueprint for API routes
@@ -31,9 +40,11 @@ api_bp.route("/optimize-menu", methods=["POST"])(optimize_menu_handler)
 
 # Define routes for dishes
 api_bp.route("/dishes", methods=["GET", "POST"])(dish_handler)
+api_bp.route("/dishes/bulk", methods=["POST"])(dish_bulk_handler)
 api_bp.route("/dishes/<dish_id>", methods=["GET"])(dish_detail_handler)
 api_bp.route("/dishes/<dish_id>", methods=["DELETE"])(dish_delete_handler)
 api_bp.route("/generate-dishes", methods=["POST"])(dish_generation_handler)
+api_bp.route("/generate-dishes/stream", methods=["POST"])(dish_generation_stream_handler)
 
 # Define routes for menus
 api_bp.route("/menus", methods=["GET", "POST"])(menu_handler)
@@ -43,8 +54,19 @@ api_bp.route('/analyze-image', methods=['POST'])(analyze_image_handler)
 # Route to serve graph images
 api_bp.route('/graph_images/<filename>')(serve_graph_image_handler)
 
-# Health check
+# Model registry
+api_bp.route("/models", methods=["GET"])(model_stats_handler)
+api_bp.route("/models/<name>/reload", methods=["POST"])(model_reload_handler)
+
+# Background jobs
+api_bp.route("/jobs/<job_type>", methods=["POST"])(job_submit_handler)
+api_bp.route("/jobs/<job_id>", methods=["GET"])(job_status_handler)
+api_bp.route("/jobs/<job_id>/result", methods=["GET"])(job_result_handler)
+
+# Health check and runtime metrics
 api_bp.route("/health", methods=["GET"])(health_check_handler)
+api_bp.route("/metrics", methods=["GET"])(metrics_handler)
+api_bp.route("/db/explain", methods=["GET"])(db_explain_handler)
 
 # Add backwards compatibility routes
 api_bp.route("/get-dishes", methods=["GET"])(dish_handler)
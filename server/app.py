@@ -3,20 +3,42 @@ from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
 from api import api_bp
-from config.constant import DEBUG, PORT, HOST, MAX_CONTENT_LENGTH, UPLOAD_FOLDER
+from config.constant import DEBUG, PORT, HOST, MAX_CONTENT_LENGTH, UPLOAD_FOLDER, PRELOAD_MODELS, ENSURE_INDEXES
+from models.model_registry import model_registry
+from utils.db import db
+from utils.db_indexes import ensure_indexes_in_background
+from utils.json_provider import FastJSONProvider
+from utils.upload_stream import StreamingUploadRequest, enforce_upload_limit, upload_too_large, prune_spool
 
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
 
+    # Serialize NumPy, pandas, ObjectId and datetime values in one pass
+    app.json = FastJSONProvider(app)
+
     # Register configuration
     app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
+    # Stream uploads to disk while hashing them, with per-kind size limits
+    app.request_class = StreamingUploadRequest
+    app.before_request(enforce_upload_limit)
+    app.register_error_handler(413, upload_too_large)
+    prune_spool()
+
     # Enable CORS
     CORS(app, resources={r"/*": {"origins": "*"}})
 
     # Register API blueprint
     app.register_blueprint(api_bp)
+
+    # Warm up the detection models once per worker
+    if PRELOAD_MODELS:
+        model_registry.preload()
+
+    # Build missing MongoDB indexes without delaying startup
+    if ENSURE_INDEXES:
+        ensure_indexes_in_background(db)
     
     # Add route for static files
     @app.route('/uploads/<filename>')
@@ -36,7 +58,11 @@ def create_app():
                 "/api/upload_live_frame",
                 "/api/optimize-menu",
                 "/api/menus",
-                "/api/dishes"
+                "/api/dishes",
+                "/api/models",
+                "/api/metrics",
+                "/api/db/explain",
+                "/ws/live"
             ]
         })
 
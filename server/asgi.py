@@ -0,0 +1,19 @@
+# ASGI entry point: uvicorn asgi:app (or python serve.py for multiple workers)
+from a2wsgi import WSGIMiddleware
+from app import create_app
+from config.constant import ASGI_THREADS, LIVE_STREAM_PATH
+from services.live_stream import live_stream_endpoint
+
+# Flask views are synchronous: each request occupies one of ASGI_THREADS
+# threads for its whole duration, including time spent waiting on Gemini or
+# MongoDB. Requests in flight per process are therefore capped by ASGI_THREADS;
+# raise it for slow upstream calls, or SERVER_WORKERS for CPU-bound work.
+flask_app = WSGIMiddleware(create_app(), workers=ASGI_THREADS)
+
+
+async def app(scope, receive, send):
+    """Serve the live stream WebSocket natively and everything else through Flask"""
+    if scope["type"] == "websocket" and scope["path"] == LIVE_STREAM_PATH:
+        await live_stream_endpoint(scope, receive, send)
+    else:
+        await flask_app(scope, receive, send)
@@ -0,0 +1,93 @@
+"""
+Benchmark of the per-category ingredient requirement computation.
+
+Compares the previous loop (one filter and 30 column products per
+category) with the grouped ratio matrix used by
+``calculate_ingredient_requirements``, on a synthetic demand frame.
+
+Usage (from the server folder):
+    python -m benchmarks.bench_ingredient_requirements --rows 1000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from models.SecondModule.predicit_ingredient import INGREDIENTS, calculate_ingredient_requirements
+
+CATEGORIES = ['Beverages', 'Biryani', 'Desert', 'Extras', 'Fish', 'Other Snacks', 'Pasta',
+              'Pizza', 'Rice Bowl', 'Salad', 'Sandwich', 'Seafood', 'Soup', 'Starters']
+
+
+def make_demand_frame(rows, seed=0):
+    """Synthetic demand rows with the columns the computation reads"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.integers(0, 2, size=(rows, len(INGREDIENTS))), columns=INGREDIENTS)
+    df['category'] = rng.choice(CATEGORIES, size=rows)
+    df['num_orders'] = rng.integers(10, 1000, size=rows)
+    return df
+
+
+def make_forecasts(seed=0):
+    """One-row forecast frames shaped like Prophet's output"""
+    rng = np.random.default_rng(seed)
+    return {category: pd.DataFrame({'yhat': [rng.uniform(100, 5000)]}) for category in CATEGORIES}
+
+
+def legacy_requirements(df, category_forecasts):
+    """The per-category loop this benchmark compares against"""
+    next_week_forecasts = {}
+    for category, forecast in category_forecasts.items():
+        next_week_forecasts[category] = forecast.iloc[-1]['yhat']
+
+    category_ingredient_ratios = {}
+    for category in df['category'].unique():
+        category_data = df[df['category'] == category]
+        total_orders = category_data['num_orders'].sum()
+
+        if total_orders > 0:
+            ingredient_usage = category_data[INGREDIENTS].mul(
+                category_data['num_orders'], axis=0).sum()
+            category_ingredient_ratios[category] = ingredient_usage / total_orders
+        else:
+            category_ingredient_ratios[category] = pd.Series(0, index=INGREDIENTS)
+
+    total_requirements = pd.Series(0, index=INGREDIENTS)
+    for category, forecast_value in next_week_forecasts.items():
+        if category in category_ingredient_ratios:
+            total_requirements += category_ingredient_ratios[category] * forecast_value
+    return total_requirements
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ingredient requirement computation')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of demand rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation (best is reported)')
+    args = parser.parse_args()
+
+    df = make_demand_frame(args.rows)
+    forecasts = make_forecasts()
+
+    legacy_seconds, expected = best_time(lambda: legacy_requirements(df, forecasts), args.repeat)
+    vectorized_seconds, (actual, _) = best_time(
+        lambda: calculate_ingredient_requirements(df, forecasts), args.repeat)
+
+    assert np.allclose(expected.to_numpy(dtype='float64'), actual.reindex(expected.index).to_numpy()), \
+        "Vectorized requirements differ from the loop implementation"
+
+    print(f"Rows: {args.rows:,}, categories: {len(CATEGORIES)}, ingredients: {len(INGREDIENTS)}")
+    print(f"Per-category loop: {legacy_seconds * 1000:.1f} ms")
+    print(f"Ratio matrix:      {vectorized_seconds * 1000:.1f} ms")
+    print(f"Speedup:           {legacy_seconds / vectorized_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark of the queries behind GET /menus.
+
+Seeds menus and dishes into mongomock (or a real mongod with --mongo-uri),
+then counts the queries and times the previous per-menu dish lookup against
+``get_all_menus``, which fetches the dishes of every menu in one query.
+
+Usage (from the server folder):
+    python -m benchmarks.bench_menu_queries --menus 300 --dishes-per-menu 8
+    python -m benchmarks.bench_menu_queries --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+from bson.objectid import ObjectId
+from flask import Flask
+from services.menu_service import get_all_menus
+
+
+class CountingCollection:
+    """Collection proxy that counts the read queries sent through it"""
+
+    def __init__(self, collection, counts):
+        self._collection = collection
+        self._counts = counts
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name in ("find", "find_one", "aggregate"):
+            def counted(*args, **kwargs):
+                self._counts[self._collection.name] = self._counts.get(self._collection.name, 0) + 1
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+class CountingDatabase:
+    def __init__(self, db):
+        self._db = db
+        self.counts = {}
+
+    def __getattr__(self, name):
+        return CountingCollection(self._db[name], self.counts)
+
+
+def seed(db, menus, dishes_per_menu, catalog_size, seed=0):
+    rng = random.Random(seed)
+    db.dishes.delete_many({})
+    db.menus.delete_many({})
+    now = datetime.now()
+    dish_ids = db.dishes.insert_many([{
+        "name": f"Dish {i}",
+        "price": round(rng.uniform(5, 30), 2),
+        "photo": f"/uploads/dish_{i}.jpg",
+        "ingredients": [f"ingredient {rng.randint(0, 200)}" for _ in range(12)],
+        "description": "x" * 500,
+        "created_at": now,
+        "updated_at": now,
+    } for i in range(catalog_size)]).inserted_ids
+    db.menus.insert_many([{
+        "name": f"Menu {m}",
+        "description": "",
+        "dishes": [str(dish_id) for dish_id in rng.sample(dish_ids, dishes_per_menu)],
+        "created_at": now,
+        "updated_at": now,
+    } for m in range(menus)])
+
+
+def legacy_get_all_menus(db):
+    """The per-menu lookup this benchmark compares against"""
+    menus = list(db.menus.find())
+    for menu in menus:
+        menu["_id"] = str(menu["_id"])
+        if "dishes" in menu:
+            dishes = list(db.dishes.find({"_id": {"$in": [ObjectId(id) for id in menu["dishes"]]}}))
+            menu["dishes"] = [{
+                "_id": str(dish["_id"]),
+                "name": dish["name"],
+                "photo": dish["photo"],
+                "price": dish["price"],
+                "ingredients": dish["ingredients"]
+            } for dish in dishes]
+    return menus
+
+
+def measure(db, func):
+    counting = CountingDatabase(db)
+    start = time.perf_counter()
+    result = func(counting)
+    return time.perf_counter() - start, counting.counts, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GET /menus queries")
+    parser.add_argument("--menus", type=int, default=300)
+    parser.add_argument("--dishes-per-menu", type=int, default=8)
+    parser.add_argument("--catalog-size", type=int, default=1000)
+    parser.add_argument("--mongo-uri", help="Use a real MongoDB instead of mongomock")
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        from pymongo import MongoClient
+        db = MongoClient(args.mongo_uri).kitchenmate_benchmark
+    else:
+        import mongomock
+        db = mongomock.MongoClient().kitchenmate_benchmark
+    seed(db, args.menus, args.dishes_per_menu, args.catalog_size)
+
+    legacy_seconds, legacy_counts, legacy_menus = measure(db, legacy_get_all_menus)
+
+    app = Flask(__name__)
+    with app.app_context():
+        seconds, counts, response = measure(db, get_all_menus)
+    menus = response.get_json()["menus"]
+
+    # Same dishes per menu (the new version keeps menu order)
+    for old, new in zip(legacy_menus, menus):
+        assert sorted(d["_id"] for d in old["dishes"]) == sorted(d["_id"] for d in new["dishes"])
+
+    print(f"Menus: {args.menus}, dishes per menu: {args.dishes_per_menu}, catalog: {args.catalog_size}")
+    print(f"Per-menu lookups: {sum(legacy_counts.values())} queries {legacy_counts}, {legacy_seconds * 1000:.1f} ms")
+    print(f"Batched lookup:   {sum(counts.values())} queries {counts}, {seconds * 1000:.1f} ms")
+
+    if args.mongo_uri:
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,10 @@ GRAPH_FOLDER = os.path.join(STORAGE_DIR, "graph_images")
 # API Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL_NAME = "gemini-2.0-flash"
+# REST endpoint of the Gemini API; point it at scripts/gemini_stub_server.py to work offline
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))  # seconds per call
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))  # calls in flight per process
 
 # Flask Configuration
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
@@ -30,6 +34,13 @@ MAX_CONTENT_LENGTH = 160 * 1024 * 1024  # 16MB
 
 # Database Configuration
 MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "menu_optimization")
+# Connection pool settings, per worker process
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+# Wire compression in order of preference (zstd and snappy need extra packages)
+MONGO_COMPRESSORS = [name.strip() for name in os.getenv("MONGO_COMPRESSORS", "zlib").split(",") if name.strip()]
 
 # High risk ingredients
 HIGH_RISK_INGREDIENTS = {
@@ -56,3 +67,113 @@ OBJECT_DETECTION_MODEL = os.path.join(
 
 SPOILAGE_CLASSIFIER_MODEL = os.path.join(
     MODELS_DIR, "weight", "resnet50_fruit_spoilage.pth")
+
+# Load model weights when the app starts instead of on the first request
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "True").lower() == "true"
+
+# Model reloads may only load weights from here
+MODEL_WEIGHTS_DIR = os.path.join(MODELS_DIR, "weight")
+# Token admin endpoints (model reload) require; when unset those endpoints are disabled
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Maximum number of detected crops classified in one spoilage forward pass
+SPOILAGE_MAX_BATCH_SIZE = int(os.getenv("SPOILAGE_MAX_BATCH_SIZE", "32"))
+
+# Video analysis: sample every Nth frame ("stride") or only on scene changes ("scene")
+VIDEO_SAMPLING_MODE = os.getenv("VIDEO_SAMPLING_MODE", "stride")
+VIDEO_FRAME_STRIDE = int(os.getenv("VIDEO_FRAME_STRIDE", "15"))
+VIDEO_SCENE_THRESHOLD = float(os.getenv("VIDEO_SCENE_THRESHOLD", "12.0"))
+VIDEO_BATCH_SIZE = int(os.getenv("VIDEO_BATCH_SIZE", "8"))
+VIDEO_TRACK_IOU_THRESHOLD = float(os.getenv("VIDEO_TRACK_IOU_THRESHOLD", "0.3"))
+VIDEO_TRACK_MAX_MISSED = int(os.getenv("VIDEO_TRACK_MAX_MISSED", "3"))
+
+# Background jobs: worker threads and extra queued jobs allowed per job type
+JOB_FOLDER = os.path.join(STORAGE_DIR, "jobs")
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))  # seconds
+JOB_PRUNE_INTERVAL = int(os.getenv("JOB_PRUNE_INTERVAL", "300"))  # seconds between sweeps of old jobs
+JOB_LIMITS = {
+    "detect_image": {
+        "max_concurrency": int(os.getenv("DETECT_IMAGE_JOB_CONCURRENCY", "2")),
+        "max_queued": int(os.getenv("DETECT_IMAGE_JOB_QUEUE", "16")),
+    },
+    "detect_video": {
+        "max_concurrency": int(os.getenv("DETECT_VIDEO_JOB_CONCURRENCY", "1")),
+        "max_queued": int(os.getenv("DETECT_VIDEO_JOB_QUEUE", "4")),
+    },
+    "forecast": {
+        "max_concurrency": int(os.getenv("FORECAST_JOB_CONCURRENCY", "1")),
+        "max_queued": int(os.getenv("FORECAST_JOB_QUEUE", "4")),
+    },
+}
+
+# Worker processes used to fit Prophet models in parallel (1 fits in-process)
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", str(os.cpu_count() or 1)))
+
+# On-disk cache of fitted forecasts, keyed by series content and Prophet parameters
+FORECAST_CACHE_ENABLED = os.getenv("FORECAST_CACHE_ENABLED", "True").lower() == "true"
+FORECAST_CACHE_FOLDER = os.path.join(STORAGE_DIR, "forecast_cache")
+FORECAST_CACHE_MAX_BYTES = int(os.getenv("FORECAST_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Per-center forecasting state kept between uploads for incremental mode
+FORECAST_STATE_FOLDER = os.path.join(STORAGE_DIR, "forecast_state")
+
+# Center forecast when an upload does not ask for specific centers
+DEFAULT_CENTER_ID = int(os.getenv("DEFAULT_CENTER_ID", "55"))
+
+# Forecast charts are stored as data and rendered into GRAPH_FOLDER on first request
+CHART_DATA_FOLDER = os.path.join(STORAGE_DIR, "chart_data")
+CHART_CACHE_MAX_FILES = int(os.getenv("CHART_CACHE_MAX_FILES", "200"))
+
+# Cropped renditions of the forecast charts, rebuilt when the chart changes
+GRAPH_CROP_FOLDER = os.path.join(STORAGE_DIR, "graph_images_cropped")
+
+# Cache of generated dishes keyed on the normalized request
+DISH_CACHE_TTL = int(os.getenv("DISH_CACHE_TTL", "3600"))  # seconds
+DISH_CACHE_MAX_ENTRIES = int(os.getenv("DISH_CACHE_MAX_ENTRIES", "256"))
+# Keep cached dishes in SQLite so they survive restarts and are shared by workers
+DISH_CACHE_DB = os.path.join(STORAGE_DIR, "dish_cache.sqlite3") \
+    if os.getenv("DISH_CACHE_PERSIST", "True").lower() == "true" else None
+
+# Page sizes for list endpoints (/dishes, /menus)
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+# Create the MongoDB indexes the API relies on when the app starts
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "True").lower() == "true"
+
+# Bulk dish import: dishes per insert_many call and rows reported per request
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "10000"))
+
+# Production serving (serve.py): uvicorn worker processes and request threads per worker.
+# Every request holds a thread until it finishes, so ASGI_THREADS caps requests in flight per worker
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "2"))
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", "64"))
+
+# Uploads are spooled here while they stream in, then renamed into place
+UPLOAD_SPOOL_FOLDER = os.path.join(STORAGE_DIR, "upload_spool")
+# Largest accepted upload per kind, in bytes; bigger bodies get 413 before they are read
+UPLOAD_SIZE_LIMITS = {
+    "image": int(os.getenv("MAX_IMAGE_UPLOAD_MB", "20")) * 1024 * 1024,
+    "video": int(os.getenv("MAX_VIDEO_UPLOAD_MB", "160")) * 1024 * 1024,
+    "data": int(os.getenv("MAX_DATA_UPLOAD_MB", "50")) * 1024 * 1024,
+}
+
+# Detection results keyed by image content hash and model versions
+DETECTION_CACHE_TTL = int(os.getenv("DETECTION_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+DETECTION_CACHE_MAX_ENTRIES = int(os.getenv("DETECTION_CACHE_MAX_ENTRIES", "2048"))
+DETECTION_CACHE_DB = os.path.join(STORAGE_DIR, "detection_cache.sqlite3") \
+    if os.getenv("DETECTION_CACHE_PERSIST", "True").lower() == "true" else None
+
+# Live frames: skip inference when a camera's frame matches the last analyzed one
+LIVE_FRAME_SIGNATURE_SIZE = int(os.getenv("LIVE_FRAME_SIGNATURE_SIZE", "32"))  # thumbnail side, pixels
+LIVE_FRAME_PIXEL_DELTA = float(os.getenv("LIVE_FRAME_PIXEL_DELTA", "12"))  # gray levels a cell must move
+LIVE_FRAME_CHANGE_FRACTION = float(os.getenv("LIVE_FRAME_CHANGE_FRACTION", "0.01"))  # changed cells allowed
+LIVE_FRAME_MAX_REUSE_SECONDS = float(os.getenv("LIVE_FRAME_MAX_REUSE_SECONDS", "30"))
+LIVE_FRAME_MAX_CAMERAS = int(os.getenv("LIVE_FRAME_MAX_CAMERAS", "256"))
+
+# Live stream over WebSocket (served by asgi.py)
+LIVE_STREAM_PATH = "/ws/live"
+LIVE_STREAM_MAX_FRAME_BYTES = int(os.getenv("LIVE_STREAM_MAX_FRAME_MB", "5")) * 1024 * 1024
+# Minimum seconds between two analyses on one connection; newer frames replace waiting ones
+LIVE_STREAM_MIN_INTERVAL = float(os.getenv("LIVE_STREAM_MIN_INTERVAL", "0.2"))
@@ -1,9 +1,8 @@
 import cv2
 import os
-import tempfile
-from models.FirstModule.object_detection.inference import object_detection
-from models.FirstModule.spoilage_classifier.inference import SpoilageClassifier
-from config.constant import OBJECT_DETECTION_MODEL, SPOILAGE_CLASSIFIER_MODEL
+import numpy as np
+from models.FirstModule.object_detection.inference import detect_objects
+from models.model_registry import model_registry
 
 
 # OBJECT_DETECTION_MODEL = 'server/models/FirstModule/object_detection/FridgeVision_Dataset_detection_n_2.pt'
@@ -26,91 +25,114 @@ def analyze_ingredients(image_path):
         print(f"Image not found: {image_path}")
         raise None
 
-    # Initialize the spoilage classifier
-    classifier = SpoilageClassifier(SPOILAGE_CLASSIFIER_MODEL)
-    if not classifier:
-        print("Error loading spoilage classifier model")
-        return None
-
     # Load image for visualization
     image = cv2.imread(image_path)
     if image is None:
         print(f"Error loading image: {image_path}")
         raise None
 
+    return analyze_frame(image)
+
+
+def analyze_encoded(data):
+    """
+    Analyze an encoded image (JPEG/PNG bytes) without writing it to disk
+
+    Args:
+        data: Encoded image bytes
+
+    Returns:
+        Dict containing detection results and ingredient statistics
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode frame")
+
+    return analyze_frame(image)
+
+
+def analyze_frame(image):
+    """
+    Detect ingredients in a decoded BGR image and classify their freshness
+
+    Args:
+        image: BGR image as a NumPy array (as returned by cv2)
+
+    Returns:
+        Dict containing detection results and ingredient statistics
+    """
+
+    # Get the warm spoilage classifier from the registry
+    classifier = model_registry.get("spoilage_classifier")
+    if not classifier:
+        print("Error loading spoilage classifier model")
+        return None
+
     # Detect objects
-    results = object_detection(image_path)
+    results = detect_objects(image)
+
+    # Collect every detection and its crop straight from the frame
+    detections = []
+    for result in results:
+        detections.extend(parse_detections(result))
+
+    spoilage_results = classify_crops(
+        classifier, [crop_box(image, bbox) for _, _, bbox in detections])
 
     # Process results
     detected_objects = []
-    summary = {}  # To keep track of counts by class and health status
     annotated_image = image.copy()
 
-    for result in results:
-        for box in result.boxes:
-            # Get bounding box coordinates
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
-            label = result.names[cls]
-
-            # Crop the detected object
-            cropped_obj = image[y1:y2, x1:x2]
-
-            # Use tempfile to save the cropped image temporarily
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_crop_path = temp_file.name
-                cv2.imwrite(temp_crop_path, cropped_obj)
-
-            # Classify the spoilage status
-            try:
-                spoilage_result = classifier.predict(temp_crop_path)
-                spoilage_class = spoilage_result['class']
-                spoilage_conf = spoilage_result['confidence']
-            except Exception as e:
-                spoilage_class = "Unknown"
-                spoilage_conf = 0
-                print(f"Error classifying object: {e}")
-            finally:
-                # Remove temporary file
-                if os.path.exists(temp_crop_path):
-                    os.remove(temp_crop_path)
-
-            # Map specific spoilage class to generic category
-            generic_status = "Unknown"
-            if spoilage_class.startswith("Fresh"):
-                generic_status = "Fresh"
-            elif spoilage_class.startswith("Rotten"):
-                generic_status = "Spoiled"
-
-            # Create the object details
-            obj_details = {
-                "ingredient": label,
-                "detection_confidence": conf,
-                "health_status": spoilage_class,
-                "health_confidence": spoilage_conf,
-                "bounding_box": (x1, y1, x2, y2)
-            }
-            detected_objects.append(obj_details)
-
-            # Update the summary counts
-            if label not in summary:
-                summary[label] = {"Fresh": 0, "Spoiled": 0, "Unknown": 0}
-
-            summary[label][generic_status] += 1
-
-            # Annotate the image
-            color = (0, 255, 0) if generic_status == "Fresh" else (0, 0, 255)
-            cv2.rectangle(annotated_image, (x1, y1), (x2, y2), color, 2)
-            cv2.putText(annotated_image, f"{label}: {spoilage_class}", (x1, y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+    for (label, conf, (x1, y1, x2, y2)), spoilage_result in zip(detections, spoilage_results):
+        spoilage_class = spoilage_result['class']
+        spoilage_conf = spoilage_result['confidence']
+
+        # Map specific spoilage class to generic category
+        generic_status = generic_health_status(spoilage_class)
+
+        # Create the object details
+        obj_details = {
+            "ingredient": label,
+            "detection_confidence": conf,
+            "health_status": spoilage_class,
+            "health_confidence": spoilage_conf,
+            "bounding_box": (x1, y1, x2, y2)
+        }
+        detected_objects.append(obj_details)
+
+        # Annotate the image
+        color = (0, 255, 0) if generic_status == "Fresh" else (0, 0, 255)
+        cv2.rectangle(annotated_image, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(annotated_image, f"{label}: {spoilage_class}", (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    # Return the analysis results
+    return summarize_detections(detected_objects)
+
+
+def summarize_detections(detected_objects):
+    """
+    Build the analysis result from a list of detected objects
+
+    Args:
+        detected_objects: Dicts with at least "ingredient" and "health_status"
+
+    Returns:
+        Dict containing the objects, per-ingredient counts and totals
+    """
+    summary = {}  # To keep track of counts by class and health status
+    for obj in detected_objects:
+        label = obj["ingredient"]
+        if label not in summary:
+            summary[label] = {"Fresh": 0, "Spoiled": 0, "Unknown": 0}
+
+        summary[label][generic_health_status(obj["health_status"])] += 1
 
     # Calculate totals
     total_items = len(detected_objects)
     total_fresh = sum(s["Fresh"] for s in summary.values())
     total_spoiled = sum(s["Spoiled"] for s in summary.values())
 
-    # Return the analysis results
     return {
         "detected_objects": detected_objects,
         "summary": summary,
@@ -121,6 +143,67 @@ def analyze_ingredients(image_path):
     }
 
 
+def parse_detections(result):
+    """Turn one YOLO result into (label, confidence, bounding_box) tuples"""
+    detections = []
+    for box in result.boxes:
+        # Get bounding box coordinates
+        x1, y1, x2, y2 = map(int, box.xyxy[0])
+        conf = float(box.conf[0])
+        cls = int(box.cls[0])
+        label = result.names[cls]
+        detections.append((label, conf, (x1, y1, x2, y2)))
+    return detections
+
+
+def crop_box(image, bbox):
+    """Slice a bounding box out of the frame, clipped to the image bounds"""
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = bbox
+    x1, x2 = max(0, x1), min(width, x2)
+    y1, y2 = max(0, y1), min(height, y2)
+    return image[y1:y2, x1:x2]
+
+
+def classify_crops(classifier, crops):
+    """
+    Classify the spoilage status of every crop in batched forward passes.
+    If a batch fails, its crops are retried one at a time so a single bad
+    crop does not cost the others. Empty or failing crops come back as "Unknown".
+    """
+    unknown = {'class': "Unknown", 'confidence': 0}
+    spoilage_results = [unknown] * len(crops)
+
+    valid = [i for i, crop in enumerate(crops) if crop.size > 0]
+    if not valid:
+        return spoilage_results
+
+    try:
+        predictions = classifier.predict_batch([crops[i] for i in valid])
+        for i, prediction in zip(valid, predictions):
+            spoilage_results[i] = prediction
+        return spoilage_results
+    except Exception as e:
+        print(f"Error classifying objects in a batch, retrying one at a time: {e}")
+
+    for i in valid:
+        try:
+            spoilage_results[i] = classifier.predict_batch([crops[i]], max_batch_size=1)[0]
+        except Exception as e:
+            print(f"Error classifying object: {e}")
+
+    return spoilage_results
+
+
+def generic_health_status(spoilage_class):
+    """Map a specific spoilage class to Fresh, Spoiled or Unknown"""
+    if spoilage_class.startswith("Fresh"):
+        return "Fresh"
+    elif spoilage_class.startswith("Rotten"):
+        return "Spoiled"
+    return "Unknown"
+
+
 # Example usage
 if __name__ == "__main__":
     image_path = "server/models/FirstModule/images/1.jpg"
@@ -1,7 +1,6 @@
-from ultralytics import YOLO
 import cv2
 import os
-from config.constant import OBJECT_DETECTION_MODEL
+from models.model_registry import model_registry
 
 
 def object_detection(image_path):
@@ -12,10 +11,17 @@ def object_detection(image_path):
 
     image = cv2.imread(image_path)
 
-    model = YOLO(OBJECT_DETECTION_MODEL)
+    return detect_objects(image)
 
-    # Run inference
-    results = model(image)
+
+def detect_objects(image):
+    """Run the object detector on an already decoded BGR image"""
+    # Reuse the warm model held by the registry
+    model = model_registry.get("object_detection")
+
+    # Run inference; the YOLO predictor keeps per-call state, so serialize it
+    with model_registry.inference_lock("object_detection"):
+        results = model(image)
 
     return results
 
@@ -39,6 +45,19 @@ def object_detection(image_path):
     # return image
 
 
+def detect_objects_batch(frames):
+    """Run the object detector on a list of BGR frames in one forward pass"""
+    if not frames:
+        return []
+
+    model = model_registry.get("object_detection")
+
+    with model_registry.inference_lock("object_detection"):
+        results = model(list(frames), verbose=False)
+
+    return results
+
+
 # Example usage
 if __name__ == "__main__":
     image_path = "server/models/FirstModule/object_detection/images/1.jpg"
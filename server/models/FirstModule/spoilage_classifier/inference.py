@@ -7,11 +7,11 @@ import argparse
 from torchvision import models
 import cv2
 import numpy as np
-from config.constant import SPOILAGE_CLASSIFIER_MODEL
+from config.constant import SPOILAGE_CLASSIFIER_MODEL, SPOILAGE_MAX_BATCH_SIZE
 
 
 class SpoilageClassifier:
-    def __init__(self, model_path=SPOILAGE_CLASSIFIER_MODEL, device=None):
+    def __init__(self, model_path=SPOILAGE_CLASSIFIER_MODEL, device=None, max_batch_size=SPOILAGE_MAX_BATCH_SIZE):
         if device is None:
             self.device = torch.device(
                 "cuda" if torch.cuda.is_available() else "cpu")
@@ -20,6 +20,9 @@ class SpoilageClassifier:
 
         print(f"Using device: {self.device}")
 
+        # Largest number of crops sent through the model in one forward pass
+        self.max_batch_size = max_batch_size
+
         # Load model
         self.model = self.load_model(model_path=model_path)
         self.model.eval()
@@ -77,25 +80,62 @@ class SpoilageClassifier:
         image = Image.open(image_path).convert('RGB')
         return self.transform(image).unsqueeze(0).to(self.device)
 
+    def preprocess_crops(self, crops):
+        """Preprocess BGR crops (NumPy arrays from cv2) into one batch tensor"""
+        tensors = [
+            self.transform(Image.fromarray(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)))
+            for crop in crops
+        ]
+        return torch.stack(tensors).to(self.device)
+
+    def format_prediction(self, probs):
+        """Build the prediction dict from one row of class probabilities"""
+        class_idx = int(torch.argmax(probs).item())
+        probs = probs.tolist()
+
+        return {
+            'class': self.classes[class_idx],
+            'confidence': probs[class_idx] * 100,
+            'probabilities': {
+                self.classes[i]: probs[i] * 100 for i in range(len(self.classes))
+            }
+        }
+
     def predict(self, image_path):
         """Run inference on an image"""
         input_tensor = self.preprocess_image(image_path)
 
         with torch.no_grad():
             outputs = self.model(input_tensor)
-            _, predicted = torch.max(outputs, 1)
             probs = torch.nn.functional.softmax(outputs, dim=1)
 
-        class_idx = predicted.item()
-        confidence = probs[0][class_idx].item()
+        return self.format_prediction(probs[0].cpu())
 
-        return {
-            'class': self.classes[class_idx],
-            'confidence': confidence * 100,
-            'probabilities': {
-                self.classes[i]: probs[0][i].item() * 100 for i in range(len(self.classes))
-            }
-        }
+    def predict_batch(self, crops, max_batch_size=None):
+        """
+        Run inference on in-memory crops, batching them into as few forward
+        passes as ``max_batch_size`` allows.
+
+        Args:
+            crops: List of BGR images as NumPy arrays (e.g. slices of a cv2 frame)
+            max_batch_size: Override for the classifier's configured batch size
+
+        Returns:
+            List of prediction dicts in the same order as ``crops``
+        """
+        max_batch_size = max_batch_size or self.max_batch_size
+        results = []
+
+        for start in range(0, len(crops), max_batch_size):
+            batch = self.preprocess_crops(crops[start:start + max_batch_size])
+
+            with torch.no_grad():
+                outputs = self.model(batch)
+                probs = torch.nn.functional.softmax(outputs, dim=1).cpu()
+
+            results.extend(self.format_prediction(row) for row in probs)
+
+        return results
 
     def visualize_prediction(self, image_path, save_path=None):
         """Visualize the prediction on the image"""
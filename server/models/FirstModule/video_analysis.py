@@ -0,0 +1,219 @@
+import cv2
+import numpy as np
+from models.FirstModule.object_detection.inference import detect_objects_batch
+from models.FirstModule.detect import parse_detections, crop_box, classify_crops, summarize_detections
+from models.model_registry import model_registry
+from config.constant import (
+    VIDEO_SAMPLING_MODE, VIDEO_FRAME_STRIDE, VIDEO_SCENE_THRESHOLD, VIDEO_BATCH_SIZE,
+    VIDEO_TRACK_IOU_THRESHOLD, VIDEO_TRACK_MAX_MISSED
+)
+
+# Size of the grayscale thumbnail used to detect scene changes
+SCENE_SIGNATURE_SIZE = (64, 36)
+
+
+def frame_signature(frame):
+    """Small grayscale thumbnail used to compare frames cheaply"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, SCENE_SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def sample_frames(video_path, mode=VIDEO_SAMPLING_MODE, stride=VIDEO_FRAME_STRIDE,
+                  scene_threshold=VIDEO_SCENE_THRESHOLD):
+    """
+    Stream sampled frames out of a video without loading it into memory
+
+    Args:
+        video_path: Path to the video file
+        mode: "stride" yields every ``stride``-th frame; "scene" checks every
+            ``stride``-th frame and yields it only if it differs from the last
+            yielded frame by more than ``scene_threshold`` (mean absolute
+            difference of grayscale thumbnails, 0-255)
+        stride: Number of frames between candidates
+        scene_threshold: Minimum change for a frame to count as a new scene
+
+    Yields:
+        Tuples of (frame_index, frame)
+    """
+    if mode not in ("stride", "scene"):
+        raise ValueError(f"Invalid sampling mode: {mode}")
+    stride = max(1, int(stride))
+
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+
+    last_signature = None
+    frame_index = -1
+    try:
+        while True:
+            # grab() only demuxes; frames we skip are never fully decoded
+            if not capture.grab():
+                break
+            frame_index += 1
+            if frame_index % stride:
+                continue
+
+            ok, frame = capture.retrieve()
+            if not ok:
+                continue
+
+            if mode == "scene":
+                signature = frame_signature(frame)
+                if last_signature is not None and \
+                        np.abs(signature - last_signature).mean() < scene_threshold:
+                    continue
+                last_signature = signature
+
+            yield frame_index, frame
+    finally:
+        capture.release()
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x1, y1, x2, y2) boxes"""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if intersection == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return intersection / float(area_a + area_b - intersection)
+
+
+class _Track:
+    def __init__(self, track_id, label, conf, bbox, crop, frame_index):
+        self.track_id = track_id
+        self.label = label
+        self.bbox = bbox
+        self.best_conf = conf
+        self.best_bbox = bbox
+        self.best_crop = crop
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.hits = 1
+        self.missed = 0
+
+
+class IoUTracker:
+    """
+    Greedy IoU tracker that links detections of the same ingredient across
+    sampled frames, so every physical item is counted once. Each track keeps
+    only its most confident crop for spoilage classification.
+    """
+
+    def __init__(self, iou_threshold=VIDEO_TRACK_IOU_THRESHOLD, max_missed=VIDEO_TRACK_MAX_MISSED):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.active = []
+        self.finished = []
+        self._next_id = 1
+
+    def update(self, frame, frame_index, detections):
+        """Match this frame's (label, conf, bbox) detections to existing tracks"""
+        candidates = []
+        for t, track in enumerate(self.active):
+            for d, (label, _, bbox) in enumerate(detections):
+                if label != track.label:
+                    continue
+                iou = box_iou(track.bbox, bbox)
+                if iou >= self.iou_threshold:
+                    candidates.append((iou, t, d))
+
+        matched_tracks, matched_detections = set(), set()
+        for _, t, d in sorted(candidates, reverse=True):
+            if t in matched_tracks or d in matched_detections:
+                continue
+            matched_tracks.add(t)
+            matched_detections.add(d)
+
+            track = self.active[t]
+            _, conf, bbox = detections[d]
+            track.bbox = bbox
+            track.hits += 1
+            track.missed = 0
+            track.last_frame = frame_index
+            if conf > track.best_conf:
+                track.best_conf = conf
+                track.best_bbox = bbox
+                track.best_crop = crop_box(frame, bbox).copy()
+
+        still_active = []
+        for t, track in enumerate(self.active):
+            if t not in matched_tracks:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    self.finished.append(track)
+                    continue
+            still_active.append(track)
+
+        for d, (label, conf, bbox) in enumerate(detections):
+            if d in matched_detections:
+                continue
+            still_active.append(_Track(self._next_id, label, conf, bbox,
+                                       crop_box(frame, bbox).copy(), frame_index))
+            self._next_id += 1
+
+        self.active = still_active
+
+    def tracks(self):
+        return sorted(self.finished + self.active, key=lambda track: track.track_id)
+
+
+def analyze_video(video_path, mode=VIDEO_SAMPLING_MODE, stride=VIDEO_FRAME_STRIDE,
+                  scene_threshold=VIDEO_SCENE_THRESHOLD, batch_size=VIDEO_BATCH_SIZE):
+    """
+    Analyze a video by sampling frames, detecting ingredients in batches and
+    tracking them across frames so each item is counted once
+
+    Args:
+        video_path: Path to the video to analyze
+        mode: Frame sampling mode, "stride" or "scene"
+        stride: Number of frames between sampled (or checked) frames
+        scene_threshold: Minimum change for a new scene in "scene" mode
+        batch_size: Number of sampled frames sent to the detector at once
+
+    Returns:
+        Dict with the same shape as ``analyze_ingredients`` plus video stats
+    """
+    tracker = IoUTracker()
+    frames_sampled = 0
+    batch = []
+
+    def flush(batch):
+        results = detect_objects_batch([frame for _, frame in batch])
+        for (frame_index, frame), result in zip(batch, results):
+            tracker.update(frame, frame_index, parse_detections(result))
+
+    for frame_index, frame in sample_frames(video_path, mode, stride, scene_threshold):
+        frames_sampled += 1
+        batch.append((frame_index, frame))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    tracks = tracker.tracks()
+    classifier = model_registry.get("spoilage_classifier")
+    spoilage_results = classify_crops(classifier, [track.best_crop for track in tracks])
+
+    detected_objects = []
+    for track, spoilage_result in zip(tracks, spoilage_results):
+        detected_objects.append({
+            "ingredient": track.label,
+            "detection_confidence": track.best_conf,
+            "health_status": spoilage_result['class'],
+            "health_confidence": spoilage_result['confidence'],
+            "bounding_box": track.best_bbox,
+            "track_id": track.track_id,
+            "first_frame": track.first_frame,
+            "last_frame": track.last_frame,
+            "frames_seen": track.hits,
+        })
+
+    analysis = summarize_detections(detected_objects)
+    analysis["frames_sampled"] = frames_sampled
+    analysis["sampling_mode"] = mode
+    return analysis
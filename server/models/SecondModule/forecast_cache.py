@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import pandas as pd
+from config.constant import logger, FORECAST_CACHE_FOLDER, FORECAST_CACHE_MAX_BYTES
+
+
+class ForecastCache:
+    """
+    Disk cache of fitted Prophet results keyed by a hash of the series
+    values and the fit parameters, with least-recently-used eviction once
+    the folder grows past ``max_bytes``. File mtimes record last use.
+    """
+
+    def __init__(self, folder=FORECAST_CACHE_FOLDER, max_bytes=FORECAST_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, data, future_periods, params):
+        """Content hash of a (ds, y) series and everything that affects its fit"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps({"params": params, "periods": future_periods},
+                                 sort_keys=True, default=str).encode())
+        digest.update(pd.to_datetime(data['ds']).to_numpy(dtype='datetime64[ns]').tobytes())
+        digest.update(data['y'].to_numpy(dtype='float64').tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.folder, f"{key}.pkl")
+
+    def get(self, key):
+        """Return the cached result for ``key``, or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key, result):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size cap"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.folder):
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(self.folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            entries.sort()
+            removed = 0
+            while total > self.max_bytes and entries:
+                _, size, path = entries.pop(0)
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+
+            if removed:
+                logger.info(f"Evicted {removed} forecast cache entries")
+
+
+forecast_cache = ForecastCache()
@@ -0,0 +1,215 @@
+import os
+import pickle
+import re
+import threading
+import time
+from matplotlib.dates import AutoDateLocator, AutoDateFormatter
+from matplotlib.figure import Figure
+from config.constant import GRAPH_FOLDER, CHART_DATA_FOLDER, CHART_CACHE_MAX_FILES
+
+# center_55_category_forecast_Pizza.png, center_55_ingredient_requirements.png
+CHART_FILENAME_PATTERN = re.compile(
+    r'^center_(?P<center_id>\d+)_(?:(?P<kind>category|ingredient)_forecast_(?P<name>.+)'
+    r'|(?P<requirements>ingredient_requirements))\.png$')
+
+
+def chart_filename(center_id, kind, name=None):
+    """
+    File name of a forecast chart, e.g. center_55_category_forecast_Pizza.png
+    """
+    if name is None:
+        return f'center_{center_id}_{kind}.png'
+    return f'center_{center_id}_{kind}_forecast_{name}.png'
+
+
+def series_chart_data(history, forecast):
+    """
+    The columns of a fitted series a forecast chart needs: the observed
+    points and the forecast with its uncertainty interval.
+    """
+    return {
+        'history': history[['ds', 'y']].reset_index(drop=True),
+        'forecast': forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].reset_index(drop=True),
+    }
+
+
+def render_forecast(data, title):
+    """
+    Draw a forecast chart in the same layout as Prophet's ``model.plot``.
+    """
+    # A bare Figure is not tracked by pyplot, so nothing is left open
+    # after the chart is saved and concurrent renders do not share state
+    fig = Figure(facecolor='w', figsize=(10, 6))
+    ax = fig.add_subplot(111)
+
+    history, forecast = data['history'], data['forecast']
+    ax.plot(history['ds'], history['y'], 'k.')
+    ax.plot(forecast['ds'], forecast['yhat'], ls='-', c='#0072B2')
+    ax.fill_between(forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'],
+                    color='#0072B2', alpha=0.2)
+
+    locator = AutoDateLocator(interval_multiples=False)
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(AutoDateFormatter(locator))
+    ax.grid(True, which='major', c='gray', ls='-', lw=1, alpha=0.2)
+    ax.set_xlabel('ds')
+    ax.set_ylabel('y')
+    fig.tight_layout()
+    ax.set_title(title)
+    return fig
+
+
+def render_requirements(requirements):
+    """
+    Bar chart of the forecasted ingredient requirements for next week.
+    """
+    # Filter non-zero requirements and sort for better visualization
+    sorted_requirements = requirements[requirements > 0].sort_values(ascending=False)
+
+    fig = Figure(figsize=(12, 8))
+    ax = fig.add_subplot(111)
+    bars = ax.bar(sorted_requirements.index, sorted_requirements.values)
+
+    # Add values on top of bars
+    for bar in bars:
+        yval = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, yval + 0.05, round(yval, 1),
+                ha='center', va='bottom', rotation=0)
+
+    ax.set_title('Forecasted Ingredient Requirements for Next Week')
+    ax.set_xlabel('Ingredient')
+    ax.set_ylabel('Quantity Required')
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+    return fig
+
+
+def touch(path):
+    """
+    Mark ``path`` as recently used by bumping its access time only; the
+    modification time keeps identifying the rendered content.
+    """
+    try:
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+    except OSError:
+        pass
+
+
+class ForecastChartStore:
+    """
+    Keeps the data behind every forecast chart instead of the charts
+    themselves. A chart is only drawn the first time its image is requested;
+    the rendered PNG is then kept in GRAPH_FOLDER, which holds at most
+    ``max_files`` charts (least recently served are removed first).
+    """
+
+    def __init__(self, folder=CHART_DATA_FOLDER, graph_folder=GRAPH_FOLDER,
+                 max_files=CHART_CACHE_MAX_FILES):
+        self.folder = folder
+        self.graph_folder = graph_folder
+        self.max_files = max_files
+        self._render_lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        os.makedirs(graph_folder, exist_ok=True)
+
+    def _path(self, center_id):
+        return os.path.join(self.folder, f"center_{center_id}.pkl")
+
+    def load(self, center_id):
+        """Return the saved chart data of ``center_id``, or None"""
+        try:
+            with open(self._path(center_id), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, center_id, charts):
+        """
+        Store a center's chart data and drop the charts rendered from the
+        previous data.
+
+        Args:
+            center_id: Center the charts belong to
+            charts: Dict with 'category' and 'ingredient' (name -> ``series_chart_data``)
+                and 'requirements' (Series of quantity per ingredient)
+        """
+        path = self._path(center_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(charts, f)
+        os.replace(tmp_path, path)
+
+        prefix = f"center_{center_id}_"
+        for name in os.listdir(self.graph_folder):
+            if name.startswith(prefix) and name.endswith(".png"):
+                try:
+                    os.remove(os.path.join(self.graph_folder, name))
+                except OSError:
+                    pass
+
+    def chart_names(self, center_id, kind):
+        """Sorted series names that have a ``kind`` chart for ``center_id``"""
+        charts = self.load(center_id)
+        if charts is None:
+            return []
+        return sorted(charts.get(kind, {}), key=str)
+
+    def render(self, filename):
+        """
+        Path of the rendered chart ``filename``, drawing it first if needed.
+        Returns None when no stored forecast matches the name.
+        """
+        path = os.path.join(self.graph_folder, filename)
+        if os.path.exists(path):
+            touch(path)
+            return path
+
+        match = CHART_FILENAME_PATTERN.match(filename)
+        if not match:
+            return None
+        charts = self.load(int(match.group('center_id')))
+        if charts is None:
+            return None
+
+        if match.group('requirements'):
+            fig = render_requirements(charts['requirements'])
+        else:
+            kind, name = match.group('kind'), match.group('name')
+            data = charts.get(kind, {}).get(name)
+            if data is None:
+                return None
+            if kind == 'category':
+                fig = render_forecast(data, f'Order Forecast for {name}')
+            else:
+                fig = render_forecast(data, f'{name.capitalize()} Consumption Forecast')
+
+        with self._render_lock:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fig.savefig(tmp_path, format='png')
+            os.replace(tmp_path, path)
+            self.evict()
+        return path
+
+    def evict(self):
+        """Remove the least recently served charts beyond ``max_files``"""
+        charts = []
+        for name in os.listdir(self.graph_folder):
+            if not name.endswith(".png"):
+                continue
+            path = os.path.join(self.graph_folder, name)
+            try:
+                charts.append((os.path.getatime(path), path))
+            except OSError:
+                continue
+
+        charts.sort()
+        for _, path in charts[:max(0, len(charts) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+forecast_charts = ForecastChartStore()
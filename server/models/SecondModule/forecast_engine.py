@@ -0,0 +1,202 @@
+import multiprocessing
+import threading
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from config.constant import logger, FORECAST_WORKERS, FORECAST_CACHE_ENABLED
+from models.SecondModule.forecast_cache import forecast_cache
+
+# Prophet settings shared by every series we forecast
+PROPHET_PARAMS = {
+    "interval_width": 0.95,
+    "daily_seasonality": False,
+    "weekly_seasonality": True,
+}
+
+
+def warm_start_params(model):
+    """
+    Fitted parameters of a MAP-fitted Prophet model in the form accepted by
+    ``Prophet.fit(init=...)``, so a later fit can start from them.
+    """
+    return {
+        'k': float(model.params['k'][0][0]),
+        'm': float(model.params['m'][0][0]),
+        'sigma_obs': float(model.params['sigma_obs'][0][0]),
+        'delta': np.array(model.params['delta'][0]),
+        'beta': np.array(model.params['beta'][0]),
+    }
+
+
+def _fit(params, data, init=None):
+    from prophet import Prophet
+
+    model = Prophet(**params)
+    if init:
+        model.fit(data, init=init)
+    else:
+        model.fit(data)
+    return model
+
+
+def fit_series(key, data, future_periods=1, params=None, init=None):
+    """
+    Fit one Prophet model and forecast ``future_periods`` weeks ahead.
+    Lives at module level so worker processes can unpickle it.
+
+    Args:
+        key: Identifier of the series, returned unchanged
+        data: DataFrame with 'ds' and 'y' columns
+        future_periods: Number of weeks to forecast
+        params: Prophet constructor arguments (defaults to PROPHET_PARAMS)
+        init: Parameters of a previous fit (see ``warm_start_params``) to
+            start the optimizer from
+
+    Returns:
+        Dict with the key, forecast frame, serialized model, warm-start
+        parameters and fit time
+    """
+    from prophet.serialize import model_to_json
+
+    params = params or PROPHET_PARAMS
+    start = time.perf_counter()
+
+    try:
+        model = _fit(params, data, init)
+    except Exception:
+        # The previous fit no longer matches this series (e.g. a different
+        # number of changepoints), so start from scratch
+        if not init:
+            raise
+        model = _fit(params, data)
+
+    future = model.make_future_dataframe(periods=future_periods, freq='W')
+    forecast = model.predict(future)
+
+    return {
+        "key": key,
+        "forecast": forecast,
+        "model": model_to_json(model),
+        "init": warm_start_params(model),
+        "fit_seconds": time.perf_counter() - start,
+    }
+
+
+def _fit_series_task(task):
+    return fit_series(*task)
+
+
+class ForecastEngine:
+    """
+    Fits many Prophet series across a pool of worker processes.
+
+    Results always come back in the order the series were given, and each
+    fit is independent of the others, so the output does not depend on the
+    number of workers or on which worker ran which series. Series whose
+    values and parameters match a cached fit are not refitted at all.
+    """
+
+    def __init__(self, max_workers=FORECAST_WORKERS, cache=None):
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        # Spawned (not forked) workers: the web process holds threads and
+        # torch state that must not be copied into a child mid-flight
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def forecast_many(self, series, future_periods=1, params=None, warm_start=None):
+        """
+        Fit and forecast every series
+
+        Args:
+            series: Dict mapping a key to a DataFrame with 'ds' and 'y' columns
+            future_periods: Number of weeks to forecast
+            params: Prophet constructor arguments (defaults to PROPHET_PARAMS)
+            warm_start: Optional dict mapping a key to the ``init`` of a
+                previous fit of that series
+
+        Returns:
+            Dict mapping each key to its ``fit_series`` result, in input order
+        """
+        params = params or PROPHET_PARAMS
+        start = time.perf_counter()
+
+        # Reuse cached fits for series that have not changed
+        fitted = {}
+        cache_keys = {}
+        tasks = []
+        for key, data in series.items():
+            if self.cache is not None:
+                cache_keys[key] = self.cache.key(data, future_periods, params)
+                cached = self.cache.get(cache_keys[key])
+                if cached is not None:
+                    fitted[key] = {**cached, "key": key, "fit_seconds": 0.0, "cached": True}
+                    continue
+            init = (warm_start or {}).get(key)
+            tasks.append((key, data, future_periods, params, init))
+
+        if self.max_workers == 1 or len(tasks) <= 1:
+            results = [_fit_series_task(task) for task in tasks]
+        else:
+            results = list(self._get_pool().map(_fit_series_task, tasks))
+
+        for result in results:
+            result["cached"] = False
+            fitted[result["key"]] = result
+            if self.cache is not None:
+                self.cache.put(cache_keys[result["key"]], result)
+        if self.cache is not None and results:
+            self.cache.evict()
+
+        log_timings(results, time.perf_counter() - start, self.max_workers, len(fitted) - len(results))
+
+        # Keep the caller's order regardless of which series were cached
+        return {key: fitted[key] for key in series}
+
+
+def series_name(key):
+    """Readable name for a series key such as ('category', 'Beverages')"""
+    if isinstance(key, tuple):
+        return "/".join(str(part) for part in key)
+    return str(key)
+
+
+def log_timings(results, wall_seconds, workers, cache_hits=0):
+    """Log the overall fit time and the slowest series"""
+    if cache_hits:
+        logger.info(f"Reused {cache_hits} cached forecasts")
+    if not results:
+        return
+    total = sum(result["fit_seconds"] for result in results)
+    logger.info(f"Fitted {len(results)} series in {wall_seconds:.2f}s wall clock "
+                f"({total:.2f}s of fitting across {workers} workers)")
+    for result in sorted(results, key=lambda r: r["fit_seconds"], reverse=True)[:5]:
+        logger.info(f"  {series_name(result['key'])}: {result['fit_seconds']:.2f}s")
+
+
+def timing_report(fitted):
+    """
+    Per-series fit times, slowest first
+
+    Args:
+        fitted: Dict returned by ``ForecastEngine.forecast_many``
+
+    Returns:
+        List of {"series": name, "seconds": fit time, "cached": reused from cache}
+    """
+    return [
+        {"series": series_name(key), "seconds": round(result["fit_seconds"], 3),
+         "cached": result.get("cached", False)}
+        for key, result in sorted(fitted.items(), key=lambda item: item[1]["fit_seconds"], reverse=True)
+    ]
+
+
+forecast_engine = ForecastEngine(cache=forecast_cache if FORECAST_CACHE_ENABLED else None)
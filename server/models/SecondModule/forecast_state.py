@@ -0,0 +1,41 @@
+import os
+import pickle
+import threading
+from config.constant import FORECAST_STATE_FOLDER
+
+
+class ForecastStateStore:
+    """
+    Persists what incremental forecasting needs between uploads, per center:
+    the rows seen so far, the last week they cover and the fitted parameters
+    of every series (used to warm-start the next fit).
+    """
+
+    def __init__(self, folder=FORECAST_STATE_FOLDER):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, center_id):
+        return os.path.join(self.folder, f"center_{center_id}.pkl")
+
+    def load(self, center_id):
+        """Return the saved state for ``center_id``, or None"""
+        try:
+            with open(self._path(center_id), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, center_id, rows, warm_start):
+        path = self._path(center_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "rows": rows,
+                "last_week": int(rows['week'].max()),
+                "warm_start": warm_start,
+            }, f)
+        os.replace(tmp_path, path)
+
+
+forecast_state = ForecastStateStore()
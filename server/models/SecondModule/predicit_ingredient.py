@@ -1,255 +1,315 @@
-import matplotlib
-matplotlib.use('Agg')  # Use a non-interactive backend for matplotlib
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-from config.constant import GRAPH_FOLDER
-import os
+from config.constant import logger, DEFAULT_CENTER_ID
+from models.SecondModule.forecast_engine import forecast_engine, timing_report
+from models.SecondModule.forecast_state import forecast_state
+from models.SecondModule.forecast_charts import forecast_charts, series_chart_data
 
+# List of all ingredients tracked in the demand data
+INGREDIENTS = ['garlic', 'spices', 'herbs', 'onion', 'ginger', 'cilantro',
+               'basil', 'vegetables', 'oil', 'water', 'chili', 'protein',
+               'pepper', 'sauce', 'acid', 'cardamom', 'salt', 'starch',
+               'seasoning', 'garnish', 'cinnamon', 'vegetable', 'bean sprouts',
+               'olive oil', 'coconut milk', 'cream', 'lemongrass', 'sugar',
+               'lime juice', 'cloves']
 
-# 1. Forecast orders by meal category
-def forecast_orders_by_category(df, future_periods=1):
+
+# Prophet fitting helpers
+
+
+def chart_data(fitted):
     """
-    Forecast the number of orders for each category using Prophet.
+    Data needed to draw the chart of a series fitted by ``fit_groups``.
+    """
+    return series_chart_data(fitted['history'], fitted['forecast'])
+
+
+def category_series(df):
+    """
+    Build one Prophet series (ds, y) of total orders per category.
     """
     # Aggregate orders by category and date
     category_orders = df.groupby(['date', 'category'])[
         'num_orders'].sum().reset_index()
 
-    forecasts = {}
-    figures = {}
-
-    for category in category_orders['category'].unique():
-        # Filter data for the current category
-        category_data = category_orders[category_orders['category'] == category]
-
-        # Prepare data for Prophet
-        prophet_data = pd.DataFrame({
+    series = {}
+    for category, category_data in category_orders.groupby('category', sort=False):
+        series[category] = pd.DataFrame({
             'ds': category_data['date'],
             'y': category_data['num_orders']
         })
+    return series
+
+
+def ingredient_series(df, ingredients):
+    """
+    Build one Prophet series (ds, y) of usage per ingredient, skipping
+    ingredients that are never used.
+    """
+    # Aggregate ingredient usage by date
+    ingredient_usage = df.groupby('date')[ingredients].sum().reset_index()
+
+    series = {}
+    for ingredient in ingredients:
+        # Skip ingredients with no usage
+        if ingredient_usage[ingredient].sum() == 0:
+            continue
+
+        series[ingredient] = pd.DataFrame({
+            'ds': ingredient_usage['date'],
+            'y': ingredient_usage[ingredient]
+        })
+    return series
+
+
+def meal_series(df):
+    """
+    Build one Prophet series (ds, y) of orders per meal.
+    """
+    # Aggregate orders by meal_id and date
+    meal_orders = df.groupby(['date', 'meal_id'])[
+        'num_orders'].sum().reset_index()
+
+    series = {}
+    for meal_id, meal_data in meal_orders.groupby('meal_id', sort=False):
+        series[meal_id] = pd.DataFrame({
+            'ds': meal_data['date'],
+            'y': meal_data['num_orders']
+        })
+    return series
+
+
+def fit_groups(groups, future_periods=1, engine=None, warm_start=None):
+    """
+    Fit the series of several groups in a single parallel run.
+
+    Args:
+        groups: Dict mapping a group name to a dict of series
+        future_periods: Number of weeks to forecast
+        engine: ForecastEngine to use (defaults to the shared engine)
+        warm_start: Optional previous fit parameters keyed by (group, name)
+
+    Returns:
+        Tuple of (dict group -> dict name -> fitted result, fitted results keyed by (group, name)).
+        Each result also carries the 'history' it was fitted on.
+    """
+    engine = engine or forecast_engine
+
+    # Flatten so every series, whatever its group, can run on any worker
+    all_series = {}
+    for group, series in groups.items():
+        for name, data in series.items():
+            all_series[(group, name)] = data
 
-        # Initialize and fit the model
-        model = Prophet(interval_width=0.95,
-                        daily_seasonality=False, weekly_seasonality=True)
-        model.fit(prophet_data)
+    fitted = engine.forecast_many(all_series, future_periods, warm_start=warm_start)
 
-        # Create future dataframe and make predictions
-        future = model.make_future_dataframe(periods=future_periods, freq='W')
-        forecast = model.predict(future)
+    by_group = {group: {} for group in groups}
+    for (group, name), result in fitted.items():
+        result['history'] = all_series[(group, name)]
+        by_group[group][name] = result
+    return by_group, fitted
 
-        # Store forecast
-        forecasts[category] = forecast
 
-        # Create and store figure
-        fig = model.plot(forecast)
-        plt.title(f'Order Forecast for {category}')
-        figures[category] = fig
+# 1. Forecast orders by meal category
+def forecast_orders_by_category(df, future_periods=1, engine=None):
+    """
+    Forecast the number of orders for each category using Prophet.
+    """
+    fitted, _ = fit_groups({'category': category_series(df)}, future_periods, engine)
+
+    forecasts = {}
+    charts = {}
+    for category, result in fitted['category'].items():
+        forecasts[category] = result['forecast']
+        charts[category] = chart_data(result)
 
-    return forecasts, figures
+    return forecasts, charts
 
 # 2. Forecast ingredient consumption
 
 
-def forecast_ingredients(df, ingredients, future_periods=1):
+def forecast_ingredients(df, ingredients, future_periods=1, engine=None):
     """
     Forecast the consumption of each ingredient using Prophet.
     """
-    # Aggregate ingredient usage by date
-    ingredient_usage = df.groupby('date')[ingredients].sum().reset_index()
+    fitted, _ = fit_groups({'ingredient': ingredient_series(df, ingredients)}, future_periods, engine)
 
     forecasts = {}
-    figures = {}
+    charts = {}
+    for ingredient, result in fitted['ingredient'].items():
+        forecasts[ingredient] = result['forecast']
+        charts[ingredient] = chart_data(result)
 
-    for ingredient in ingredients:
-        # Prepare data for Prophet
-        prophet_data = pd.DataFrame({
-            'ds': ingredient_usage['date'],
-            'y': ingredient_usage[ingredient]
-        })
+    return forecasts, charts
 
-        # Skip ingredients with no usage
-        if prophet_data['y'].sum() == 0:
-            continue
+# 3. Calculate ingredient requirements based on meal forecasts
 
-        # Initialize and fit the model
-        model = Prophet(interval_width=0.95,
-                        daily_seasonality=False, weekly_seasonality=True)
-        model.fit(prophet_data)
 
-        # Create future dataframe and make predictions
-        future = model.make_future_dataframe(periods=future_periods, freq='W')
-        forecast = model.predict(future)
+def category_ingredient_ratios(df, ingredients=INGREDIENTS):
+    """
+    Average usage of every ingredient per order, for every category.
 
-        # Store forecast
-        forecasts[ingredient] = forecast
+    Computed in one grouped pass: ingredient columns are weighted by
+    num_orders, summed per category and divided by that category's total
+    orders. Categories without orders get a row of zeros.
 
-        # Create and store figure
-        fig = model.plot(forecast)
-        plt.title(f'{ingredient.capitalize()} Consumption Forecast')
-        figures[ingredient] = fig
+    Returns:
+        DataFrame indexed by category with one column per ingredient
+    """
+    # Integer category codes make the groupby a single bincount-style pass;
+    # rows without a category (code -1) are left out
+    codes, categories = pd.factorize(df['category'], sort=False)
+    has_category = codes >= 0
+    codes = codes[has_category]
 
-    return forecasts, figures
+    orders = df['num_orders'].to_numpy(dtype='float64')[has_category]
+    weighted_usage = pd.DataFrame(
+        df[ingredients].to_numpy(dtype='float64')[has_category] * orders[:, None],
+        columns=ingredients)
 
-# 3. Calculate ingredient requirements based on meal forecasts
+    usage = weighted_usage.groupby(codes).sum().to_numpy()
+    total_orders = np.bincount(codes, weights=orders, minlength=len(categories))
+
+    ratios = np.divide(usage, total_orders[:, None],
+                       out=np.zeros_like(usage), where=total_orders[:, None] > 0)
+    return pd.DataFrame(ratios, index=categories, columns=ingredients)
 
 
 def calculate_ingredient_requirements(df, category_forecasts):
     """
     Calculate ingredient requirements based on forecasted order quantities.
     """
-    # Get the next week's forecast for each category
-    next_week_forecasts = {}
-    for category, forecast in category_forecasts.items():
-        next_week_forecasts[category] = forecast.iloc[-1]['yhat']
-
-    # Calculate average ingredient usage per order for each category
-    category_ingredient_ratios = {}
-    ingredients = ['garlic', 'spices', 'herbs', 'onion', 'ginger', 'cilantro',
-                   'basil', 'vegetables', 'oil', 'water', 'chili', 'protein',
-                   'pepper', 'sauce', 'acid', 'cardamom', 'salt', 'starch',
-                   'seasoning', 'garnish', 'cinnamon', 'vegetable', 'bean sprouts',
-                   'olive oil', 'coconut milk', 'cream', 'lemongrass', 'sugar',
-                   'lime juice', 'cloves']
-
-    for category in df['category'].unique():
-        category_data = df[df['category'] == category]
-        total_orders = category_data['num_orders'].sum()
-
-        if total_orders > 0:
-            # Calculate total ingredient usage for this category
-            ingredient_usage = category_data[ingredients].mul(
-                category_data['num_orders'], axis=0).sum()
-
-            # Calculate average usage per order
-            category_ingredient_ratios[category] = ingredient_usage / total_orders
-        else:
-            # Handle case with no orders
-            category_ingredient_ratios[category] = pd.Series(
-                0, index=ingredients)
-
-    # Calculate expected ingredient requirements
-    total_requirements = pd.Series(0, index=ingredients)
-    for category, forecast_value in next_week_forecasts.items():
-        if category in category_ingredient_ratios:
-            total_requirements += category_ingredient_ratios[category] * \
-                forecast_value
-
-    # convert to pd.Series to dict
-    # total_requirements = total_requirements.to_dict()
+    # Category x ingredient matrix of average usage per order
+    ratios = category_ingredient_ratios(df)
+
+    # Next week's forecast for each category, aligned with the matrix rows;
+    # categories without a forecast contribute nothing
+    next_week_forecasts = pd.Series(
+        {category: forecast.iloc[-1]['yhat'] for category, forecast in category_forecasts.items()},
+        dtype='float64')
+    forecast_vector = next_week_forecasts.reindex(ratios.index, fill_value=0.0)
+
+    # Expected requirements as one matrix-vector product
+    total_requirements = pd.Series(
+        forecast_vector.to_numpy() @ ratios.to_numpy(), index=ratios.columns)
+
     return total_requirements, total_requirements.to_dict()
 
 # 4. Forecast meal popularity for menu optimization
 
 
-def forecast_meal_popularity(df, future_periods=1):
+def rank_meals(meal_forecasts):
     """
-    Forecast the popularity of each meal to suggest menu optimizations.
+    Sort meals by their forecasted orders for the next period.
     """
-    # Aggregate orders by meal_id and date
-    meal_orders = df.groupby(['date', 'meal_id'])[
-        'num_orders'].sum().reset_index()
+    top_meals = {meal_id: forecast.iloc[-1]['yhat']
+                 for meal_id, forecast in meal_forecasts.items()}
+    return sorted(top_meals.items(), key=lambda x: x[1], reverse=True)
 
-    forecasts = {}
-    top_meals = {}
 
-    for meal_id in meal_orders['meal_id'].unique():
-        # Filter data for the current meal
-        meal_data = meal_orders[meal_orders['meal_id'] == meal_id]
+def forecast_meal_popularity(df, future_periods=1, engine=None):
+    """
+    Forecast the popularity of each meal to suggest menu optimizations.
+    """
+    fitted, _ = fit_groups({'meal': meal_series(df)}, future_periods, engine)
 
-        # Prepare data for Prophet
-        prophet_data = pd.DataFrame({
-            'ds': meal_data['date'],
-            'y': meal_data['num_orders']
-        })
+    forecasts = {meal_id: result['forecast'] for meal_id, result in fitted['meal'].items()}
 
-        # Initialize and fit the model
-        model = Prophet(interval_width=0.95,
-                        daily_seasonality=False, weekly_seasonality=True)
-        model.fit(prophet_data)
+    # Sort meals by forecasted popularity
+    sorted_meals = rank_meals(forecasts)
 
-        # Create future dataframe and make predictions
-        future = model.make_future_dataframe(periods=future_periods, freq='W')
-        forecast = model.predict(future)
+    return forecasts, sorted_meals
 
-        # Store forecast
-        forecasts[meal_id] = forecast
 
-        # Store the forecasted value for the next period
-        top_meals[meal_id] = forecast.iloc[-1]['yhat']
+# 6. Main function to run the entire analysis
 
-    # Sort meals by forecasted popularity
-    sorted_meals = sorted(top_meals.items(), key=lambda x: x[1], reverse=True)
 
-    return forecasts, sorted_meals
+def build_series(df, ingredients):
+    """
+    Build every Prophet series the analysis needs for one center.
+    """
+    return {
+        'category': category_series(df),
+        'ingredient': ingredient_series(df, ingredients),
+        'meal': meal_series(df),
+    }
 
 
-# 5. Visualize the results
-def visualize_ingredient_requirements(requirements):
+def analyze_and_forecast(df, engine=None, warm_start=None):
     """
-    Visualize the forecasted ingredient requirements.
+    Run the entire analysis and forecasting pipeline.
     """
-    # Filter non-zero requirements
-    non_zero_requirements = requirements[requirements > 0]
+    ingredients = INGREDIENTS
 
-    # Sort for better visualization
-    sorted_requirements = non_zero_requirements.sort_values(ascending=False)
+    # Steps 1, 2 and 4: fit the category, ingredient and meal series in one
+    # parallel run so every Prophet fit can use a free core
+    print("Forecasting orders by category, ingredient consumption and meal popularity...")
+    fitted, _ = fit_groups(build_series(df, ingredients), engine=engine, warm_start=warm_start)
 
-    plt.figure(figsize=(12, 8))
-    bars = plt.bar(sorted_requirements.index, sorted_requirements.values)
+    return summarize_forecasts(df, fitted)
 
-    # Add values on top of bars
-    for bar in bars:
-        yval = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2, yval + 0.05, round(yval, 1),
-                 ha='center', va='bottom', rotation=0)
 
-    plt.title('Forecasted Ingredient Requirements for Next Week')
-    plt.xlabel('Ingredient')
-    plt.ylabel('Quantity Required')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
+def analyze_centers(center_frames, engine=None, warm_starts=None):
+    """
+    Run the analysis for several centers, fitting the series of every
+    center in a single parallel run.
 
-    return plt.gcf()
+    Args:
+        center_frames: Dict mapping center_id to that center's rows
+        engine: ForecastEngine to use (defaults to the shared engine)
+        warm_starts: Optional dict mapping center_id to its previous fit parameters
 
-# 6. Main function to run the entire analysis
+    Returns:
+        Dict mapping center_id to the (results, artifacts) of ``summarize_forecasts``
+    """
+    ingredients = INGREDIENTS
+
+    groups = {}
+    warm_start = {}
+    for center_id, center_df in center_frames.items():
+        for group, series in build_series(center_df, ingredients).items():
+            groups[(center_id, group)] = series
+        for (group, name), init in ((warm_starts or {}).get(center_id) or {}).items():
+            warm_start[((center_id, group), name)] = init
+
+    print(f"Forecasting {len(center_frames)} centers...")
+    fitted, _ = fit_groups(groups, engine=engine, warm_start=warm_start)
+
+    return {
+        center_id: summarize_forecasts(center_df, {
+            group: fitted[(center_id, group)] for group in ('category', 'ingredient', 'meal')
+        })
+        for center_id, center_df in center_frames.items()
+    }
 
 
-def analyze_and_forecast(df):
+def summarize_forecasts(df, fitted):
     """
-    Run the entire analysis and forecasting pipeline.
+    Turn the fitted category, ingredient and meal series of one center into
+    ingredient requirements, top meals and chart data.
     """
-    # List of all ingredients
-    ingredients = ['garlic', 'spices', 'herbs', 'onion', 'ginger', 'cilantro',
-                   'basil', 'vegetables', 'oil', 'water', 'chili', 'protein',
-                   'pepper', 'sauce', 'acid', 'cardamom', 'salt', 'starch',
-                   'seasoning', 'garnish', 'cinnamon', 'vegetable', 'bean sprouts',
-                   'olive oil', 'coconut milk', 'cream', 'lemongrass', 'sugar',
-                   'lime juice', 'cloves']
-
-    # Step 1: Forecast orders by category
-    print("Forecasting orders by category...")
-    category_forecasts, category_figures = forecast_orders_by_category(df)
-
-    # Step 2: Forecast ingredient consumption directly
-    print("Forecasting ingredient consumption...")
-    ingredient_forecasts, ingredient_figures = forecast_ingredients(
-        df, ingredients)
+    # Flat view keyed by (group, name) for timings and warm-start state
+    all_fitted = {(group, name): result
+                  for group, results in fitted.items()
+                  for name, result in results.items()}
+
+    category_forecasts = {category: result['forecast']
+                          for category, result in fitted['category'].items()}
+    # Charts are drawn on demand from this data (see forecast_charts)
+    category_charts = {category: chart_data(result)
+                       for category, result in fitted['category'].items()}
+    ingredient_charts = {ingredient: chart_data(result)
+                         for ingredient, result in fitted['ingredient'].items()}
 
     # Step 3: Calculate ingredient requirements based on forecasted orders
     print("Calculating ingredient requirements...")
     ingredient_requirements, ingredient_requirements_dict = calculate_ingredient_requirements(
         df, category_forecasts)
 
-    # Step 4: Forecast meal popularity
-    print("Forecasting meal popularity...")
-    meal_forecasts, top_meals = forecast_meal_popularity(df)
-
-    # Step 5: Visualize the results
-    print("Visualizing the results...")
-    requirements_figure = visualize_ingredient_requirements(
-        ingredient_requirements)
+    # Rank meals by forecasted popularity
+    meal_forecasts = {meal_id: result['forecast']
+                      for meal_id, result in fitted['meal'].items()}
+    top_meals = rank_meals(meal_forecasts)
 
     # Display top 5 most popular meals for next week
     print("\nTop 5 Predicted Popular Meals for Next Week:")
@@ -276,16 +336,33 @@ def analyze_and_forecast(df):
         # 'meal_forecasts': meal_forecasts,
         'ingredient_requirements': predict_ingredient_list,
         'top_meal_details': meal_details,
+        'fit_timings': timing_report(all_fitted),
     }, {
-        'figures': {
-            'categories': category_figures,
-            'ingredients': ingredient_figures,
-            'requirements': requirements_figure
-        }
+        'charts': {
+            'category': category_charts,
+            'ingredient': ingredient_charts,
+            'requirements': ingredient_requirements
+        },
+        # Fitted parameters to warm-start the next incremental run
+        'warm_start': {key: result['init'] for key, result in all_fitted.items()
+                       if result.get('init') is not None}
     })
 
 
-def predict_ingredient(path_to_csv):
+def append_new_weeks(state, new_rows):
+    """
+    Add the weeks of ``new_rows`` that come after the saved state's last
+    week to the rows seen so far.
+    """
+    new_rows = new_rows[new_rows['week'] > state['last_week']]
+    print(f"Incremental update: {len(new_rows)} new rows after week {state['last_week']}")
+    return pd.concat([state['rows'], new_rows], ignore_index=True)
+
+
+def load_demand_csv(path_to_csv):
+    """
+    Read a demand CSV and add the 'date' column Prophet needs.
+    """
     # Load the data
     df = pd.read_csv(path_to_csv)
 
@@ -294,41 +371,78 @@ def predict_ingredient(path_to_csv):
     start_date = '2023-01-01'
     df['date'] = pd.to_datetime(start_date) + \
         pd.to_timedelta(df['week'] * 7, unit='D')
+    return df
+
+
+def predict_ingredient_by_center(path_to_csv, center_ids=None, incremental=False):
+    """
+    Forecast demand and ingredient requirements for several centers from
+    one demand CSV.
 
-    # forecasting for particular branch
-    center_id = 55
-    center_df = df[df['center_id'] == center_id].copy()
+    The file is grouped by center once and the Prophet series of all
+    requested centers are fitted together across the forecast engine's
+    worker pool.
 
-    print(center_df.shape)
+    In incremental mode the CSV only needs the new weeks: they are appended
+    to the rows saved by the previous run and every series is warm-started
+    from its previous fit, so the optimizer only has to account for the
+    new data instead of converging from scratch.
+
+    Args:
+        path_to_csv: Path to the demand CSV
+        center_ids: Centers to forecast, or None for every center in the file
+        incremental: Treat the CSV as new weeks on top of the saved state
+
+    Returns:
+        Dict mapping center_id to that center's results
+    """
+    df = load_demand_csv(path_to_csv)
+    if center_ids is not None:
+        df = df[df['center_id'].isin(center_ids)]
 
-    results, res_figure = analyze_and_forecast(center_df)
+    center_frames = {}
+    warm_starts = {}
+    for center_id, center_df in df.groupby('center_id'):
+        center_id = int(center_id)
 
-    # for key, value in results.items():
-    #     print("types", key, type(key), type(value))
-    #     for k, v in value.items():
-    #         # print("key", k, "value", v)
-    #         print("types", type(k), type(v))
-    #         break
+        if incremental:
+            state = forecast_state.load(center_id)
+            if state is None:
+                print(f"No saved state for center {center_id}, running a full forecast")
+            else:
+                center_df = append_new_weeks(state, center_df)
+                warm_starts[center_id] = state['warm_start']
 
-    # Save figures if needed
-    for category, fig in res_figure['figures']['categories'].items():
-        # path =
-        path = os.path.join(GRAPH_FOLDER, f'category_forecast_{category}.png')
-        fig.savefig(path)
+        logger.debug(f"Center {center_id}: {center_df.shape[0]} rows to forecast")
+        center_frames[center_id] = center_df
 
-    for ingredient, fig in res_figure['figures']['ingredients'].items():
-        path = os.path.join(
-            GRAPH_FOLDER, f'ingredient_forecast_{ingredient}.png')
-        fig.savefig(path)
+    if not center_frames:
+        raise ValueError(f"No rows found for centers: {center_ids}")
 
-    path = os.path.join(GRAPH_FOLDER, 'ingredient_requirements.png')
-    res_figure['figures']['requirements'].savefig(path)
+    analyses = analyze_centers(center_frames, warm_starts=warm_starts)
 
-    print("Figures saved successfully.")
+    results = {}
+    for center_id, (center_results, res_figure) in analyses.items():
+        # Save the state the next incremental run builds on
+        forecast_state.save(center_id, center_frames[center_id],
+                            {**(warm_starts.get(center_id) or {}), **res_figure['warm_start']})
+
+        # Charts are rendered when first requested, not here
+        forecast_charts.save(center_id, res_figure['charts'])
+        results[center_id] = center_results
+
+    print("Chart data saved successfully.")
 
     return results
 
 
+def predict_ingredient(path_to_csv, incremental=False, center_id=DEFAULT_CENTER_ID):
+    """
+    Forecast demand and ingredient requirements for a single center.
+    """
+    return predict_ingredient_by_center(path_to_csv, [center_id], incremental)[center_id]
+
+
 if __name__ == "__main__":
     # Example usage
     path_to_csv = 'R:/Projects/hacknuthon/Demand & Waste Prediction/merged_daywise.csv'
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import threading
+import time
+from config.constant import logger, OBJECT_DETECTION_MODEL, SPOILAGE_CLASSIFIER_MODEL
+
+
+def _load_object_detection(weights_path):
+    """Load the YOLO ingredient detector"""
+    from ultralytics import YOLO
+    return YOLO(weights_path)
+
+
+def _load_spoilage_classifier(weights_path):
+    """Load the ResNet50 spoilage classifier"""
+    from models.FirstModule.spoilage_classifier.inference import SpoilageClassifier
+    return SpoilageClassifier(weights_path)
+
+
+def _rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _model_memory_bytes(model):
+    """Size of the parameters and buffers held by a torch-backed model"""
+    module = getattr(model, "model", model)
+    if not hasattr(module, "parameters"):
+        return None
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _weights_digest(weights_path):
+    """SHA-256 of a weights file, so a model's version follows its content"""
+    digest = hashlib.sha256()
+    with open(weights_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _ModelEntry:
+    def __init__(self, model, weights_path, weights_sha256, load_seconds, memory_bytes, rss_delta_bytes,
+                 generation):
+        self.model = model
+        self.weights_path = weights_path
+        self.weights_sha256 = weights_sha256
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.rss_delta_bytes = rss_delta_bytes
+        self.generation = generation
+
+    def to_dict(self):
+        return {
+            "weights_path": self.weights_path,
+            "weights_sha256": self.weights_sha256,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "memory_bytes": self.memory_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "generation": self.generation,
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model once and keeps it warm.
+
+    Models are loaded lazily on first use (or eagerly via ``preload``) and
+    can be swapped for new weights with ``reload`` without restarting the
+    worker; requests already holding the old model finish with it.
+    """
+
+    def __init__(self):
+        self._specs = {}
+        self._entries = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._inference_locks = {}
+
+    def register(self, name, loader, weights_path):
+        """Register a model loader under ``name``"""
+        with self._lock:
+            self._specs[name] = {"loader": loader, "weights_path": weights_path}
+            self._load_locks.setdefault(name, threading.Lock())
+            self._inference_locks.setdefault(name, threading.Lock())
+
+    def names(self):
+        return list(self._specs)
+
+    def get(self, name):
+        """Return the loaded model, loading it on first use"""
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry.model
+
+        if name not in self._specs:
+            raise KeyError(f"Unknown model: {name}")
+
+        # Only one thread loads a given model; the others wait for it
+        with self._load_locks[name]:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._load(name, self._specs[name]["weights_path"])
+                self._entries[name] = entry
+        return entry.model
+
+    def reload(self, name, weights_path=None):
+        """
+        Load ``name`` from ``weights_path`` (or its current weights) and swap
+        it in atomically once the new model is ready.
+        """
+        if name not in self._specs:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._load_locks[name]:
+            weights_path = weights_path or self._specs[name]["weights_path"]
+            entry = self._load(name, weights_path)
+            with self._lock:
+                self._specs[name]["weights_path"] = weights_path
+                self._entries[name] = entry
+        return entry.to_dict()
+
+    def inference_lock(self, name):
+        """Lock for models whose predict call is not safe to share across threads"""
+        return self._inference_locks[name]
+
+    def preload(self, names=None):
+        """Eagerly load models so the first request does not pay for it"""
+        for name in names or self.names():
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Error preloading model {name}: {e}")
+
+    def version(self, name):
+        """
+        Identifier that changes whenever the model's weights change. It is
+        derived from the weights' content, so it is the same in every worker
+        and across restarts for the same file.
+        """
+        self.get(name)
+        entry = self._entries[name]
+        return f"{name}:{entry.weights_sha256[:16]}"
+
+    def stats(self):
+        """Load time and memory use for every registered model"""
+        stats = {}
+        for name in self.names():
+            entry = self._entries.get(name)
+            if entry is None:
+                stats[name] = {
+                    "loaded": False,
+                    "weights_path": self._specs[name]["weights_path"],
+                }
+            else:
+                stats[name] = {"loaded": True, **entry.to_dict()}
+        return stats
+
+    def _load(self, name, weights_path):
+        if not os.path.isfile(weights_path):
+            raise FileNotFoundError(f"Model weights not found: {weights_path}")
+
+        # Hashed before loading so the version never names newer weights than the ones loaded
+        weights_sha256 = _weights_digest(weights_path)
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        model = self._specs[name]["loader"](weights_path)
+        load_seconds = time.perf_counter() - start
+        rss_after = _rss_bytes()
+
+        with self._lock:
+            generation = self._generations.get(name, 0) + 1
+            self._generations[name] = generation
+
+        entry = _ModelEntry(
+            model=model,
+            weights_path=weights_path,
+            weights_sha256=weights_sha256,
+            load_seconds=load_seconds,
+            memory_bytes=_model_memory_bytes(model),
+            rss_delta_bytes=(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+            generation=generation,
+        )
+        logger.info(f"Loaded model {name} from {weights_path} in {load_seconds:.2f}s")
+        return entry
+
+
+model_registry = ModelRegistry()
+model_registry.register("object_detection", _load_object_detection, OBJECT_DETECTION_MODEL)
+model_registry.register("spoilage_classifier", _load_spoilage_classifier, SPOILAGE_CLASSIFIER_MODEL)
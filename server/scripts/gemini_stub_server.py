@@ -0,0 +1,199 @@
+"""
+Local stand-in for the Gemini REST API that answers generateContent with
+canned JSON, so the AI endpoints can be exercised without network access
+or API quota. streamGenerateContent?alt=sse sends the same reply as a
+series of server-sent events, a few characters at a time.
+
+A prompt can ask for a failure with directives anywhere in its text:
+    stub-delay=<seconds>   reply after this delay instead of --delay
+    stub-status=<code>     answer with this HTTP error status
+    stub-reply=invalid     reply with text that is not JSON
+
+Usage (from the server folder):
+    python scripts/gemini_stub_server.py --port 8765 --delay 1.0 --chunk-delay 0.05
+    GEMINI_API_BASE=http://127.0.0.1:8765 python app.py
+
+Tests start it in-process on a free port with ``start_stub_server``.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_REPLIES = {
+    "daily special": {
+        "daily_specials": [
+            {"name": "Basil Chicken Melt", "ingredients": ["Chicken Breast", "Fresh Basil", "Mozzarella"],
+             "cost": 11.5, "profit_margin": 32, "special_occasion": True},
+            {"name": "Caprese Bake", "ingredients": ["Mozzarella", "Fresh Basil", "Tomatoes"],
+             "cost": 9.0, "profit_margin": 30, "special_occasion": True},
+        ]
+    },
+    "cost optimizations": {
+        "cost_optimizations": [
+            {"item": "Chicken Alfredo", "current_cost": 12.75, "suggested_cost": 11.25, "potential_savings": 1.5},
+        ]
+    },
+    "new dishes": {
+        "new_dishes": [
+            {"name": "Pesto Penne", "ingredients": ["Pasta", "Fresh Basil", "Parmesan"],
+             "cost": 10.0, "profit_margin": 28, "special_occasion": False},
+        ]
+    },
+    "creative dishes": {
+        "dishes": [
+            {
+                "name": "Tomato Basil Pasta",
+                "description": "Pasta tossed with fresh tomatoes and basil.",
+                "recipe": {"steps": ["Step 1: Boil the pasta.", "Step 2: Toss with tomatoes and basil."]},
+                "ingredients": [{"name": "Pasta", "quantity": 200, "unit": "grams"},
+                                {"name": "Tomatoes", "quantity": 3, "unit": "pieces"}],
+                "cost": 12, "profit_margin": 25, "special_occasion": False,
+            },
+            {
+                "name": "Chicken Caprese",
+                "description": "Seared chicken with mozzarella and basil.",
+                "recipe": {"steps": ["Step 1: Sear the chicken.", "Step 2: Top with mozzarella and basil."]},
+                "ingredients": [{"name": "Chicken Breast", "quantity": 250, "unit": "grams"},
+                                {"name": "Mozzarella", "quantity": 100, "unit": "grams"}],
+                "cost": 18, "profit_margin": 30, "special_occasion": False,
+            },
+            {
+                # Quotes, brackets and braces inside strings must not end the dish early
+                "name": "Chef's [Secret] Salad",
+                "description": 'Basil, "sun-dried" tomatoes and {house} dressing]}, served cold.',
+                "recipe": {"steps": ['Step 1: Whisk the dressing ("emulsify" until smooth).',
+                                     "Step 2: Plate as [greens] \\ {tomatoes}."]},
+                "ingredients": [{"name": "Tomatoes", "quantity": 2, "unit": "pieces"},
+                                {"name": "Fresh Basil", "quantity": 10, "unit": "grams"}],
+                "cost": 11, "profit_margin": 28, "special_occasion": True,
+            },
+        ]
+    },
+}
+
+
+def canned_reply(prompt):
+    """Pick the canned JSON whose keyword appears in the prompt"""
+    lowered = prompt.lower()
+    for keyword, reply in CANNED_REPLIES.items():
+        if keyword in lowered:
+            return reply
+    return {"message": "stub reply"}
+
+
+def prompt_directives(prompt):
+    """``stub-<name>=<value>`` directives found in a prompt"""
+    return dict(re.findall(r"stub-(\w+)=(\S+)", prompt))
+
+
+def prompt_text(body):
+    return "".join(part.get("text", "")
+                   for content in body.get("contents", [])
+                   for part in content.get("parts", []))
+
+
+def candidate_payload(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+def make_handler(delay, chunk_size, chunk_delay):
+    class GeminiStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            prompt = prompt_text(body)
+            directives = prompt_directives(prompt)
+
+            if ":streamGenerateContent" in self.path:
+                self.stream_reply(prompt, directives)
+                return
+            if ":generateContent" not in self.path:
+                self.send_error(404)
+                return
+
+            # Simulated model latency
+            time.sleep(float(directives.get("delay", delay)))
+
+            if "status" in directives:
+                self.send_json_error(int(directives["status"]))
+                return
+            if directives.get("reply") == "invalid":
+                text = "Sorry, I can't help with that."
+            else:
+                text = "```json\n" + json.dumps(canned_reply(prompt)) + "\n```"
+            payload = json.dumps(candidate_payload(text)).encode()
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def send_json_error(self, status):
+            payload = json.dumps({"error": {"code": status, "message": "stub error"}}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def stream_reply(self, prompt, directives):
+            if "status" in directives:
+                self.send_json_error(int(directives["status"]))
+                return
+            text = "```json\n" + json.dumps(canned_reply(prompt), indent=2) + "\n```"
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            # Time to first token, then a steady trickle of chunks
+            time.sleep(float(directives.get("delay", delay)))
+            for start in range(0, len(text), chunk_size):
+                event = json.dumps(candidate_payload(text[start:start + chunk_size]))
+                self.wfile.write(f"data: {event}\r\n\r\n".encode())
+                self.wfile.flush()
+                time.sleep(chunk_delay)
+            self.close_connection = True
+
+        def log_message(self, format, *args):
+            print(f"[gemini-stub] {self.address_string()} {format % args}")
+
+    return GeminiStubHandler
+
+
+def start_stub_server(host="127.0.0.1", port=0, delay=0.5, chunk_size=24, chunk_delay=0.05):
+    """
+    Serve the stub on a background thread. With ``port=0`` a free port is
+    picked; its base URL is ``f"http://{host}:{server.server_port}"``.
+    Call ``server.shutdown()`` to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(delay, chunk_size, chunk_delay))
+    threading.Thread(target=server.serve_forever, name="gemini-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canned-response Gemini API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds to wait before each reply")
+    parser.add_argument("--chunk-size", type=int, default=24, help="Characters per streamed event")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="Seconds between streamed events")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port),
+                                 make_handler(args.delay, args.chunk_size, args.chunk_delay))
+    print(f"Gemini stub listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
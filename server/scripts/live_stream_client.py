@@ -0,0 +1,54 @@
+"""
+Streams image files to the live stream WebSocket as if they came from a
+camera, and prints every message the server sends back.
+
+Usage (from the server folder, with python serve.py running):
+    python scripts/live_stream_client.py frames/*.jpg --camera-id fridge-1 --fps 10
+    python scripts/live_stream_client.py frame.jpg --url ws://127.0.0.1:8081/ws/live --loop 50
+"""
+import argparse
+import asyncio
+from urllib.parse import urlencode
+import websockets
+
+
+async def send_frames(ws, frames, fps, loop):
+    for _ in range(loop):
+        for frame in frames:
+            await ws.send(frame)
+            await asyncio.sleep(1 / fps)
+
+
+async def print_messages(ws):
+    async for message in ws:
+        print(message)
+
+
+async def stream(args):
+    frames = []
+    for path in args.frames:
+        with open(path, "rb") as f:
+            frames.append(f.read())
+
+    url = f"{args.url}?{urlencode({'camera_id': args.camera_id})}"
+    async with websockets.connect(url, max_size=None) as ws:
+        reader = asyncio.create_task(print_messages(ws))
+        await send_frames(ws, frames, args.fps, args.loop)
+        # Give the server time to answer the last frame
+        await asyncio.sleep(args.linger)
+        reader.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send frames to the KitchenMate live stream")
+    parser.add_argument("frames", nargs="+", help="JPEG/PNG files to send, in order")
+    parser.add_argument("--url", default="ws://127.0.0.1:8080/ws/live")
+    parser.add_argument("--camera-id", default="default")
+    parser.add_argument("--fps", type=float, default=5, help="Frames sent per second")
+    parser.add_argument("--loop", type=int, default=1, help="Times to send the frame list")
+    parser.add_argument("--linger", type=float, default=3, help="Seconds to wait for replies after the last frame")
+    asyncio.run(stream(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Closed-loop load test: keeps N requests in flight against one or more
+servers and reports requests per second and latency percentiles for each.
+Each in-flight request is a thread with its own keep-alive connection.
+
+Usage (from the server folder), e.g. dev server against the uvicorn workers:
+    python scripts/gemini_stub_server.py --delay 1.0 &
+    GEMINI_API_BASE=http://127.0.0.1:8765 PORT=8080 python app.py &
+    GEMINI_API_BASE=http://127.0.0.1:8765 PORT=8081 python serve.py &
+    python scripts/load_test.py http://127.0.0.1:8080 http://127.0.0.1:8081 \
+        --path /optimize-menu --method POST --concurrency 50 --duration 20
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def request_body(args):
+    if args.json:
+        return json.dumps(json.loads(args.json)).encode(), {"Content-Type": "application/json"}
+    if args.form:
+        form = dict(field.split("=", 1) for field in args.form)
+        return urlencode(form).encode(), {"Content-Type": "application/x-www-form-urlencoded"}
+    return None, {}
+
+
+def run_target(base_url, args):
+    url = urlsplit(base_url)
+    body, headers = request_body(args)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def connect():
+        return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=args.timeout)
+
+    def worker():
+        connection = connect()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request(args.method, args.path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if response.status >= 400:
+                        errors.append(response.status)
+                    else:
+                        latencies.append(elapsed)
+            except (OSError, http.client.HTTPException) as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                connection.close()
+                connection = connect()
+        connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def ms(fraction):
+        value = percentile(latencies, fraction)
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "target": base_url,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": ms(0.50),
+        "p95_ms": ms(0.95),
+        "p99_ms": ms(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare throughput of KitchenMate servers")
+    parser.add_argument("targets", nargs="+", help="Base URLs to test, one after another")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--json", help="JSON request body")
+    parser.add_argument("--form", action="append", default=[], metavar="KEY=VALUE",
+                        help="Form field to send, may be repeated")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests kept in flight")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per target")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds before a request fails")
+    args = parser.parse_args()
+
+    results = [run_target(target, args) for target in args.targets]
+
+    print(f"{args.method} {args.path}, {args.concurrency} in flight for {args.duration:g}s")
+    print(f"{'target':<32} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for result in results:
+        print(f"{result['target']:<32} {result['rps']:>8} {str(result['p50_ms']):>9} "
+              f"{str(result['p95_ms']):>9} {str(result['p99_ms']):>9} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Production launcher: serves asgi:app with uvicorn and SERVER_WORKERS worker
+processes. Each worker loads its own models and database connection and
+runs Flask on ASGI_THREADS threads, one per request in flight, so a host
+holds up to SERVER_WORKERS * ASGI_THREADS concurrent requests.
+It also serves the live stream WebSocket at /ws/live, which the Flask dev
+server (python app.py) does not.
+
+Usage (from the server folder):
+    python serve.py
+    SERVER_WORKERS=4 ASGI_THREADS=128 python serve.py
+"""
+import uvicorn
+from config.constant import HOST, PORT, DEBUG, SERVER_WORKERS, LIVE_STREAM_MAX_FRAME_BYTES
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "asgi:app",
+        host=HOST,
+        port=PORT,
+        workers=SERVER_WORKERS,
+        log_level="debug" if DEBUG else "info",
+        timeout_keep_alive=30,
+        # Largest live stream frame accepted over the WebSocket
+        ws_max_size=LIVE_STREAM_MAX_FRAME_BYTES,
+    )
@@ -1,25 +1,18 @@
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
 from flask import Blueprint, jsonify
+import copy
 import json
-
-# Load environment variables
-load_dotenv()
-
-# Configure Gemini API
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
-
-# Initialize the model
-try:
-    model = genai.GenerativeModel(model_name="gemini-2.0-flash")
-except Exception as e:
-    print(f"Error initializing model: {e}")
-    exit()
+import re
+from services.gemini_client import gemini_client
+from utils.response_cache import ResponseCache
+from utils.json_stream import JSONArrayStreamParser
+from config.constant import DISH_CACHE_MAX_ENTRIES, DISH_CACHE_TTL, DISH_CACHE_DB
 
 ai_dish_bp = Blueprint('ai_dish', __name__)
 
+# Generated dishes keyed on the normalized request, shared by every tablet
+dish_cache = ResponseCache("dish_generation", max_entries=DISH_CACHE_MAX_ENTRIES,
+                           ttl=DISH_CACHE_TTL, db_path=DISH_CACHE_DB)
+
 def get_surplus_ingredients():
     """Get current surplus ingredients from inventory"""
     return [
@@ -33,18 +26,9 @@ def get_surplus_ingredients():
 def generate_ai_response(prompt):
     """Generate response from Gemini API"""
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-
-        # Clean up JSON response
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-
-        # Parse the JSON string into a Python object
+        # Parse the reply into a Python object
         try:
-            return json.loads(content)
+            return gemini_client.generate_json(prompt)
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON response: {str(e)}")
             return {"dishes": []}
@@ -52,6 +36,198 @@ def generate_ai_response(prompt):
         print(f"Error in generate_ai_response: {str(e)}")
         return {"dishes": []}
 
+def normalize_dish(dish):
+    """Fill in missing fields of a generated dish so the UI can render it"""
+    # Ensure recipe has proper structure
+    if "recipe" not in dish:
+        dish["recipe"] = {"steps": ["No recipe steps available."]}
+    elif isinstance(dish["recipe"], str):
+        # Convert string recipes to proper structure
+        dish["recipe"] = {"steps": [dish["recipe"]]}
+    elif not isinstance(dish["recipe"], dict):
+        dish["recipe"] = {"steps": ["No recipe steps available."]}
+
+    # Make sure steps exist in recipe
+    # print(dish["recipe"])
+    if "steps" not in dish["recipe"]:
+        dish["recipe"]["steps"] = ["No steps provided."]
+
+    # Handle ingredients
+    if "ingredients" not in dish:
+        dish["ingredients"] = []
+    elif isinstance(dish["ingredients"], list):
+        # Convert any string ingredients to proper structure
+        dish["ingredients"] = [
+            {
+                "name": ing if isinstance(ing, str) else ing.get("name", ""),
+                "quantity": 1 if isinstance(ing, str) else ing.get("quantity", 1),
+                "unit": "unit" if isinstance(ing, str) else ing.get("unit", "unit")
+            }
+            for ing in dish["ingredients"]
+        ]
+
+    # Ensure other fields exist
+    if "cost" not in dish:
+        dish["cost"] = 0
+    if "profit_margin" not in dish:
+        dish["profit_margin"] = 0
+    if "special_occasion" not in dish:
+        dish["special_occasion"] = False
+    return dish
+
+
+def dish_request(generation_type, data):
+    """
+    Ingredients and Gemini prompt for a /generate-dishes request.
+    Raises ValueError when the request cannot be served.
+    """
+    message = data.get('message', '')
+
+    if generation_type == 'inventory':
+        # Generate dishes based on current inventory
+        surplus_ingredients = get_surplus_ingredients()
+        ingredients = surplus_ingredients
+        prompt = f"""Create 2 creative dishes using these surplus ingredients: {surplus_ingredients}.
+        and recipe for creating this dish: {message}
+
+        Guidelines:
+        - mandatory is to create a recipe for the dish
+        - Use short, catchy names (max 3-4 words)
+        - Use realistic market prices for ingredients
+        - Include all ingredients, even small amounts
+        - Cost should be between $10-30 per dish
+        - Profit margin should be 20-35%
+        - For each ingredient, specify exact quantity and unit (e.g., grams, cups, pieces)
+
+        Format the response as JSON with this structure:
+        {{
+            "dishes": [
+                {{
+                    "name": "string",
+                    "description": "string",
+                    "recipe": {{
+                        "steps": [
+                            "Step 1: ...",
+                            "Step 2: ...",
+                            "Step 3: ..."
+                        ]
+                    }},
+                    "ingredients": [
+                        {{
+                            "name": "string",
+                            "quantity": number,
+                            "unit": "string"
+                        }}
+                    ],
+                    "cost": number,
+                    "profit_margin": number,
+                    "special_occasion": boolean
+                }}
+            ]
+        }}"""
+
+    elif generation_type == 'custom':
+        # Generate dishes based on custom ingredients
+        ingredients = data.get('ingredients', [])
+
+        if not ingredients:
+            raise ValueError("No ingredients provided")
+
+        prompt = f"""Create 2 creative dishes using these ingredients: {ingredients} and recipe for creating this dish: {message}
+
+        Guidelines:
+        - mandatory is to create a recipe for the dish
+        - Use short, catchy names (max 3-4 words)
+        - Use realistic market prices for ingredients
+        - Include all ingredients, even small amounts
+        - Cost should be between $10-30 per dish
+        - Profit margin should be 20-35%
+
+        Format the response as JSON with this structure:
+        {{
+            "dishes": [
+                {{
+                    "name": "string",
+                    "description": "string",
+                    "recipe": {{
+                        "steps": [
+                            "Step 1: ...",
+                            "Step 2: ...",
+                            "Step 3: ..."
+                        ]
+                    }},
+                    "ingredients": [
+                        {{
+                            "name": "string",
+                            "quantity": number,
+                            "unit": "string"
+                        }}
+                    ],
+                    "cost": number,
+                    "profit_margin": number,
+                    "special_occasion": boolean
+                }}
+            ]
+        }}"""
+    else:
+        raise ValueError("Invalid generation type")
+
+    return ingredients, prompt
+
+
+def dish_cache_key(generation_type, ingredients, message):
+    """
+    Cache key of a dish generation request: the generation type, the set of
+    ingredient names and the message, ignoring case, order and extra spaces.
+    """
+    def normalize(text):
+        return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+    names = sorted({normalize(ing.get("name", "") if isinstance(ing, dict) else ing)
+                    for ing in ingredients or []})
+    return json.dumps([normalize(generation_type), names, normalize(message)])
+
+
+def generate_dishes_cached(generation_type, ingredients, message, prompt):
+    """
+    Return generated dishes for the request, calling Gemini only when the
+    same normalized request has not been answered within the cache TTL.
+    """
+    key = dish_cache_key(generation_type, ingredients, message)
+    response = dish_cache.get(key)
+    if response is None:
+        response = generate_ai_response(prompt)
+        # Only keep real answers; failures fall back to {"dishes": []}
+        if response and response.get("dishes"):
+            dish_cache.put(key, response)
+
+    # Callers normalize the dishes in place, so never hand out the cached object
+    return copy.deepcopy(response)
+
+
+def stream_dishes(generation_type, ingredients, message, prompt):
+    """
+    Yield generated dishes one at a time, each as soon as the model has
+    finished writing it. Cached answers are replayed without calling Gemini,
+    and a completed stream is cached like a regular answer.
+    """
+    key = dish_cache_key(generation_type, ingredients, message)
+    cached = dish_cache.get(key)
+    if cached is not None:
+        for dish in copy.deepcopy(cached)["dishes"]:
+            yield normalize_dish(dish)
+        return
+
+    parser = JSONArrayStreamParser("dishes")
+    dishes = []
+    for text in gemini_client.stream_text(prompt):
+        for dish in parser.feed(text):
+            dishes.append(copy.deepcopy(dish))
+            yield normalize_dish(dish)
+
+    if dishes:
+        dish_cache.put(key, {"dishes": dishes})
+
 # @ai_dish_bp.route('/generate-dishes', methods=['POST'])
 def generate_dishes_func(data):
     try:
@@ -154,8 +330,9 @@ def generate_dishes_func(data):
                 "message": "Invalid generation type"
             })
 
-        # Generate response from Gemini API
-        response = generate_ai_response(prompt)
+        # Generate response from Gemini API (or reuse a cached answer)
+        ingredients = surplus_ingredients if generation_type == 'inventory' else data.get('ingredients', [])
+        response = generate_dishes_cached(generation_type, ingredients, message, prompt)
         print(response)
         if not response or "dishes" not in response:
             return jsonify({
@@ -165,41 +342,7 @@ def generate_dishes_func(data):
 
         # Process each dish to ensure proper structure
         for dish in response["dishes"]:
-            # Ensure recipe has proper structure
-            if "recipe" not in dish:
-                dish["recipe"] = {"steps": ["No recipe steps available."]}
-            elif isinstance(dish["recipe"], str):
-                # Convert string recipes to proper structure
-                dish["recipe"] = {"steps": [dish["recipe"]]}
-            elif not isinstance(dish["recipe"], dict):
-                dish["recipe"] = {"steps": ["No recipe steps available."]}
-
-            # Make sure steps exist in recipe
-            # print(dish["recipe"])
-            if "steps" not in dish["recipe"]:
-                dish["recipe"]["steps"] = ["No steps provided."]
-
-            # Handle ingredients
-            if "ingredients" not in dish:
-                dish["ingredients"] = []
-            elif isinstance(dish["ingredients"], list):
-                # Convert any string ingredients to proper structure
-                dish["ingredients"] = [
-                    {
-                        "name": ing if isinstance(ing, str) else ing.get("name", ""),
-                        "quantity": 1 if isinstance(ing, str) else ing.get("quantity", 1),
-                        "unit": "unit" if isinstance(ing, str) else ing.get("unit", "unit")
-                    }
-                    for ing in dish["ingredients"]
-                ]
-
-            # Ensure other fields exist
-            if "cost" not in dish:
-                dish["cost"] = 0
-            if "profit_margin" not in dish:
-                dish["profit_margin"] = 0
-            if "special_occasion" not in dish:
-                dish["special_occasion"] = False
+            normalize_dish(dish)
 
         return jsonify({
             "success": True,
@@ -1,11 +1,19 @@
 from flask import request, jsonify
 from werkzeug.utils import secure_filename
 import os
+import io
+import csv
 from datetime import datetime
 from bson.objectid import ObjectId
-from config.constant import logger, UPLOAD_FOLDER
+from pymongo.errors import BulkWriteError
+from config.constant import logger, UPLOAD_FOLDER, BULK_INSERT_BATCH_SIZE, BULK_IMPORT_MAX_ROWS
+from utils.pagination import parse_page_args, fetch_page
+from utils.upload_stream import save_upload
 import json
 
+# Fields a client can request with ?fields=
+DISH_FIELDS = ("name", "price", "ingredients", "photo", "created_at", "updated_at")
+
 def add_dish(db):
     """Add a new dish to the database"""
     try:
@@ -32,7 +40,7 @@ def add_dish(db):
             if photo.filename:
                 filename = secure_filename(f"{int(datetime.now().timestamp())}_{photo.filename}")
                 photo_path = os.path.join(UPLOAD_FOLDER, filename)
-                photo.save(photo_path)
+                save_upload(photo, photo_path)
                 photo_url = f"/uploads/{filename}"
         elif request.form.get('photo_url'):
             photo_url = request.form.get('photo_url')
@@ -59,10 +67,6 @@ def add_dish(db):
         # Add ID to the dish object for the response
         dish['_id'] = dish_id
         
-        # Format datetime for JSON serialization
-        dish['created_at'] = dish['created_at'].isoformat()
-        dish['updated_at'] = dish['updated_at'].isoformat()
-        
         return jsonify({
             "success": True, 
             "message": "Dish added successfully",
@@ -75,21 +79,24 @@ def add_dish(db):
         return jsonify({"success": False, "message": str(e)}), 500
         
 def get_all_dishes(db):
-    """Get all dishes from the database"""
+    """
+    Get one page of dishes. Query parameters: limit (capped at MAX_PAGE_SIZE),
+    cursor (next_cursor of the previous page), sort (_id or updated_at,
+    "-" prefix for descending) and fields (comma-separated projection).
+    """
     try:
-        dishes = list(db.dishes.find())
-        
-        # Convert ObjectId to string for JSON serialization
-        for dish in dishes:
-            dish['_id'] = str(dish['_id'])
-            if 'created_at' in dish:
-                dish['created_at'] = dish['created_at'].isoformat()
-            if 'updated_at' in dish:
-                dish['updated_at'] = dish['updated_at'].isoformat()
+        try:
+            page = parse_page_args(request.args, DISH_FIELDS)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        dishes, next_cursor = fetch_page(db.dishes, page)
                 
         return jsonify({
             "success": True,
-            "dishes": dishes
+            "dishes": dishes,
+            "next_cursor": next_cursor,
+            "limit": page["limit"]
         }), 200
         
     except Exception as e:
@@ -111,13 +118,6 @@ def get_dish(db, dish_id):
         if not dish:
             return jsonify({"success": False, "message": "Dish not found"}), 404
         
-        # Convert ObjectId to string for JSON serialization
-        dish['_id'] = str(dish['_id'])
-        if 'created_at' in dish:
-            dish['created_at'] = dish['created_at'].isoformat()
-        if 'updated_at' in dish:
-            dish['updated_at'] = dish['updated_at'].isoformat()
-        
         return jsonify({"success": True, "dish": dish}), 200
     
     except Exception as e:
@@ -201,7 +201,7 @@ def update_dish(db, dish_id):
             if photo.filename:
                 filename = secure_filename(f"{int(datetime.now().timestamp())}_{photo.filename}")
                 photo_path = os.path.join(UPLOAD_FOLDER, filename)
-                photo.save(photo_path)
+                save_upload(photo, photo_path)
                 update_data['photo'] = f"/uploads/{filename}"
         elif 'photo_url' in request.form:
             update_data['photo'] = request.form.get('photo_url')
@@ -221,13 +221,6 @@ def update_dish(db, dish_id):
         # Get the updated dish
         updated_dish = db.dishes.find_one({"_id": object_id})
         
-        # Format for JSON response
-        updated_dish['_id'] = str(updated_dish['_id'])
-        if 'created_at' in updated_dish:
-            updated_dish['created_at'] = updated_dish['created_at'].isoformat()
-        if 'updated_at' in updated_dish:
-            updated_dish['updated_at'] = updated_dish['updated_at'].isoformat()
-        
         return jsonify({
             "success": True,
             "message": "Dish updated successfully",
@@ -236,4 +229,204 @@ def update_dish(db, dish_id):
         
     except Exception as e:
         logger.error(f"Error updating dish: {e}")
-        return jsonify({"success": False, "message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "message": str(e)}), 500
+
+
+def parse_ingredient(item, number):
+    """
+    Validate one ingredient: a plain name, or an object shaped
+    ``{name, quantity, unit}`` as the client sends them
+
+    Raises:
+        ValueError: If the ingredient is not valid
+    """
+    if isinstance(item, str):
+        return item.strip()
+    if not isinstance(item, dict):
+        raise ValueError(f"Ingredient {number} must be a name or an object")
+    name = item.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"Ingredient {number} needs a name")
+    quantity = item.get('quantity')
+    if quantity is not None and (isinstance(quantity, bool) or not isinstance(quantity, (int, float))
+                                 or quantity < 0):
+        raise ValueError(f"Ingredient {number} has an invalid quantity: {quantity}")
+    unit = item.get('unit')
+    if unit is not None and not isinstance(unit, str):
+        raise ValueError(f"Ingredient {number} has an invalid unit: {unit}")
+    return {**item, 'name': name.strip()}
+
+
+def parse_ingredients(value):
+    """
+    Ingredients as a list, from a list, a JSON string or a comma-separated
+    string. Objects are kept as they are; only plain strings are split.
+
+    Raises:
+        ValueError: If an ingredient is not valid
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = None
+        if not isinstance(parsed, list):
+            return [i.strip() for i in value.split(',') if i.strip()]
+        value = parsed
+    if not isinstance(value, list):
+        raise ValueError("Ingredients must be a list")
+    ingredients = [parse_ingredient(item, number) for number, item in enumerate(value, start=1)]
+    return [i for i in ingredients if i]
+
+
+def dish_from_row(row, current_time):
+    """
+    Validate one imported row and build the dish document
+
+    Raises:
+        ValueError: If the row is not a valid dish
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+    name = str(row.get('name') or '').strip()
+    if not name:
+        raise ValueError("Dish name is required")
+    try:
+        price = float(row.get('price') or 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid price: {row.get('price')}")
+    if price < 0:
+        raise ValueError("Price cannot be negative")
+
+    return {
+        "name": name,
+        "price": price,
+        "ingredients": parse_ingredients(row.get('ingredients')),
+        "photo": str(row.get('photo') or row.get('photo_url') or ''),
+        "created_at": current_time,
+        "updated_at": current_time
+    }
+
+
+def iter_import_rows(stream, import_format):
+    """
+    Yield (row number, row or error) from a CSV or NDJSON byte stream,
+    reading it line by line so the upload is never held in memory whole.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if import_format == 'csv':
+        reader = csv.DictReader(text)
+        for number, row in enumerate(reader, start=1):
+            if None in row:
+                yield number, ValueError("Row has more values than the header")
+            else:
+                yield number, row
+        return
+
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+
+
+def import_format_of(content_type, filename=''):
+    """'csv' or 'ndjson' from the upload's content type or file name"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    extension = os.path.splitext(filename or '')[1].lower()
+    if content_type in ('text/csv', 'application/csv') or extension == '.csv':
+        return 'csv'
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl') \
+            or extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return None
+
+
+def insert_batch(db, batch, results):
+    """Insert one batch unordered and record the outcome of each row"""
+    documents = [dish for _, dish in batch]
+    failed = {}
+    try:
+        # insert_many sets _id on each document before sending it
+        db.dishes.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get('writeErrors', []):
+            failed[error['index']] = error.get('errmsg', 'Insert failed')
+
+    for index, (number, dish) in enumerate(batch):
+        if index in failed:
+            results.append({"row": number, "status": "error", "message": failed[index]})
+        else:
+            results.append({"row": number, "status": "inserted", "dish_id": dish['_id']})
+
+
+def bulk_add_dishes(db):
+    """
+    Import many dishes from one CSV or NDJSON upload. The body can be the raw
+    file (Content-Type text/csv or application/x-ndjson) or a multipart form
+    with the file under 'file'. CSV needs a header row with name, price,
+    ingredients and optionally photo. Valid rows are inserted in batches of
+    BULK_INSERT_BATCH_SIZE; the response reports the outcome of every row.
+    """
+    try:
+        if 'file' in request.files:
+            upload = request.files['file']
+            stream = upload.stream
+            import_format = request.args.get('format') or import_format_of(upload.mimetype, upload.filename)
+        else:
+            stream = request.stream
+            import_format = request.args.get('format') or import_format_of(request.content_type)
+
+        if import_format not in ('csv', 'ndjson'):
+            return jsonify({
+                "success": False,
+                "message": "Send a CSV or NDJSON file (Content-Type text/csv or application/x-ndjson)"
+            }), 400
+
+        current_time = datetime.now()
+        results = []
+        batch = []
+        truncated = False
+        for number, row in iter_import_rows(stream, import_format):
+            if number > BULK_IMPORT_MAX_ROWS:
+                # Rows past the limit are not read at all
+                truncated = True
+                break
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                batch.append((number, dish_from_row(row, current_time)))
+            except ValueError as e:
+                results.append({"row": number, "status": "error", "message": str(e)})
+            if len(batch) >= BULK_INSERT_BATCH_SIZE:
+                insert_batch(db, batch, results)
+                batch = []
+        if batch:
+            insert_batch(db, batch, results)
+
+        results.sort(key=lambda result: result['row'])
+        inserted = sum(1 for result in results if result['status'] == 'inserted')
+        message = f"Imported {inserted} of {len(results)} dishes"
+        if truncated:
+            message += f"; rows after {BULK_IMPORT_MAX_ROWS} were ignored"
+        return jsonify({
+            "success": inserted == len(results) and not truncated,
+            "message": message,
+            "truncated": truncated,
+            "total": len(results),
+            "inserted": inserted,
+            "failed": len(results) - inserted,
+            "results": results
+        }), 201 if inserted else 400
+
+    except UnicodeDecodeError:
+        return jsonify({"success": False, "message": "File must be UTF-8 encoded"}), 400
+    except Exception as e:
+        logger.error(f"Error importing dishes: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
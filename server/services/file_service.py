@@ -2,6 +2,7 @@ import os
 import pandas as pd
 from werkzeug.utils import secure_filename
 from config.constant import UPLOAD_FOLDER, ALLOWED_EXTENSIONS, HIGH_RISK_INGREDIENTS
+from utils.upload_stream import save_upload
 
 
 def allowed_file(filename):
@@ -13,7 +14,7 @@ def save_upload_file(file):
     """Save the uploaded file to the uploads folder"""
     filename = secure_filename(file.filename)
     filepath = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(filepath)
+    save_upload(file, filepath)
     return filepath
 
 
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import queue
+import threading
+import httpx
+from config.constant import (
+    logger, GEMINI_API_KEY, GEMINI_MODEL_NAME, GEMINI_API_BASE, GEMINI_TIMEOUT, GEMINI_MAX_CONCURRENCY
+)
+
+
+def parse_json_content(content):
+    """Parse a model reply as JSON, dropping a ```json fence around it"""
+    content = content.strip()
+    if content.startswith('```json'):
+        content = content[7:]
+    if content.endswith('```'):
+        content = content[:-3]
+    return json.loads(content)
+
+
+def response_text(payload):
+    """Text of the first candidate of a generateContent response"""
+    candidates = payload.get("candidates") or []
+    if not candidates:
+        raise ValueError(f"Gemini returned no candidates: {payload.get('promptFeedback', payload)}")
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(part.get("text", "") for part in parts)
+
+
+class GeminiClient:
+    """
+    Calls the Gemini REST API with httpx on one background event loop
+    shared by every request thread.
+
+    Independent prompts can be sent together with ``generate_many``; they
+    run concurrently, so a batch takes about as long as its slowest prompt.
+    A process-wide semaphore caps the number of calls in flight and every
+    call has its own timeout.
+
+    ``base_url`` can point at a local stub (see scripts/gemini_stub_server.py)
+    to run without network access or API quota.
+    """
+
+    def __init__(self, api_key=GEMINI_API_KEY, model_name=GEMINI_MODEL_NAME, base_url=GEMINI_API_BASE,
+                 timeout=GEMINI_TIMEOUT, max_concurrency=GEMINI_MAX_CONCURRENCY):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._http = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        # The loop, HTTP connection pool and semaphore are created once and
+        # live on a daemon thread, so sync Flask handlers can submit to them
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="gemini-client", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._init_loop_state(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _init_loop_state(self):
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _url(self, method):
+        return f"/v1beta/models/{self.model_name}:{method}"
+
+    def _body(self, prompt):
+        return {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+
+    async def agenerate_text(self, prompt, timeout=None):
+        """Send one prompt and return the reply text (runs on the client loop)"""
+        timeout = timeout or self.timeout
+        async with self._semaphore:
+            response = await asyncio.wait_for(
+                self._http.post(self._url("generateContent"), json=self._body(prompt),
+                                headers={"x-goog-api-key": self.api_key or ""}, timeout=timeout),
+                timeout)
+        response.raise_for_status()
+        return response_text(response.json())
+
+    async def astream_text(self, prompt, timeout=None):
+        """
+        Send one prompt to the streaming endpoint and yield the reply text
+        piece by piece as the model produces it (runs on the client loop)
+        """
+        timeout = timeout or self.timeout
+        async with self._semaphore:
+            async with self._http.stream(
+                    "POST", self._url("streamGenerateContent"), params={"alt": "sse"},
+                    json=self._body(prompt), headers={"x-goog-api-key": self.api_key or ""},
+                    timeout=timeout) as response:
+                response.raise_for_status()
+                # Every server-sent event carries one partial response
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    text = response_text(json.loads(line[5:]))
+                    if text:
+                        yield text
+
+    async def agenerate_json(self, prompt, timeout=None):
+        return parse_json_content(await self.agenerate_text(prompt, timeout))
+
+    async def _gather_json(self, prompts, timeout):
+        names = list(prompts)
+        replies = await asyncio.gather(
+            *(self.agenerate_json(prompts[name], timeout) for name in names),
+            return_exceptions=True)
+
+        results = {}
+        for name, reply in zip(names, replies):
+            if isinstance(reply, BaseException):
+                logger.error(f"Gemini call '{name}' failed: {type(reply).__name__}: {reply}")
+                results[name] = {"error": str(reply) or type(reply).__name__}
+            else:
+                results[name] = reply
+        return results
+
+    def run(self, coro):
+        """Run a coroutine on the client loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def generate_json(self, prompt, timeout=None):
+        """Send one prompt and return its reply parsed as JSON"""
+        return self.run(self.agenerate_json(prompt, timeout))
+
+    def stream_text(self, prompt, timeout=None):
+        """
+        Blocking generator over the pieces of a streamed reply, for use
+        from request threads. Raises if the stream fails part way.
+        """
+        pieces = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for text in self.astream_text(prompt, timeout):
+                    pieces.put(text)
+            except Exception as e:
+                pieces.put(e)
+            finally:
+                pieces.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._ensure_loop())
+        try:
+            while True:
+                piece = pieces.get()
+                if piece is done:
+                    break
+                if isinstance(piece, Exception):
+                    raise piece
+                yield piece
+        finally:
+            # Stop the HTTP stream if the consumer goes away early
+            future.cancel()
+
+    def generate_many(self, prompts, timeout=None):
+        """
+        Send several independent prompts concurrently
+
+        Args:
+            prompts: Dict mapping a name to a prompt
+            timeout: Seconds allowed for each call (defaults to GEMINI_TIMEOUT)
+
+        Returns:
+            Dict mapping each name to the parsed JSON reply, or to
+            {"error": message} when that call failed or timed out
+        """
+        return self.run(self._gather_json(prompts, timeout))
+
+
+gemini_client = GeminiClient()
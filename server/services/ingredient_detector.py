@@ -1,5 +1,26 @@
+import copy
+import io
 from utils.mock_data import generate_mock_ingredients
+from utils.response_cache import ResponseCache
+from utils.upload_stream import file_digest
+from utils.frame_change import frame_signature, live_frame_filter
 from models.FirstModule import detect
+from models.FirstModule import video_analysis
+from models.model_registry import model_registry
+from config.constant import (VIDEO_SAMPLING_MODE, VIDEO_FRAME_STRIDE, DETECTION_CACHE_MAX_ENTRIES,
+                             DETECTION_CACHE_TTL, DETECTION_CACHE_DB)
+
+# Models whose weights decide the detection result
+DETECTION_MODELS = ("object_detection", "spoilage_classifier")
+
+# Detection results keyed by image content and model versions
+detection_cache = ResponseCache("detection", max_entries=DETECTION_CACHE_MAX_ENTRIES,
+                                ttl=DETECTION_CACHE_TTL, db_path=DETECTION_CACHE_DB)
+
+
+def detection_key(digest):
+    """Cache key of an image: its SHA-256 plus the version of every model used"""
+    return "|".join([digest] + [model_registry.version(name) for name in DETECTION_MODELS])
 
 
 class IngredientDetector:
@@ -7,18 +28,69 @@ class IngredientDetector:
         # In a real app, you might initialize a ML model here
         pass
 
-    def detect_from_image(self, image_path):
-        result = detect.analyze_ingredients(image_path)
-        # print("REsult", result)
-        return result
-        return generate_mock_ingredients(3, 6)
+    def _detect_cached(self, digest, analyze):
+        """Return the stored result for ``digest``, or run ``analyze`` and store it"""
+        key = detection_key(digest)
+        result = detection_cache.get(key)
+        if result is None:
+            result = analyze()
+            if result is not None:
+                detection_cache.put(key, result)
+        return copy.deepcopy(result)
 
-    def detect_from_frame(self, frame_path):
-        result = detect.analyze_ingredients(frame_path)
-        # print("REsult", result)
-        return result
+    def _detect_live(self, camera_id, signature, analyze):
+        """Reuse the camera's last result if the frame has not changed, else run ``analyze``"""
+        result = live_frame_filter.reuse(camera_id, signature)
+        if result is not None:
+            return copy.deepcopy(result), True
+
+        result = analyze()
+        if result is not None:
+            live_frame_filter.record(camera_id, signature, copy.deepcopy(result))
+        return result, False
+
+    def detect_from_image(self, image_path, digest=None):
+        """
+        Detect ingredients in an image. An image already analyzed with the
+        same models returns the stored result without running inference.
+
+        Args:
+            image_path: Path to the image
+            digest: SHA-256 of the image if already known (e.g. from the upload)
+        """
+        return self._detect_cached(digest or file_digest(image_path),
+                                   lambda: detect.analyze_ingredients(image_path))
+
+    def detect_from_frame(self, frame_path, camera_id="default"):
+        """
+        Detect ingredients in a live camera frame. When the frame matches the
+        camera's last analyzed frame, that frame's result is reused instead
+        of running the models. Live frames bypass the detection cache: they
+        are almost never byte-identical, so storing them would only evict
+        uploaded images.
+
+        Returns:
+            Tuple of (result, whether it was reused)
+        """
+        return self._detect_live(camera_id, frame_signature(frame_path),
+                                 lambda: detect.analyze_ingredients(frame_path))
+
+    def detect_from_bytes(self, data, camera_id="default"):
+        """
+        Same as ``detect_from_frame`` for an encoded frame held in memory,
+        as received from a live stream
+
+        Returns:
+            Tuple of (result, whether it was reused)
+        """
+        try:
+            signature = frame_signature(io.BytesIO(data))
+        except (OSError, SyntaxError) as e:
+            # PIL raises UnidentifiedImageError (an OSError) for bytes that are not an image
+            raise ValueError("Could not decode frame") from e
+        return self._detect_live(camera_id, signature, lambda: detect.analyze_encoded(data))
 
-    def detect_from_video(self, video_path):
-        result = detect.analyze_ingredients(video_path)
-        # print("REsult", result)
+    def detect_from_video(self, video_path, mode=VIDEO_SAMPLING_MODE, stride=VIDEO_FRAME_STRIDE):
+        # Streams frames from disk, so large videos never sit in memory
+        result = video_analysis.analyze_video(video_path, mode=mode, stride=stride)
         return result
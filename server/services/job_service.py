@@ -0,0 +1,230 @@
+import os
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config.constant import logger, JOB_FOLDER, JOB_RESULT_TTL, JOB_PRUNE_INTERVAL
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Identifies the process that queued a job, so jobs orphaned by a restart can be told apart
+PROCESS_STARTED_AT = time.time()
+
+
+class QueueFullError(Exception):
+    """Raised when a job type already has as many jobs in flight as it accepts"""
+
+
+class JobStore:
+    """
+    Keeps job records on local disk so any worker process on this host can
+    answer status and result requests, not only the one running the job.
+    """
+
+    def __init__(self, folder=JOB_FOLDER):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.fail_orphaned()
+
+    def _path(self, job_id):
+        return os.path.join(self.folder, f"{job_id}.pkl")
+
+    def save(self, job):
+        # Write to a temp file first so readers never see a partial record
+        path = self._path(job["id"])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(job, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, job_id):
+        try:
+            with open(self._path(job_id), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def fail_orphaned(self):
+        """Mark jobs left queued or running by a process that no longer exists as failed"""
+        for name in os.listdir(self.folder):
+            if not name.endswith(".pkl"):
+                continue
+            job = self.load(name[:-4])
+            if job is None or job["status"] not in (QUEUED, RUNNING) or owner_alive(job):
+                continue
+            logger.warning(f"Job {job['id']} ({job['type']}) was interrupted by a server restart")
+            job["status"] = FAILED
+            job["error"] = "Interrupted by a server restart"
+            job["finished_at"] = time.time()
+            try:
+                self.save(job)
+            except OSError as e:
+                logger.error(f"Could not update interrupted job {job['id']}: {str(e)}")
+
+    def prune(self, ttl=JOB_RESULT_TTL):
+        """Delete finished jobs older than ``ttl`` seconds"""
+        cutoff = time.time() - ttl
+        for name in os.listdir(self.folder):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    job = self.load(name[:-4])
+                    if job is None or job["status"] in (SUCCEEDED, FAILED):
+                        os.remove(path)
+            except OSError:
+                pass
+
+
+class JobManager:
+    """
+    Runs registered job types on dedicated worker pools, off the Flask
+    request threads. Every job type has its own concurrency limit and a
+    bounded number of queued jobs; submitting past that raises QueueFullError.
+    """
+
+    def __init__(self, store=None, prune_interval=JOB_PRUNE_INTERVAL):
+        self.store = store or JobStore()
+        self.prune_interval = prune_interval
+        self._types = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0
+
+    def register(self, job_type, func, max_concurrency=1, max_queued=8):
+        """Register ``func`` as the worker for ``job_type``"""
+        self._types[job_type] = {
+            "func": func,
+            "max_concurrency": max_concurrency,
+            "max_queued": max_queued,
+            "executor": ThreadPoolExecutor(max_workers=max_concurrency,
+                                           thread_name_prefix=f"job-{job_type}"),
+            "in_flight": 0,
+        }
+
+    def submit(self, job_type, **params):
+        """Queue a job and return its record; raises QueueFullError when full"""
+        if job_type not in self._types:
+            raise KeyError(f"Unknown job type: {job_type}")
+        job_spec = self._types[job_type]
+
+        with self._lock:
+            capacity = job_spec["max_concurrency"] + job_spec["max_queued"]
+            if job_spec["in_flight"] >= capacity:
+                raise QueueFullError(f"Too many {job_type} jobs in progress, try again later")
+            job_spec["in_flight"] += 1
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "status": QUEUED,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "result": None,
+            "owner": {"pid": os.getpid(), "started_at": PROCESS_STARTED_AT},
+        }
+        try:
+            self.store.save(job)
+            job_spec["executor"].submit(self._run, job, job_spec, params)
+        except Exception:
+            with self._lock:
+                job_spec["in_flight"] -= 1
+            raise
+
+        self._maybe_prune()
+        return job
+
+    def _maybe_prune(self):
+        """Sweep old jobs at most once per ``prune_interval``, off the request thread"""
+        with self._lock:
+            now = time.time()
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+        threading.Thread(target=self.store.prune, name="job-prune", daemon=True).start()
+
+    def get(self, job_id):
+        return self.store.load(job_id)
+
+    def stats(self):
+        """Jobs in flight per type in this process"""
+        return {
+            job_type: {
+                "in_flight": spec["in_flight"],
+                "max_concurrency": spec["max_concurrency"],
+                "max_queued": spec["max_queued"],
+            }
+            for job_type, spec in self._types.items()
+        }
+
+    def _run(self, job, job_spec, params):
+        try:
+            job["status"] = RUNNING
+            job["started_at"] = time.time()
+            self.store.save(job)
+
+            job["result"] = job_spec["func"](**params)
+            job["status"] = SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['type']}) failed: {str(e)}")
+            job["status"] = FAILED
+            job["error"] = str(e)
+        finally:
+            try:
+                job["finished_at"] = time.time()
+                self._save_final(job)
+            finally:
+                with self._lock:
+                    job_spec["in_flight"] -= 1
+
+    def _save_final(self, job):
+        """Store a finished job; if that fails (e.g. unpicklable result, full disk), store it as failed"""
+        try:
+            self.store.save(job)
+            return
+        except Exception as e:
+            logger.error(f"Could not save job {job['id']} ({job['type']}): {str(e)}")
+            job["status"] = FAILED
+            job["error"] = f"Could not save job result: {str(e)}"
+            job["result"] = None
+        try:
+            self.store.save(job)
+        except Exception as e:
+            logger.error(f"Could not save failed job {job['id']}: {str(e)}")
+
+
+def owner_alive(job):
+    """Whether the process that queued ``job`` is still running"""
+    owner = job.get("owner")
+    if not owner:
+        return False
+    if owner["pid"] == os.getpid():
+        return owner["started_at"] == PROCESS_STARTED_AT
+    try:
+        os.kill(owner["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+def job_summary(job):
+    """Public view of a job record, without its result payload"""
+    return {key: value for key, value in job.items() if key not in ("result", "owner")}
+
+
+job_manager = JobManager()
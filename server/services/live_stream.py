@@ -0,0 +1,127 @@
+"""
+WebSocket ingestion of live camera frames (ws://<host>/ws/live?camera_id=<id>).
+
+The client sends each encoded frame (JPEG/PNG) as one binary message. Frames
+are decoded in memory and analyzed one at a time; while an analysis runs only
+the newest frame is kept, so older frames are dropped and latency stays
+bounded by one analysis. After each analysis the server sends a JSON message
+with what changed in the camera's inventory since the previous one.
+"""
+import asyncio
+import time
+from urllib.parse import parse_qs
+from config.constant import logger, LIVE_STREAM_MAX_FRAME_BYTES, LIVE_STREAM_MIN_INTERVAL
+from services.ingredient_detector import IngredientDetector
+from utils.json_provider import dumps_bytes
+
+detector = IngredientDetector()
+
+
+def inventory_counts(result):
+    """Per-ingredient Fresh/Spoiled/Unknown counts of a detection result"""
+    return dict((result or {}).get("summary") or {})
+
+
+def inventory_delta(previous, current):
+    """What changed between two inventories; empty dicts/lists when nothing did"""
+    return {
+        "added": {name: counts for name, counts in current.items() if name not in previous},
+        "removed": [name for name in previous if name not in current],
+        "changed": {name: counts for name, counts in current.items()
+                    if name in previous and previous[name] != counts},
+    }
+
+
+class LiveStreamSession:
+    """State of one WebSocket connection: the waiting frame and the last inventory"""
+
+    def __init__(self, camera_id, send):
+        self.camera_id = camera_id
+        self.send = send
+        self.inventory = None
+        self.received = 0
+        self.analyzed = 0
+        self.dropped = 0
+        self._pending = None
+        self._frame_ready = asyncio.Event()
+
+    def offer(self, data):
+        """Queue a frame for analysis, replacing any frame still waiting"""
+        self.received += 1
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (self.received, data, time.perf_counter())
+        self._frame_ready.set()
+
+    async def send_json(self, message):
+        await self.send({"type": "websocket.send", "text": dumps_bytes(message).decode()})
+
+    async def process(self):
+        """Analyze the newest frame whenever one is waiting, until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._frame_ready.wait()
+            self._frame_ready.clear()
+            frame_number, data, received_at = self._pending
+            self._pending = None
+            started = time.perf_counter()
+
+            try:
+                # Inference runs on a worker thread so the connection keeps reading frames
+                result, unchanged = await loop.run_in_executor(
+                    None, detector.detect_from_bytes, data, self.camera_id)
+            except Exception as e:
+                logger.error(f"Error analyzing live frame from {self.camera_id}: {e}")
+                await self.send_json({"type": "error", "frame": frame_number, "message": str(e)})
+                continue
+
+            self.analyzed += 1
+            counts = inventory_counts(result)
+            message = {
+                "frame": frame_number,
+                "unchanged": unchanged,
+                "latency_ms": round((time.perf_counter() - received_at) * 1000, 1),
+                "dropped": self.dropped,
+            }
+            if self.inventory is None:
+                await self.send_json({"type": "snapshot", "inventory": counts, **message})
+            else:
+                delta = inventory_delta(self.inventory, counts)
+                if any(delta.values()):
+                    await self.send_json({"type": "delta", **delta, **message})
+            self.inventory = counts
+
+            # Cap the analysis rate per connection; frames arriving meanwhile replace each other
+            await asyncio.sleep(max(0.0, LIVE_STREAM_MIN_INTERVAL - (time.perf_counter() - started)))
+
+
+async def live_stream_endpoint(scope, receive, send):
+    """ASGI handler for the live stream WebSocket"""
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode())
+    camera_id = (query.get("camera_id") or ["default"])[0]
+    await send({"type": "websocket.accept"})
+    logger.info(f"Live stream connected: {camera_id}")
+
+    session = LiveStreamSession(camera_id, send)
+    worker = asyncio.create_task(session.process())
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            if data is None:
+                # Text messages are not frames
+                continue
+            if len(data) > LIVE_STREAM_MAX_FRAME_BYTES:
+                await send({"type": "websocket.close", "code": 1009})
+                break
+            session.offer(data)
+    finally:
+        worker.cancel()
+        logger.info(f"Live stream closed: {camera_id} ({session.received} frames, "
+                    f"{session.analyzed} analyzed, {session.dropped} dropped)")
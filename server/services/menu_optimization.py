@@ -1,21 +1,5 @@
-import google.generativeai as genai
-import os
 import json
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Configure Gemini API
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
-
-# Initialize the correct model
-try:
-    model = genai.GenerativeModel(model_name="gemini-2.0-flash")  # Ensure this model exists
-except Exception as e:
-    print(f"Error initializing model: {e}")
-    exit()
+from services.gemini_client import gemini_client
 
 def get_surplus_ingredients():
     return [
@@ -42,16 +26,7 @@ def get_current_menu():
 
 def generate_ai_response(prompt):
     try:
-        response = model.generate_content(prompt)  # Correct API call
-        content = response.text.strip()
-
-        # Ensure JSON response is well-formatted
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.endswith('```'):
-            content = content[:-3]
-
-        return json.loads(content)  # Convert to JSON
+        return gemini_client.generate_json(prompt)  # Parsed JSON reply
     except Exception as e:
         print(f"Error in generate_ai_response: {str(e)}")
         return {"error": str(e)}
@@ -103,9 +78,15 @@ def optimize_menu():
             ]
         }}"""
 
-        daily_specials = generate_ai_response(daily_specials_prompt)
-        cost_optimizations = generate_ai_response(cost_optimization_prompt)
-        new_dishes = generate_ai_response(new_dishes_prompt)
+        # The three prompts are independent, so send them concurrently
+        responses = gemini_client.generate_many({
+            "daily_specials": daily_specials_prompt,
+            "cost_optimizations": cost_optimization_prompt,
+            "new_dishes": new_dishes_prompt,
+        })
+        daily_specials = responses["daily_specials"]
+        cost_optimizations = responses["cost_optimizations"]
+        new_dishes = responses["new_dishes"]
 
         result = {
             "daily_specials": daily_specials.get("daily_specials", []),
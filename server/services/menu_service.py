@@ -4,6 +4,51 @@ from bson.objectid import ObjectId
 from datetime import datetime
 from config.constant import logger
 from services.get_dummydata import get_dummy_ingredients
+from utils.pagination import parse_page_args, fetch_page
+
+# Fields a client can request with ?fields=
+MENU_FIELDS = ("name", "description", "dishes", "created_at", "updated_at")
+
+# Dish fields included in menu responses
+DISH_SUMMARY_PROJECTION = {"name": 1, "photo": 1, "price": 1, "ingredients": 1}
+
+
+def to_object_ids(ids):
+    """Convert dish ids to ObjectIds, skipping ids that are not valid"""
+    object_ids = []
+    for id in ids:
+        try:
+            object_ids.append(ObjectId(id))
+        except Exception:
+            logger.warning(f"Skipping invalid dish id: {id}")
+    return object_ids
+
+
+def fetch_dish_summaries(db, dish_ids):
+    """
+    Fetch the summary fields of many dishes in one query
+
+    Returns:
+        Dict mapping the dish id (as a string) to its summary
+    """
+    object_ids = list(dict.fromkeys(to_object_ids(dish_ids)))
+    if not object_ids:
+        return {}
+
+    dishes = db.dishes.find({"_id": {"$in": object_ids}}, DISH_SUMMARY_PROJECTION)
+    return {str(dish["_id"]): {
+        "_id": dish["_id"],
+        "name": dish.get("name"),
+        "photo": dish.get("photo"),
+        "price": dish.get("price"),
+        "ingredients": dish.get("ingredients")
+    } for dish in dishes}
+
+
+def attach_dishes(menu, dish_summaries):
+    """Replace a menu's dish ids with dish summaries, in menu order"""
+    dish_ids = dict.fromkeys(str(id) for id in menu["dishes"] or [])
+    menu["dishes"] = [dish_summaries[id] for id in dish_ids if id in dish_summaries]
 
 def create_menu(db):
     try:
@@ -35,30 +80,37 @@ def create_menu(db):
     
 
 def get_all_menus(db):
+    """
+    Get one page of menus with their dishes. Accepts the same limit, cursor,
+    sort and fields parameters as GET /dishes.
+    """
     try:
-        menus = list(db.menus.find())
+        try:
+            page = parse_page_args(request.args, MENU_FIELDS)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+
+        menus, next_cursor = fetch_page(db.menus, page)
+
+        # Fetch the dishes of every menu in a single query
+        all_dish_ids = [id for menu in menus for id in menu.get("dishes") or []]
+        dish_summaries = fetch_dish_summaries(db, all_dish_ids)
         
-        # Convert ObjectId to string and format timestamps
         for menu in menus:
-            menu["_id"] = str(menu["_id"])
-            menu["created_at"] = menu["created_at"].isoformat() if "created_at" in menu else None
-            menu["updated_at"] = menu["updated_at"].isoformat() if "updated_at" in menu else None
+            # Requested timestamps are always present, null if never set
+            for field in ("created_at", "updated_at"):
+                if page["projection"] is None or field in page["projection"]:
+                    menu.setdefault(field, None)
             
-            # Fetch dish details for each menu
+            # Join dish details in memory
             if "dishes" in menu:
-                dish_ids = menu["dishes"]
-                dishes = list(db.dishes.find({"_id": {"$in": [ObjectId(id) for id in dish_ids]}}))
-                menu["dishes"] = [{
-                    "_id": str(dish["_id"]),
-                    "name": dish["name"],
-                    "photo": dish["photo"],
-                    "price": dish["price"],
-                    "ingredients": dish["ingredients"]
-                } for dish in dishes]
+                attach_dishes(menu, dish_summaries)
         
         return jsonify({
             "success": True,
-            "menus": menus
+            "menus": menus,
+            "next_cursor": next_cursor,
+            "limit": page["limit"]
         })
     except Exception as e:
         logger.error(f"Error fetching menus: {str(e)}")
@@ -79,21 +131,12 @@ def get_menu(db, menu_id):
                 "message": "Menu not found"
             }), 404
             
-        menu["_id"] = str(menu["_id"])
-        menu["created_at"] = menu["created_at"].isoformat() if "created_at" in menu else None
-        menu["updated_at"] = menu["updated_at"].isoformat() if "updated_at" in menu else None
+        menu.setdefault("created_at", None)
+        menu.setdefault("updated_at", None)
         
         # Fetch dish details
         if "dishes" in menu:
-            dish_ids = menu["dishes"]
-            dishes = list(db.dishes.find({"_id": {"$in": [ObjectId(id) for id in dish_ids]}}))
-            menu["dishes"] = [{
-                "_id": str(dish["_id"]),
-                "name": dish["name"],
-                "photo": dish["photo"],
-                "price": dish["price"],
-                "ingredients": dish["ingredients"]
-            } for dish in dishes]
+            attach_dishes(menu, fetch_dish_summaries(db, menu["dishes"] or []))
         
         return jsonify({
             "success": True,
@@ -0,0 +1,28 @@
+import os
+import sys
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tests import modules the way the app does, from the server folder
+sys.path.insert(0, SERVER_DIR)
+sys.path.insert(0, os.path.join(SERVER_DIR, "scripts"))
+# Keep the dish cache in memory so tests never touch storage/
+os.environ.setdefault("DISH_CACHE_PERSIST", "false")
+
+from gemini_stub_server import start_stub_server  # noqa: E402
+
+
+@pytest.fixture
+def gemini_stub():
+    """Start a Gemini stub on a free port; returns a function taking the stub options"""
+    servers = []
+
+    def start(**options):
+        server = start_stub_server(port=0, **options)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,81 @@
+import time
+from services.gemini_client import GeminiClient
+
+
+def make_client(base_url, **options):
+    return GeminiClient(api_key="test", model_name="stub-model", base_url=base_url, **options)
+
+
+def test_generate_many_runs_prompts_concurrently(gemini_stub):
+    client = make_client(gemini_stub(delay=0.5), max_concurrency=4)
+    prompts = {
+        "daily_specials": "Suggest a daily special",
+        "cost_optimizations": "List cost optimizations",
+        "new_dishes": "Invent new dishes",
+        "dishes": "Some creative dishes",
+    }
+
+    started = time.perf_counter()
+    results = client.generate_many(prompts)
+    elapsed = time.perf_counter() - started
+
+    # Four 0.5s calls sent together finish in about the time of one
+    assert elapsed < 1.0
+    assert set(results) == set(prompts)
+    assert results["daily_specials"]["daily_specials"][0]["name"] == "Basil Chicken Melt"
+    assert results["cost_optimizations"]["cost_optimizations"][0]["potential_savings"] == 1.5
+    assert results["new_dishes"]["new_dishes"][0]["name"] == "Pesto Penne"
+    assert len(results["dishes"]["dishes"]) == 3
+
+
+def test_generate_many_respects_max_concurrency(gemini_stub):
+    client = make_client(gemini_stub(delay=0.3), max_concurrency=2)
+
+    started = time.perf_counter()
+    results = client.generate_many({f"prompt_{i}": "Invent new dishes" for i in range(4)})
+    elapsed = time.perf_counter() - started
+
+    # Two at a time: two rounds of 0.3s
+    assert 0.6 <= elapsed < 1.2
+    assert all("new_dishes" in reply for reply in results.values())
+
+
+def test_per_call_timeout_only_fails_the_slow_call(gemini_stub):
+    client = make_client(gemini_stub(delay=0.1), max_concurrency=4)
+
+    started = time.perf_counter()
+    results = client.generate_many({
+        "slow": "Invent new dishes stub-delay=3",
+        "fast": "Invent new dishes",
+    }, timeout=0.5)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.5
+    assert results["slow"] == {"error": "TimeoutError"}
+    assert results["fast"]["new_dishes"][0]["name"] == "Pesto Penne"
+
+
+def test_failures_are_isolated_per_name(gemini_stub):
+    client = make_client(gemini_stub(delay=0.1))
+
+    results = client.generate_many({
+        "server_error": "Suggest a daily special stub-status=500",
+        "not_json": "Suggest a daily special stub-reply=invalid",
+        "ok": "Suggest a daily special",
+    })
+
+    assert "500" in results["server_error"]["error"]
+    assert "error" in results["not_json"]
+    assert results["ok"]["daily_specials"][1]["name"] == "Caprese Bake"
+
+
+def test_generate_json_raises_on_failure(gemini_stub):
+    client = make_client(gemini_stub(delay=0))
+
+    assert client.generate_json("List cost optimizations")["cost_optimizations"][0]["item"] == "Chicken Alfredo"
+    try:
+        client.generate_json("List cost optimizations stub-status=503")
+    except Exception as e:
+        assert "503" in str(e)
+    else:
+        raise AssertionError("expected the 503 to raise")
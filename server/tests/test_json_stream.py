@@ -0,0 +1,98 @@
+import json
+import time
+import pytest
+from services import ai_dish_service
+from services.gemini_client import GeminiClient
+from utils.json_stream import JSONArrayStreamParser
+from utils.response_cache import ResponseCache
+from gemini_stub_server import CANNED_REPLIES
+
+DISHES = CANNED_REPLIES["creative dishes"]["dishes"]
+TRICKY_ITEMS = [
+    {"name": 'He said "]" and left', "note": "[not] {an} \"end\" ]}"},
+    {"path": "C:\\dishes\\", "steps": ["a", ["nested", {"deep": "]"}]]},
+    {"empty": "", "quote": "\\\"", "unicode": "caf\u00e9 \u2014 \u00bd"},
+]
+
+
+def feed_in_pieces(parser, text, size):
+    completed = []
+    for start in range(0, len(text), size):
+        for item in parser.feed(text[start:start + size]):
+            completed.append((start + size, item))
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_items_survive_every_chunk_boundary(size):
+    text = '```json\n{"note": "[dishes] below", "dishes": ' + json.dumps(TRICKY_ITEMS, indent=2) + "}\n```"
+
+    completed = feed_in_pieces(JSONArrayStreamParser("dishes"), text, size)
+
+    assert [item for _, item in completed] == TRICKY_ITEMS
+    # Each item is released by the chunk that closes it, not at the end
+    positions = [position for position, _ in completed]
+    assert positions == sorted(positions)
+    assert positions[0] < len(text) - len(json.dumps(TRICKY_ITEMS[1:]))
+
+
+def test_key_inside_a_string_is_not_the_array():
+    text = '{"intro": "the \\"dishes\\": [fake] list", "dishes": [{"name": "Real"}]}'
+    for size in (1, 5):
+        assert [item for _, item in feed_in_pieces(JSONArrayStreamParser("dishes"), text, size)] \
+            == [{"name": "Real"}]
+
+
+def test_stops_at_end_of_array():
+    parser = JSONArrayStreamParser("dishes")
+    assert parser.feed('{"dishes": [{"a": 1}], "more": [{"b": 2}]}') == [{"a": 1}]
+    assert parser.feed('{"c": 3}') == []
+
+
+def test_astream_text_yields_dishes_as_they_complete(gemini_stub):
+    client = GeminiClient(api_key="test", model_name="stub-model",
+                          base_url=gemini_stub(delay=0, chunk_size=16, chunk_delay=0.005))
+    parser = JSONArrayStreamParser("dishes")
+
+    chunks = 0
+    completed_at = []
+    dishes = []
+    for text in client.stream_text("Create 3 creative dishes"):
+        chunks += 1
+        for dish in parser.feed(text):
+            completed_at.append(chunks)
+            dishes.append(dish)
+
+    assert dishes == DISHES
+    # Each dish is released by its own closing chunk; only the last one
+    # may share the final chunk with the end of the reply
+    assert completed_at[0] < completed_at[1] < completed_at[2] <= chunks
+    assert completed_at[1] < chunks
+
+
+def test_stream_dishes_emits_each_dish_before_the_stream_ends(gemini_stub, monkeypatch):
+    client = GeminiClient(api_key="test", model_name="stub-model",
+                          base_url=gemini_stub(delay=0, chunk_size=16, chunk_delay=0.02))
+    cache = ResponseCache("test_dishes")
+    monkeypatch.setattr(ai_dish_service, "gemini_client", client)
+    monkeypatch.setattr(ai_dish_service, "dish_cache", cache)
+
+    started = time.perf_counter()
+    arrivals = []
+    names = []
+    for dish in ai_dish_service.stream_dishes("custom", [], "salad", "Create 3 creative dishes"):
+        arrivals.append(time.perf_counter() - started)
+        names.append(dish["name"])
+    finished = time.perf_counter() - started
+
+    assert names == [dish["name"] for dish in DISHES]
+    # Dishes trickle out with the chunks instead of arriving together at the end
+    assert arrivals[0] < finished / 2
+    assert arrivals[1] - arrivals[0] > 0.1
+    assert arrivals[2] - arrivals[1] > 0.1
+
+    # The completed stream is cached and replayed without the stub
+    monkeypatch.setattr(ai_dish_service, "gemini_client", None)
+    replayed = list(ai_dish_service.stream_dishes("custom", [], "salad", "Create 3 creative dishes"))
+    assert [dish["name"] for dish in replayed] == names
+    assert replayed[2]["description"] == DISHES[2]["description"]
@@ -0,0 +1,25 @@
+import hmac
+from functools import wraps
+from flask import jsonify, request
+from config.constant import logger, ADMIN_TOKEN
+
+
+def request_token():
+    """Token sent as "Authorization: Bearer <token>" or in the X-Admin-Token header"""
+    auth = request.headers.get("Authorization", "")
+    if auth.lower().startswith("bearer "):
+        return auth[7:].strip()
+    return request.headers.get("X-Admin-Token", "")
+
+
+def require_admin_token(view):
+    """Allow a view only for requests carrying ADMIN_TOKEN; without ADMIN_TOKEN set it is disabled"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "Admin endpoints are disabled, set ADMIN_TOKEN to enable them"}), 403
+        if not hmac.compare_digest(request_token().encode(), ADMIN_TOKEN.encode()):
+            logger.warning(f"Rejected admin request to {request.path} from {request.remote_addr}")
+            return jsonify({"error": "Invalid or missing admin token"}), 401
+        return view(*args, **kwargs)
+    return wrapper
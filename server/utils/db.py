@@ -1,29 +1,154 @@
 # filepath: /Users/jaivik/Downloads/mit-main/server/utils/db.py
-from pymongo import MongoClient
-from config.constant import logger, MONGO_URI
+import os
+import threading
+from pymongo import MongoClient, monitoring
+from config.constant import (logger, MONGO_URI, MONGO_DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+                             MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_COMPRESSORS)
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events so pool pressure shows up in /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                "pools": 0,
+                "connections_created": 0,
+                "connections_closed": 0,
+                "checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "pool_clears": 0,
+            }
+
+    def _add(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def pool_created(self, event):
+        self._add("pools")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add("pool_clears")
+
+    def pool_closed(self, event):
+        self._add("pools", -1)
+
+    def connection_created(self, event):
+        self._add("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._add("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._add("checkouts")
+        self._add("checked_out")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters["open_connections"] = counters["connections_created"] - counters["connections_closed"]
+        return counters
+
+
+pool_listener = PoolStatsListener()
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the MongoClient shared by this process, creating it on first use.
+
+    MongoClient is not fork-safe, so a process forked by a pre-fork server
+    (e.g. gunicorn) gets its own client instead of the one it inherited.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            if _client is not None:
+                # Counters inherited from the parent describe its pool, not ours
+                pool_listener.reset()
+            _client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                compressors=MONGO_COMPRESSORS or None,
+                event_listeners=[pool_listener],
+            )
+            _client_pid = pid
+            logger.info(f"MongoDB client created in process {pid}")
+        return _client
+
 
 def get_database_connection():
     """
-    Creates a connection to the MongoDB database
-    
+    Returns the application database, connecting lazily on first call
+
     Returns:
         database: MongoDB database connection
     """
-    try:
-        # Connect to MongoDB
-        client = MongoClient(MONGO_URI)
-        
-        # Return database connection
-        db = client.menu_optimization
-        logger.info("Successfully connected to MongoDB")
-        return db
-    
-    except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
-        return None
-    
-db = get_database_connection()
-if db is None:
-    logger.error("Failed to connect to the database.")
-else:
-    logger.info("Database connection established successfully.")
\ No newline at end of file
+    return get_client()[MONGO_DB_NAME]
+
+
+def close_client():
+    """Close this process's client, e.g. on shutdown"""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def pool_stats():
+    """Pool settings and connection counters for this process"""
+    return {
+        "connected": _client is not None and _client_pid == os.getpid(),
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+        "server_selection_timeout_ms": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "compressors": MONGO_COMPRESSORS,
+        **pool_listener.stats(),
+    }
+
+
+class LazyDatabase:
+    """
+    Stand-in for the Database object that connects on first use, so
+    ``from utils.db import db`` stays cheap and works across forks.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_database_connection(), name)
+
+    def __getitem__(self, name):
+        return get_database_connection()[name]
+
+
+db = LazyDatabase()
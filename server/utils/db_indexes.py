@@ -0,0 +1,147 @@
+"""
+Indexes the API relies on, and query plan checks for its hot queries.
+
+Usage (from the server folder):
+    python -m utils.db_indexes --ensure     # create missing indexes
+    python -m utils.db_indexes --explain    # report the plan of every hot query
+"""
+import argparse
+import json
+import threading
+from datetime import datetime
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, IndexModel
+from config.constant import logger
+
+# Indexes every collection needs, beyond the default one on _id
+REQUIRED_INDEXES = {
+    "dishes": [
+        # Lookups by dish name
+        IndexModel([("name", ASCENDING)], name="name_1"),
+        # Keyset pagination ordered by updated_at (ties broken by _id)
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_1__id_1"),
+    ],
+    "menus": [
+        IndexModel([("name", ASCENDING)], name="name_1"),
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_1__id_1"),
+        # Multikey index to find the menus that contain a dish
+        IndexModel([("dishes", ASCENDING)], name="dishes_1"),
+    ],
+}
+
+
+def ensure_indexes(db):
+    """
+    Create the required indexes. Safe to run on every start: indexes that
+    already exist with the same definition are left untouched.
+
+    Returns:
+        Dict mapping each collection to the names of its required indexes
+    """
+    created = {}
+    for collection, indexes in REQUIRED_INDEXES.items():
+        created[collection] = db[collection].create_indexes(indexes)
+        logger.info(f"Indexes ready on {collection}: {', '.join(created[collection])}")
+    return created
+
+
+def ensure_indexes_in_background(db):
+    """Create the indexes without holding up app start if MongoDB is slow or down"""
+    def run():
+        try:
+            ensure_indexes(db)
+        except Exception as e:
+            logger.error(f"Error creating indexes: {e}")
+
+    thread = threading.Thread(target=run, name="ensure-indexes", daemon=True)
+    thread.start()
+    return thread
+
+
+def hot_queries():
+    """
+    The queries the API runs most, as (name, collection, filter, sort).
+    Values are placeholders; only the shape matters for the plan.
+    """
+    some_id = ObjectId()
+    now = datetime.now()
+    return [
+        ("dish by name", "dishes", {"name": "Margherita Pizza"}, None),
+        ("dish page by _id", "dishes", {"_id": {"$gt": some_id}}, [("_id", ASCENDING)]),
+        ("dish page by updated_at", "dishes",
+         {"$or": [{"updated_at": {"$gt": now}}, {"updated_at": now, "_id": {"$gt": some_id}}]},
+         [("updated_at", ASCENDING), ("_id", ASCENDING)]),
+        ("dishes of menus", "dishes", {"_id": {"$in": [some_id, ObjectId()]}}, None),
+        ("menu by name", "menus", {"name": "Lunch"}, None),
+        ("menu page by updated_at", "menus", {}, [("updated_at", ASCENDING), ("_id", ASCENDING)]),
+        ("menus containing dish", "menus", {"dishes": str(some_id)}, None),
+    ]
+
+
+def plan_stages(plan):
+    """Flatten a winning plan into the list of its stages and index names"""
+    stages = []
+    indexes = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "indexName" in node:
+            indexes.append(node["indexName"])
+        for key in ("inputStage", "queryPlan"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages, indexes
+
+
+def explain_queries(db):
+    """
+    Run explain() on every hot query and flag the ones that scan a whole
+    collection.
+
+    Returns:
+        List of {query, collection, stages, indexes, collscan}
+    """
+    report = []
+    for name, collection, filter, sort in hot_queries():
+        cursor = db[collection].find(filter).limit(50)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages, indexes = plan_stages(plan)
+        collscan = "COLLSCAN" in stages
+        if collscan:
+            logger.warning(f"Query '{name}' on {collection} does a collection scan")
+        report.append({
+            "query": name,
+            "collection": collection,
+            "stages": stages,
+            "indexes": indexes,
+            "collscan": collscan,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes")
+    parser.add_argument("--ensure", action="store_true", help="Create missing indexes")
+    parser.add_argument("--explain", action="store_true", help="Report the plan of every hot query")
+    args = parser.parse_args()
+
+    from utils.db import db
+
+    if args.ensure:
+        print(json.dumps(ensure_indexes(db), indent=2))
+    if args.explain or not args.ensure:
+        report = explain_queries(db)
+        print(json.dumps(report, indent=2))
+        if any(entry["collscan"] for entry in report):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
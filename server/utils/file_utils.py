@@ -1,12 +1,14 @@
 import os
-import datetime
 from werkzeug.utils import secure_filename
 from config.constant import logger, VIDEO_FOLDER, LIVE_FOLDER, IMAGE_FOLDER
+from utils.upload_stream import save_upload, content_digest
 
 
 def save_uploaded_file(file, folder_type="live"):
     """
-    Saves an uploaded file to the appropriate directory.
+    Saves an uploaded file to the appropriate directory. Files are named by
+    their SHA-256, so uploads never overwrite each other and an identical
+    upload reuses the file already stored.
 
     Args:
         file: The uploaded file from request.files
@@ -18,11 +20,10 @@ def save_uploaded_file(file, folder_type="live"):
     if not file or file.filename == '':
         raise ValueError("No file provided or empty filename")
 
-    # Create a secure filename with timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    # Name the file by its content hash
     base_filename = secure_filename(file.filename)
-    extension = os.path.splitext(base_filename)[1]
-    filename = f"{timestamp}_{folder_type}{extension}"
+    extension = os.path.splitext(base_filename)[1].lower()
+    filename = f"{content_digest(file)}{extension}"
 
     # Determine the appropriate folder
     if folder_type == "live":
@@ -39,8 +40,13 @@ def save_uploaded_file(file, folder_type="live"):
 
     filepath = os.path.join(folder, filename)
 
-    # Save the file
-    file.save(filepath)
-    logger.info(f"File saved: {filepath}")
+    if os.path.exists(filepath):
+        # Same content already stored; closing the upload drops its spooled copy
+        file.close()
+        logger.info(f"Duplicate upload, reusing: {filepath}")
+    else:
+        # Move the spooled upload into place
+        save_upload(file, filepath)
+        logger.info(f"File saved: {filepath}")
 
     return filename, filepath
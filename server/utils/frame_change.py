@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+from config.constant import (LIVE_FRAME_SIGNATURE_SIZE, LIVE_FRAME_PIXEL_DELTA, LIVE_FRAME_CHANGE_FRACTION,
+                             LIVE_FRAME_MAX_REUSE_SECONDS, LIVE_FRAME_MAX_CAMERAS)
+
+
+def frame_signature(image, size=LIVE_FRAME_SIGNATURE_SIZE):
+    """
+    Tiny grayscale thumbnail of a frame used to tell whether it changed.
+    JPEGs are decoded at reduced scale, so this costs a fraction of a full decode.
+
+    Args:
+        image: Path or file object of the encoded frame
+    """
+    with Image.open(image) as img:
+        img.draft("L", (size * 2, size * 2))
+        thumbnail = img.convert("L").resize((size, size), Image.BOX)
+        return np.asarray(thumbnail, dtype=np.float32)
+
+
+def changed_fraction(previous, current):
+    """
+    Share of thumbnail cells that changed by more than LIVE_FRAME_PIXEL_DELTA,
+    after removing a global brightness shift (camera exposure, lights)
+    """
+    diff = np.abs((current - current.mean()) - (previous - previous.mean()))
+    return float(np.mean(diff > LIVE_FRAME_PIXEL_DELTA))
+
+
+class FrameChangeFilter:
+    """
+    Remembers the last analyzed frame of every camera so a new frame that
+    looks the same can reuse that frame's detection instead of running the
+    models again. A result is reused for at most ``max_reuse_seconds``.
+    """
+
+    def __init__(self, change_fraction=LIVE_FRAME_CHANGE_FRACTION, max_reuse_seconds=LIVE_FRAME_MAX_REUSE_SECONDS,
+                 max_cameras=LIVE_FRAME_MAX_CAMERAS):
+        self.change_fraction = change_fraction
+        self.max_reuse_seconds = max_reuse_seconds
+        self.max_cameras = max_cameras
+        self._cameras = OrderedDict()
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.skipped = 0
+
+    def reuse(self, camera_id, signature):
+        """Return the previous result if the frame has not changed, else None"""
+        with self._lock:
+            self.frames += 1
+            entry = self._cameras.get(camera_id)
+            if entry is None:
+                return None
+            self._cameras.move_to_end(camera_id)
+            previous, result, analyzed_at = entry
+            if time.time() - analyzed_at > self.max_reuse_seconds:
+                return None
+            if previous.shape != signature.shape or changed_fraction(previous, signature) > self.change_fraction:
+                return None
+            self.skipped += 1
+            return result
+
+    def record(self, camera_id, signature, result):
+        """Store the frame just analyzed as the camera's reference"""
+        with self._lock:
+            self._cameras[camera_id] = (signature, result, time.time())
+            self._cameras.move_to_end(camera_id)
+            while len(self._cameras) > self.max_cameras:
+                self._cameras.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cameras": len(self._cameras),
+                "frames": self.frames,
+                "skipped": self.skipped,
+                "skip_rate": round(self.skipped / self.frames, 4) if self.frames else None,
+                "change_fraction": self.change_fraction,
+                "max_reuse_seconds": self.max_reuse_seconds,
+            }
+
+
+live_frame_filter = FrameChangeFilter()
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from PIL import Image
+from config.constant import logger, GRAPH_CROP_FOLDER, CHART_CACHE_MAX_FILES
+
+
+def crop_top(img, fraction=0.1):
+    """Crop ``fraction`` of the height off the top of an image"""
+    width, height = img.size
+    crop_amount = int(height * fraction)
+    return img.crop((0, crop_amount, width, height))
+
+
+class DerivedImageCache:
+    """
+    Stores a transformed rendition of source images on disk, so the
+    transform runs once per version of the source instead of per request.
+
+    Each rendition carries its source's modification time as its own; a
+    rendition whose mtime no longer matches the source is rebuilt. At most
+    ``max_files`` renditions are kept (least recently used are removed first).
+    """
+
+    def __init__(self, folder, transform, max_files=CHART_CACHE_MAX_FILES):
+        self.folder = folder
+        self.transform = transform
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def get(self, source_path):
+        """
+        Path of the rendition of ``source_path``, building it if the source
+        changed since it was last built.
+        """
+        source_mtime = os.stat(source_path).st_mtime_ns
+        path = os.path.join(self.folder, os.path.basename(source_path))
+
+        try:
+            if os.stat(path).st_mtime_ns == source_mtime:
+                os.utime(path, ns=(time.time_ns(), source_mtime))  # Mark as recently used
+                return path
+        except OSError:
+            pass
+
+        with Image.open(source_path) as img:
+            derived = self.transform(img)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            derived.save(tmp_path, format=img.format or 'PNG')
+
+        # Tie the rendition to the source version it was built from
+        os.utime(tmp_path, ns=(time.time_ns(), source_mtime))
+        os.replace(tmp_path, path)
+        logger.debug(f"Built derived image {path}")
+
+        with self._lock:
+            self.evict()
+        return path
+
+    def evict(self):
+        """Remove the least recently used renditions beyond ``max_files``"""
+        renditions = []
+        for name in os.listdir(self.folder):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                renditions.append((os.path.getatime(path), path))
+            except OSError:
+                continue
+
+        renditions.sort()
+        for _, path in renditions[:max(0, len(renditions) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Forecast charts with the top 10% (title area) cropped off
+cropped_graph_cache = DerivedImageCache(GRAPH_CROP_FOLDER, crop_top)
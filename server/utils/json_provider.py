@@ -0,0 +1,99 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+import numpy as np
+import pandas as pd
+from bson.objectid import ObjectId
+from flask.json.provider import JSONProvider
+
+# orjson is optional; without it the provider falls back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def to_jsonable(obj):
+    """
+    Convert a value json cannot encode natively: NumPy scalars and arrays,
+    pandas objects, ObjectId, dates and a few standard library types.
+
+    Raises:
+        TypeError: If the value has no JSON representation
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        # Also covers pd.Timestamp, a datetime subclass
+        return obj.isoformat()
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return None if np.isnan(obj) else float(obj)
+    if isinstance(obj, np.datetime64):
+        return None if np.isnat(obj) else pd.Timestamp(obj).isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    if isinstance(obj, pd.Series):
+        return obj.tolist()
+    if isinstance(obj, pd.Timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj, sort_keys=False, indent=None):
+    """Encode ``obj`` to UTF-8 JSON bytes with orjson if available"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=to_jsonable, option=option)
+    separators = None if indent else (",", ":")
+    return json.dumps(obj, default=to_jsonable, sort_keys=sort_keys, indent=indent,
+                      separators=separators, ensure_ascii=False).encode()
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider for the app: every ``jsonify`` and ``request.get_json``
+    goes through it, so handlers can return documents straight from MongoDB
+    or pandas/NumPy results without converting them first. Responses are
+    encoded once, directly to bytes.
+    """
+
+    sort_keys = False
+    compact = None
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                           indent=kwargs.get("indent")).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
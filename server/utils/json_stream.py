@@ -0,0 +1,84 @@
+import json
+
+
+class JSONArrayStreamParser:
+    """
+    Pulls the object items of one JSON array out of a document that arrives
+    in pieces, e.g. the ``dishes`` list of a streamed model reply.
+
+    ``feed`` accepts the next chunk of text and returns the items completed
+    by it, so each item is available as soon as its closing bracket arrives.
+    Text before the array (such as a ```json fence or other keys) is skipped.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    def _find_array_start(self):
+        marker = self._buffer.find(f'"{self.key}"', self._pos)
+        if marker == -1:
+            return False
+        bracket = self._buffer.find("[", marker)
+        if bracket == -1:
+            return False
+        # Only whitespace and a colon may sit between the key and the array
+        if self._buffer[marker + len(self.key) + 2:bracket].strip() not in (":",):
+            self._pos = marker + 1
+            return self._find_array_start()
+        self._pos = bracket + 1
+        self._in_array = True
+        return True
+
+    def feed(self, chunk):
+        """Add ``chunk`` and return the list of array items it completed"""
+        if self._done:
+            return []
+        self._buffer += chunk
+        if not self._in_array and not self._find_array_start():
+            return []
+
+        items = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # End of the array itself
+                    self._done = True
+                    i += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append(json.loads(buffer[self._item_start:i + 1]))
+                    self._item_start = None
+            i += 1
+
+        # Drop text that can no longer be part of an unfinished item
+        keep_from = self._item_start if self._item_start is not None else i
+        self._buffer = buffer[keep_from:]
+        if self._item_start is not None:
+            self._item_start = 0
+        self._pos = i - keep_from
+        return items
@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import datetime
+from bson.objectid import ObjectId
+from config.constant import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Keys a list can be ordered by; "-" means newest first
+SORT_KEYS = ("_id", "-_id", "updated_at", "-updated_at")
+
+
+def parse_page_args(args, allowed_fields):
+    """
+    Read limit, cursor, sort and fields from the query string
+
+    Args:
+        args: request.args
+        allowed_fields: Fields a client may ask for with ``fields=``
+
+    Returns:
+        Dict with limit, cursor, sort and projection (None for all fields)
+
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    sort = args.get("sort", "_id")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}")
+
+    projection = None
+    if args.get("fields"):
+        fields = [field.strip() for field in args["fields"].split(",") if field.strip()]
+        unknown = [field for field in fields if field not in allowed_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        projection = {field: 1 for field in fields}
+        # The sort key is needed to build the next cursor
+        if sort.lstrip("-") != "_id":
+            projection[sort.lstrip("-")] = 1
+
+    cursor = decode_cursor(args["cursor"], sort) if args.get("cursor") else None
+    return {"limit": limit, "cursor": cursor, "sort": sort, "projection": projection}
+
+
+def encode_cursor(doc, sort):
+    """Opaque cursor pointing just after ``doc`` in ``sort`` order"""
+    key = sort.lstrip("-")
+    position = {"id": str(doc["_id"])}
+    if key != "_id":
+        value = doc.get(key)
+        position["value"] = value.isoformat() if isinstance(value, datetime) else value
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor, sort):
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position["id"] = ObjectId(position["id"])
+        if sort.lstrip("-") != "_id" and isinstance(position.get("value"), str):
+            position["value"] = datetime.fromisoformat(position["value"])
+        return position
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_condition(key, value, last_id, after):
+    """
+    Filter for documents that sort after (``after`` is "$gt") or before
+    ("$lt") the position (value, last_id). Ties on the key are broken by _id.
+    MongoDB sorts documents with a null or missing key before any value, and
+    comparison operators never match them, so those are handled explicitly.
+    """
+    same_position = {key: value, "_id": {after: last_id}}
+    if value is None:
+        if after == "$gt":
+            # Every document with a value follows the null ones
+            return {"$or": [same_position, {key: {"$ne": None}}]}
+        return same_position
+    if after == "$gt":
+        return {"$or": [{key: {after: value}}, same_position]}
+    # Newest first: documents without a value come after all dated ones
+    return {"$or": [{key: {after: value}}, same_position, {key: None}]}
+
+
+def fetch_page(collection, page, query=None):
+    """
+    Fetch one page of ``collection`` using keyset pagination: the cursor
+    holds the sort key of the last document returned, so each page is an
+    index range scan no matter how deep into the list it is.
+
+    Args:
+        collection: Collection to read
+        page: Dict returned by ``parse_page_args``
+        query: Optional filter applied before paging
+
+    Returns:
+        Tuple of (documents, next cursor or None on the last page)
+    """
+    sort = page["sort"]
+    key = sort.lstrip("-")
+    direction = -1 if sort.startswith("-") else 1
+    after = "$lt" if direction == -1 else "$gt"
+
+    conditions = [query] if query else []
+    cursor = page["cursor"]
+    if cursor is not None:
+        if key == "_id":
+            conditions.append({"_id": {after: cursor["id"]}})
+        else:
+            conditions.append(keyset_condition(key, cursor.get("value"), cursor["id"], after))
+    criteria = {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else {})
+
+    order = [(key, direction)] if key == "_id" else [(key, direction), ("_id", direction)]
+    # One extra document tells whether another page follows
+    docs = list(collection.find(criteria, page["projection"]).sort(order).limit(page["limit"] + 1))
+
+    next_cursor = None
+    if len(docs) > page["limit"]:
+        docs = docs[:page["limit"]]
+        next_cursor = encode_cursor(docs[-1], sort)
+    return docs, next_cursor
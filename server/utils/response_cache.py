@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from config.constant import logger
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    Values must be JSON-serializable. With ``db_path`` set, entries are also
+    written to a SQLite file so they survive restarts and are shared by the
+    worker processes on this host; the in-memory LRU stays the fast path.
+    """
+
+    def __init__(self, name, max_entries=256, ttl=3600, db_path=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS response_cache ("
+                    "cache TEXT, key TEXT, value TEXT, expires_at REAL, used_at REAL, "
+                    "PRIMARY KEY (cache, key))")
+
+    @contextmanager
+    def _connect(self):
+        """One transaction on a fresh connection, closed afterwards"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            # The connection's own context manager commits or rolls back but does not close
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        entry = self._load(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, entry)
+            return entry[1]
+
+    def put(self, key, value):
+        """Cache ``value`` under ``key`` for ``ttl`` seconds"""
+        entry = (time.time() + self.ttl, value)
+        with self._lock:
+            self._store(key, entry)
+        self._save(key, entry)
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key, now):
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM response_cache WHERE cache = ? AND key = ? AND expires_at > ?",
+                    (self.name, key, now)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE response_cache SET used_at = ? WHERE cache = ? AND key = ?",
+                             (now, self.name, key))
+            return row[1], json.loads(row[0])
+        except sqlite3.Error as e:
+            logger.error(f"Error reading {self.name} cache: {e}")
+            return None
+
+    def _save(self, key, entry):
+        if not self.db_path:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (cache, key, value, expires_at, used_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.name, key, json.dumps(entry[1]), entry[0], now))
+                # Drop expired rows and keep the table to the same LRU bound
+                conn.execute("DELETE FROM response_cache WHERE cache = ? AND expires_at <= ?", (self.name, now))
+                conn.execute(
+                    "DELETE FROM response_cache WHERE cache = ? AND key NOT IN ("
+                    "SELECT key FROM response_cache WHERE cache = ? ORDER BY used_at DESC LIMIT ?)",
+                    (self.name, self.name, self.max_entries))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f"Error writing {self.name} cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM response_cache WHERE cache = ?", (self.name,))
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "persistent": bool(self.db_path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -0,0 +1,187 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from flask import Request, current_app, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+from config.constant import logger, UPLOAD_SPOOL_FOLDER, UPLOAD_SIZE_LIMITS
+
+# Extra bytes allowed on top of the file limit for multipart boundaries and form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+UPLOAD_KINDS = {
+    "image": {".jpg", ".jpeg", ".png"},
+    "video": {".mp4", ".avi", ".mov"},
+    "data": {".csv", ".xlsx", ".ndjson", ".jsonl"},
+}
+
+
+def upload_kind(filename):
+    """Kind of upload ("image", "video", "data") from the file extension, or None"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    for kind, extensions in UPLOAD_KINDS.items():
+        if extension in extensions:
+            return kind
+    return None
+
+
+def upload_limit(kind):
+    """Largest accepted upload of a kind; unknown kinds get the largest limit"""
+    return UPLOAD_SIZE_LIMITS.get(kind) or max(UPLOAD_SIZE_LIMITS.values())
+
+
+class HashingSpoolFile(io.BufferedRandom):
+    """
+    Writable file for one multipart file part. Bytes go straight to a spool
+    file on the storage volume while their SHA-256 is computed, so saving the
+    upload is a rename rather than another copy. Writing past ``limit``
+    raises 413 at once, without reading the rest of the body.
+    """
+
+    def __init__(self, limit, folder=UPLOAD_SPOOL_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=folder, suffix=".part")
+        super().__init__(io.FileIO(fd, "r+b"), buffer_size=1024 * 1024)
+        self.limit = limit
+        self.size = 0
+        self.moved = False
+        self._hash = hashlib.sha256()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.limit is not None and self.size > self.limit:
+            # The parser drops this part, so remove the spool file here
+            self.close()
+            raise RequestEntityTooLarge(f"File is larger than the {self.limit // (1024 * 1024)} MB limit")
+        self._hash.update(data)
+        return super().write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def move_to(self, destination):
+        """Move the spooled bytes to ``destination`` and close the file"""
+        super().close()
+        # mkstemp creates the spool file readable by its owner only
+        os.chmod(self.path, 0o644)
+        try:
+            os.replace(self.path, destination)
+        except OSError:
+            # Spool and destination are on different filesystems
+            shutil.move(self.path, destination)
+        self.moved = True
+
+    def close(self):
+        super().close()
+        if not self.moved:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def prune_spool(max_age=3600, folder=UPLOAD_SPOOL_FOLDER):
+    """Delete spool files left behind by a worker that died mid-upload"""
+    if not os.path.isdir(folder):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if name.endswith(".part") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class StreamingUploadRequest(Request):
+    """Request whose uploaded files are hashed and spooled by HashingSpoolFile"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpoolFile(upload_limit(upload_kind(filename)))
+
+
+def save_upload(file, destination):
+    """
+    Save an uploaded FileStorage to ``destination``
+
+    Returns:
+        Hex SHA-256 of the content
+    """
+    stream = file.stream
+    if isinstance(stream, HashingSpoolFile) and not stream.closed:
+        digest = stream.hexdigest()
+        stream.move_to(destination)
+        return digest
+
+    # Uploads that did not go through StreamingUploadRequest
+    digest = hashlib.sha256()
+    with open(destination, "wb") as out:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def upload_digest(file):
+    """SHA-256 of an uploaded file computed while it streamed in, or None"""
+    stream = file.stream
+    return stream.hexdigest() if isinstance(stream, HashingSpoolFile) else None
+
+
+def file_digest(path):
+    """SHA-256 of a file on disk"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(file):
+    """SHA-256 of an uploaded file, hashing its stream if it was not spooled"""
+    digest = upload_digest(file)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in iter(lambda: file.stream.read(1024 * 1024), b""):
+            hasher.update(chunk)
+        file.stream.seek(0)
+        digest = hasher.hexdigest()
+    return digest
+
+
+def accepts_upload(kind):
+    """
+    Mark a view as taking uploads of ``kind`` so its size limit applies
+    before the body is read. ``kind`` may also be a function of the view's
+    URL arguments, for views that dispatch to other upload views.
+    """
+    def decorator(view):
+        view.upload_kind = kind
+        return view
+    return decorator
+
+
+def enforce_upload_limit():
+    """
+    before_request hook: cap the body size for views marked with
+    ``accepts_upload`` and parse multipart bodies up front, so an oversized
+    upload is answered with 413 before a handler runs.
+    """
+    view = current_app.view_functions.get(request.endpoint)
+    kind = getattr(view, "upload_kind", None)
+    if callable(kind):
+        kind = kind(**(request.view_args or {}))
+    if kind:
+        request.max_content_length = upload_limit(kind) + MULTIPART_OVERHEAD
+    if request.mimetype == "multipart/form-data":
+        # Raises RequestEntityTooLarge while streaming if a part is too big
+        request.files
+
+
+def upload_too_large(error):
+    """JSON body for 413 responses"""
+    logger.warning(f"Rejected upload to {request.path}: {error.description}")
+    return jsonify({"success": False, "error": "Upload too large", "message": error.description}), 413